@@ -12,6 +12,11 @@ Components:
 1. Audio Classifier:
    - Utilizes a pre-trained audio classification model to recognize voice commands.
    - Runs in a separate thread to continuously listen for and classify audio input.
+   - Each utterance is classified from several time-shifted windows in a single batch ('--speech_windows'),
+     and the command is published with its confidence.
+   - By default, the voice activity detection and the model inference run in a worker process, which follows
+     the audio through shared memory and sends the commands back through a pipe ('--speech_process 0' keeps
+     them in the thread), so they never delay the face tracking threads.
    - Provides real-time feedback on recognized commands and their execution status.
 
 2. Face Position Controller:
@@ -25,6 +30,29 @@ Components:
 
 Main Functionality:
 - The application continuously listens for voice commands and tracks the user's face.
+- The head tracking starts first, while the speech model is loaded in the background (the voice commands
+  are enabled as soon as it is ready).
+- The camera frames are grabbed continuously on a background thread which only keeps the newest one.
+- The face tracking runs as a pipeline (capture and color conversion, face detection, cursor model and
+  cursor output), each stage on its own thread, connected by queues that only keep the newest frame.
+- With '--track_interval N', the full-frame face detection only runs every N frames; in between, the face is
+  detected on a small region around its last position.
+- With '--frame_budget' (ms per frame) or '--cpu_cap' (fraction of one core), a governor lowers the processing
+  resolution and then the frame rate when the face tracking goes over its budget, and raises them back when
+  there is room again.
+- The cursor is moved at the display rate ('--cursor_rate', 120 Hz by default), extrapolated from the latest
+  face tracking updates and their velocity, so its motion is smooth at any camera rate.
+- The cursor location can be smoothed with a One-Euro or a Kalman filter ('--cursor_filter').
+- With '--metrics' (file) or '--metrics_port' (localhost endpoint), the latency histograms of every stage
+  and the runtime counters are exported as JSON or Prometheus text.
+- With '--trace out.json', every stage execution is recorded on its thread and written on exit as a Chrome
+  trace-event timeline (to be opened in Perfetto).
+- The CPU cores are shared between the vision and the speech subsystems ('--resource_profile'): the OpenCV and
+  PyTorch thread pools are sized so they do not oversubscribe the CPU, and each subsystem can be pinned to its
+  own cores ('--cpu_affinity 1'). The frame latency during and outside the speech inferences is reported in
+  benchmark mode (or with '--resource_report 1').
+- Voice commands are dispatched as soon as they are detected, and the face tracking pipeline is paused
+  (without CPU usage) while the cursor's movement is deactivated.
 - When a voice command is recognized, the corresponding mouse action is triggered.
 - The cursor's movement is controlled based on facial landmarks and gesture recognition.
 
@@ -39,6 +67,11 @@ Voice Commands and Corresponding Actions:
 - "one", "two", "three": Adjusts the cursor speed (and scroll step) to slow, medium, or fast, respectively.
 - "stop": Exits the program and terminates the application.
 
+Benchmark mode:
+- With '--benchmark 1' the application runs headless: the camera and the microphone can be replaced by
+  a recorded video ('--video') and a WAV file ('--audio'), the mouse actions are recorded instead of executed,
+  and a latency report of every stage of the main loop is printed when the video finishes.
+
 Usage:
 - Run the script to start the application.
 - Use the listed voice commands to control the cursor and perform mouse actions.
@@ -51,14 +84,10 @@ Note:
 - This application is designed to provide hands-free control and enhance accessibility for users with motor disabilities.
 """
 
-from src.AudioClassifier import AudioClassifier
-from src.FacePosition import FacePosition
-from src.Cursor import Cursor, mouse_action
-from transformers import pipeline
+import time
 import threading
 import argparse
-import cv2
-import os
+from src.StartupProfiler import StartupProfiler
 
 if __name__ == "__main__":
     """
@@ -71,35 +100,162 @@ if __name__ == "__main__":
     Input Parameters:
         --verbose (int): Interpreted as bool, it enables verbose mode (1 (true)/ 0 (false))
         --mic_sens (float): Microphone sensitivity (0.0 to 1.0)
+        --video (str): Recorded video file used instead of the camera
+        --audio (str): Recorded WAV file used instead of the microphone
+        --benchmark (int): Interpreted as bool, it enables the headless benchmark mode (1 (true)/ 0 (false))
+        --benchmark_out (str): JSON file where the benchmark summary is saved
+        --cursor_backend (str): Cursor output backend (pyautogui, pynput, uinput, null or recording)
+        --cam_width (int): Requested camera frame width
+        --cam_height (int): Requested camera frame height
+        --cam_fps (float): Requested camera frame rate
+        --speech_backend (str): Speech commands classification backend (pipeline, torch, onnx, int8 or kws)
+        --speech_windows (int): Number of time-shifted windows classified (as one batch) for each utterance
+        --speech_process (int): Interpreted as bool, it runs the speech recognition in a worker process (1 (true)/ 0 (false))
+        --resource_profile (str): Sharing of the CPU cores between the vision and the speech (default, auto or low)
+        --cpu_affinity (int): Interpreted as bool, it pins the vision and the speech to their own cores (1 (true)/ 0 (false))
+        --vision_threads (int): Number of OpenCV threads (overrides the resource profile)
+        --speech_threads (int): Number of speech model inference threads (overrides the resource profile)
+        --resource_report (int): Interpreted as bool, it reports the measured CPU contention on exit (1 (true)/ 0 (false))
+        --track_interval (int): Number of frames between full-frame face detections (1 disables the ROI tracking)
+        --frame_budget (float): Processing time budget of each frame in ms (enables the adaptive resolution/frame rate)
+        --cpu_cap (float): Maximum fraction of one CPU core used by the face tracking (enables the adaptive governor)
+        --cursor_rate (float): Cursor output rate in Hz, interpolated between face tracking updates (0 to disable)
+        --cursor_filter (str): Cursor position filter (none, mean, one_euro or kalman)
+        --filter_params (str): Parameters of the cursor position filter (e.g. 'min_cutoff=1.0,beta=20')
+        --metrics (str): File where the runtime metrics are written (Prometheus text for .prom files, JSON otherwise)
+        --metrics_port (int): Localhost port serving the runtime metrics ('/metrics' and '/metrics.json')
+        --trace (str): JSON file where a timeline of every stage is written on exit (Chrome trace-event format)
+        --startup-profile (int): Interpreted as bool, it prints the startup timing breakdown (1 (true)/ 0 (false))
     """
 
+    # Time the startup phases (printed with '--startup-profile'). The modules are imported here, so the
+    # speech worker process (which imports this file again when it is spawned) does not load them
+    profiler = StartupProfiler()
+
+    with profiler.phase('import cv2'):
+        import cv2
+    with profiler.phase('import mediapipe (FacePosition)'):
+        from src.FacePosition import FacePosition
+        from src.FaceFeatures import FaceFeatures
+        from src.FaceTracker import FaceTracker
+        from src.VisionGovernor import VisionGovernor
+        from src.CursorInterpolator import CursorInterpolator
+        from src.CursorFilter import create_filter, parse_params
+    with profiler.phase('import application modules'):
+        from src.AudioClassifier import AudioClassifier
+        from src.Cursor import Cursor, mouse_action
+        from src.LatencyStats import LatencyStats
+        from src.Metrics import Metrics
+        from src.TraceRecorder import TraceRecorder
+        from src.ResourceConfig import ResourceConfig
+        from src.Pipeline import Pipeline
+        from src.FrameGrabber import FrameGrabber
+
     # Define main file arguments
     parser = argparse.ArgumentParser()
     parser.add_argument('--verbose', type=int, default=1, help="Enable verbose mode (1 (true)/ 0 (false))")
     parser.add_argument('--mic_sens', type=float, default=0.7, help="Microphone sensitivity (0.0 to 1.0)")
+    parser.add_argument('--video', type=str, default=None, help="Recorded video file used instead of the camera")
+    parser.add_argument('--audio', type=str, default=None, help="Recorded WAV file used instead of the microphone")
+    parser.add_argument('--benchmark', type=int, default=0, help="Enable headless benchmark mode (1 (true)/ 0 (false))")
+    parser.add_argument('--benchmark_out', type=str, default=None, help="JSON file where the benchmark summary is saved")
+    parser.add_argument('--cursor_backend', type=str, default='pyautogui',
+                        help="Cursor output backend (pyautogui, pynput, uinput, null or recording)")
+    parser.add_argument('--cam_width', type=int, default=None, help="Requested camera frame width")
+    parser.add_argument('--cam_height', type=int, default=None, help="Requested camera frame height")
+    parser.add_argument('--cam_fps', type=float, default=None, help="Requested camera frame rate")
+    parser.add_argument('--speech_backend', type=str, default='pipeline',
+                        help="Speech commands classification backend (pipeline, torch, onnx, int8 or kws)")
+    parser.add_argument('--speech_windows', type=int, default=3,
+                        help="Number of time-shifted windows classified (as one batch) for each utterance")
+    parser.add_argument('--speech_process', type=int, default=1,
+                        help="Run the speech recognition in a worker process (1 (true)/ 0 (false))")
+    parser.add_argument('--resource_profile', type=str, default='auto',
+                        help="Sharing of the CPU cores between the vision and the speech (default, auto or low)")
+    parser.add_argument('--cpu_affinity', type=int, default=0,
+                        help="Pin the vision and the speech to their own cores (1 (true)/ 0 (false))")
+    parser.add_argument('--vision_threads', type=int, default=None,
+                        help="Number of OpenCV threads (overrides the resource profile)")
+    parser.add_argument('--speech_threads', type=int, default=None,
+                        help="Number of speech model inference threads (overrides the resource profile)")
+    parser.add_argument('--resource_report', type=int, default=0,
+                        help="Report the measured CPU contention on exit (1 (true)/ 0 (false))")
+    parser.add_argument('--track_interval', type=int, default=1,
+                        help="Number of frames between full-frame face detections (1 disables the ROI tracking)")
+    parser.add_argument('--frame_budget', type=float, default=None,
+                        help="Processing time budget of each frame in ms (enables the adaptive resolution/frame rate)")
+    parser.add_argument('--cpu_cap', type=float, default=None,
+                        help="Maximum fraction of one CPU core used by the face tracking (enables the adaptive governor)")
+    parser.add_argument('--cursor_rate', type=float, default=120,
+                        help="Cursor output rate in Hz, interpolated between face tracking updates (0 to disable)")
+    parser.add_argument('--cursor_filter', type=str, default='none',
+                        help="Cursor position filter (none, mean, one_euro or kalman)")
+    parser.add_argument('--filter_params', type=str, default=None,
+                        help="Parameters of the cursor position filter (e.g. 'min_cutoff=1.0,beta=20')")
+    parser.add_argument('--metrics', type=str, default=None,
+                        help="File where the runtime metrics are written (Prometheus text for .prom files, JSON otherwise)")
+    parser.add_argument('--metrics_port', type=int, default=None,
+                        help="Localhost port serving the runtime metrics ('/metrics' and '/metrics.json')")
+    parser.add_argument('--trace', type=str, default=None,
+                        help="JSON file where a timeline of every stage is written on exit (Chrome trace-event format)")
+    parser.add_argument('--startup-profile', '--startup_profile', dest='startup_profile', type=int, default=0,
+                        help="Print the startup timing breakdown (1 (true)/ 0 (false))")
     args = parser.parse_args()
 
-    # Download the speech commands classification model if it's the first time running the application
-    if not os.path.isdir(os.path.join('models', 'speech_commands_model')):
-        pipe = pipeline("audio-classification", model="0xb1/wav2vec2-base-finetuned-speech_commands-v0.02")
-        pipe.save_pretrained(os.path.join('models', 'speech_commands_model'))
+    # Collect the latency of every stage in benchmark mode, and the runtime metrics when they are exported
+    stats = LatencyStats() if args.benchmark else None
+    metrics = None
+    if args.metrics is not None or args.metrics_port is not None:
+        metrics = Metrics()
+    tracer = TraceRecorder() if args.trace is not None else None
 
-    # Create an instance of the AudioClassifier class
-    audio_classifier = AudioClassifier(sensitivity=args.mic_sens)
+    # Share the CPU cores between the vision and the speech (measuring their contention if requested)
+    resources = ResourceConfig(args.resource_profile, affinity=bool(args.cpu_affinity),
+                               vision_threads=args.vision_threads, speech_threads=args.speech_threads)
+    contention = resources if args.benchmark or args.resource_report else None
 
-    # Run speech commands classifier in a parallel thread
-    audio_thread = threading.Thread(target=audio_classifier.run)
-    audio_thread.start()
+    # Create an instance of the AudioClassifier class (the model is loaded later, in the background)
+    audio_classifier = AudioClassifier(sensitivity=args.mic_sens, audio_file=args.audio,
+                                       backend=args.speech_backend, recorders=[stats, metrics, tracer, contention],
+                                       use_process=bool(args.speech_process), resources=resources,
+                                       windows=args.speech_windows)
 
-    # Create an instance of the Cursor class
-    cursor = Cursor()
+    # Create an instance of the Cursor class (recording the actions in benchmark mode)
+    with profiler.phase('cursor backend'):
+        cursor = Cursor(backend='recording' if args.benchmark else args.cursor_backend)
 
-    # Create an instance of the FacePosition class
-    position_controller = FacePosition()
+    # Move the cursor at the display rate, interpolated between the face tracking updates
+    # (its output thread records the cursor moves, as 'cursor_move')
+    interpolator = None
+    if args.cursor_rate > 0:
+        interpolator = CursorInterpolator(cursor, rate=args.cursor_rate, recorders=[stats, metrics, tracer]).start()
+
+    # Create an instance of the FacePosition class (its threads inherit the vision resources)
+    with profiler.phase('face detection and cursor model'):
+        resources.apply('vision')
+        position_controller = FacePosition(screen_size=(cursor.screen_width, cursor.screen_height))
+        face_tracker = FaceTracker(position_controller.face_detection, interval=args.track_interval)
+    face_features = FaceFeatures()
+    cursor_filter = create_filter(args.cursor_filter, **parse_params(args.filter_params))
     move_active = True
 
-    # Open the video capture
-    capture = cv2.VideoCapture(0)
+    # Start grabbing frames from the camera (or the recorded video) on a background thread
+    with profiler.phase('camera open'):
+        grabber = FrameGrabber(0 if args.video is None else args.video,
+                               width=args.cam_width, height=args.cam_height, fps=args.cam_fps).start()
+    last_sequence = [0]
+
+    # Adapt the processing resolution and frame rate to the time budget (and CPU cap)
+    governor = None
+    if args.frame_budget is not None or args.cpu_cap is not None:
+        def on_governor_change(scale, fps):
+            if args.video is None:
+                grabber.set(cv2.CAP_PROP_FPS, fps)
+            if args.verbose:
+                print(f"Face tracking set to {scale:.0%} resolution at {fps:.1f} fps.")
+
+        governor = VisionGovernor(1 / grabber.frame_interval, cpu_cap=args.cpu_cap, on_change=on_governor_change,
+                                  budget=None if args.frame_budget is None else args.frame_budget / 1000)
     
     if args.verbose:
         print("""\n
@@ -117,44 +273,185 @@ if __name__ == "__main__":
             - "off": Deactivates the cursor's movement functionality.
             - "one", "two", "three": Adjusts the cursor speed.
             - "stop": Exits the program and terminates the application.
-          use the 'STOP' command to close the application.\n
+          use the 'STOP' command to close the application.
+          (the voice commands are enabled once the speech model is loaded)\n
           """)
 
-    while audio_classifier.state[0] != 'stop':
+    def capture_frame():
+        """
+        Take the newest camera frame and convert it to RGB (source stage).
+        """
+        frame, timestamp, sequence = grabber.read(last_sequence[0], timeout=1)
+        if frame is None:
+            if grabber.finished:
+                raise StopIteration
+            return timestamp, None
+        last_sequence[0] = sequence
+
+        # Keep the frame rate and processing resolution of the governor
+        if governor is not None:
+            if not governor.accept(timestamp):
+                return timestamp, None
+            if governor.scale < 1:
+                start = time.perf_counter()
+                frame = cv2.resize(frame, None, fx=governor.scale, fy=governor.scale,
+                                   interpolation=cv2.INTER_AREA)
+                vision_pipeline.record('resize', start, time.perf_counter())
+
+        # Convert the BGR image to RGB
+        start = time.perf_counter()
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        vision_pipeline.record('cvtColor', start, time.perf_counter())
+        return timestamp, frame
+
+    def detect_face(frame):
+        """
+        Perform face detection (or tracking) and return the first detected face.
+        """
+        detection = face_tracker.process(frame)
+        if detection is None and metrics is not None:
+            metrics.count('faces_missed')
+        return detection
+
+    def predict_position(detection):
+        """
+        Read the reference and landmarks from the detected face and update the cursor location.
+        """
+        position_controller.move_cursor(face_features.extract(detection))
+        return cursor_filter(position_controller.cursor_location, time.perf_counter()).copy()
+
+    def move_cursor(location):
+        """
+        Move the cursor to the new location (or hand it to the interpolated output).
+        """
+        if interpolator is not None:
+            interpolator.update(location)
+        else:
+            cursor.move(*location)
+        profiler.milestone('first cursor move')
+        return location
+
+    # Build the vision pipeline: each stage runs on its own thread, connected by queues
+    # that only keep the newest frame, so a slow stage never accumulates old frames
+    vision_pipeline = Pipeline(recorders=[stats, governor, metrics, tracer, contention], on_finish=audio_classifier.stop)
+    vision_pipeline.add_stage('capture', capture_frame)
+    vision_pipeline.add_stage('face_detection', detect_face)
+    vision_pipeline.add_stage('move_cursor', predict_position)
+    vision_pipeline.add_stage('cursor_move' if interpolator is None else 'cursor_update', move_cursor)
+    vision_pipeline.start()
+    profiler.milestone('head tracking started')
+
+    # Export the runtime metrics (counters kept by other components are read when exported)
+    if metrics is not None:
+        metrics.gauge('frames_dropped', vision_pipeline.dropped, kind='counter', label='stage')
+        metrics.gauge('audio_frames', lambda: audio_classifier.vad.frames, kind='counter')
+        metrics.gauge('inferences', lambda: audio_classifier.vad.inferences, kind='counter')
+        metrics.gauge('utterances_rejected', lambda: audio_classifier.vad.rejected, kind='counter')
+        metrics.gauge('face_keyframes', lambda: face_tracker.keyframes, kind='counter')
+        metrics.gauge('move_active', lambda: int(move_active))
+        if governor is not None:
+            metrics.gauge('governor_scale', lambda: governor.scale)
+            metrics.gauge('governor_fps', lambda: governor.fps)
+        metrics.start(path=args.metrics, port=args.metrics_port)
+
+    def start_voice_commands():
+        """
+        Load the speech model and open the audio input, then run the speech commands classifier.
+        """
+        try:
+            with profiler.phase('speech model load'):
+                audio_classifier.load_model()
+            with profiler.phase('audio input open'):
+                audio_classifier.open_stream()
+            profiler.milestone('voice commands loaded')
+        except Exception as error:
+            print(f"The voice commands could not be started: {error}")
+            audio_classifier.stop()
+            return
+        finally:
+            # The profile is also reported when the startup failed (it shows which phase failed and when)
+            if args.startup_profile:
+                print(profiler.report())
+        if args.verbose:
+            print("Voice commands ready.")
+        audio_classifier.run()
+
+    # Load and run the speech commands classifier in a parallel thread, so the
+    # head tracking does not wait for the heavy speech libraries and model
+    audio_thread = threading.Thread(target=start_voice_commands, name='voice_commands')
+    audio_thread.start()
+
+    # Latency of every command, from the voice onset and from its detection to the mouse action
+    dispatch_recorders = [recorder for recorder in (stats, metrics, tracer) if recorder is not None]
+
+    # Wait for new voice commands (the thread sleeps until one arrives)
+    while True:
+        command = audio_classifier.commands.get()
+        if command is None:
+            break
+
+        start = time.perf_counter()
+        move_active = mouse_action(cursor, position_controller, command.label,
+                                   move_active, verbose=args.verbose)
+        end = time.perf_counter()
+        for recorder in dispatch_recorders:
+            recorder.record('voice_to_action', command.onset, end)
+            recorder.record('queue_to_action', command.detected, start)
+            recorder.record('command_dispatch', start, end)
+        if metrics is not None:
+            metrics.count('commands')
+
+        # Pause the vision pipeline (and the camera reads) while the cursor's movement is deactivated
         if move_active:
-            # Capture a frame from the camera
-            _, frame = capture.read()
-
-            # Convert the BGR image to RGB
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # Perform face detection
-            results = position_controller.face_detection.process(frame)
-
-            # Read the reference and landmarks from the detected face
-            if results.detections:
-                for detection in results.detections:
-                    reference = [[detection.location_data.relative_bounding_box.xmin,
-                                detection.location_data.relative_bounding_box.ymin],
-                                [detection.location_data.relative_bounding_box.width,
-                                detection.location_data.relative_bounding_box.height]]
-
-                    keypoints = []
-                    for key_point in detection.location_data.relative_keypoints:
-                        keypoints.append([key_point.x, key_point.y])
-
-                    position_controller.move_cursor(reference, keypoints)
-                    cursor.move(*position_controller.cursor_location)
-                    break
-        
-        # Check for new voice commands
-        if audio_classifier.state[1]:
-            move_active = mouse_action(cursor, position_controller, audio_classifier.state[0],
-                                       move_active, verbose=args.verbose)
-            audio_classifier.state[1] = False
+            grabber.resume()
+            vision_pipeline.resume()
+            if interpolator is not None:
+                interpolator.resume()
+        else:
+            vision_pipeline.pause()
+            grabber.pause()
+            if interpolator is not None:
+                interpolator.pause()
+
+        if command.label == 'stop':
+            break
+
+    # Stop the vision pipeline
+    vision_pipeline.stop()
+    if interpolator is not None:
+        interpolator.stop()
 
     # Wait for the audio thread to finish
     audio_thread.join()
 
     # Release the camera
-    capture.release()
+    grabber.release()
+
+    # Write the runtime metrics one last time
+    if metrics is not None:
+        metrics.stop()
+
+    # Write the timeline of every stage
+    if tracer is not None:
+        tracer.save(args.trace)
+        if args.verbose:
+            print(f"Trace saved in {args.trace}, open it in https://ui.perfetto.dev")
+
+    # Report the contention between the vision and the speech
+    if contention is not None:
+        print(contention.report())
+
+    # Report the latency of every stage
+    if stats:
+        print(stats.report())
+        print(audio_classifier.vad.report())
+        print(face_tracker.report())
+        if governor is not None:
+            print(governor.report())
+        if args.benchmark_out is not None:
+            stats.save(args.benchmark_out)
+
+    # Exit with an error if a stage of the vision pipeline failed (its traceback was already printed)
+    if vision_pipeline.error is not None:
+        stage, error = vision_pipeline.error
+        raise SystemExit(f"The application stopped because the '{stage}' stage failed: {error!r}")
@@ -6,10 +6,23 @@ Date: 08/09/2023
 """
 
 import os
+import time
+import threading
+import multiprocessing
 import numpy as np
-import sounddevice as sd
-from scipy.signal import decimate
-from transformers import pipeline
+
+try:
+    from src.AudioFrontEnd import AudioFrontEnd
+    from src.AudioRingBuffer import AudioRingBuffer, SharedAudioRingBuffer
+    from src.VoiceActivityDetector import VoiceActivityDetector
+    from src.SpeechBackend import create_backend, default_model_path
+    from src.CommandQueue import Command, CommandQueue, CommandPipe
+except ModuleNotFoundError:
+    from AudioFrontEnd import AudioFrontEnd
+    from AudioRingBuffer import AudioRingBuffer, SharedAudioRingBuffer
+    from VoiceActivityDetector import VoiceActivityDetector
+    from SpeechBackend import create_backend, default_model_path
+    from CommandQueue import Command, CommandQueue, CommandPipe
 
 class AudioClassifier:
     """
@@ -18,101 +31,399 @@ class AudioClassifier:
     This class provides functionality for classifying audio commands based on
     a pre-trained audio classification model.
 
+    Creating the class is cheap: the model is loaded, and the audio input opened,
+    when the process runs (or earlier, by calling 'load_model' and 'open_stream').
+
+    The audio front end delivers 16 kHz blocks, which the audio callback writes
+    into a ring buffer. The ring buffer is followed block
+    by block by a voice activity detector. As soon as a speech-like utterance ends,
+    several 1 s windows around it (shifted by 'window_spacing') are classified as a
+    single batch, and their probabilities are averaged, so a word close to the edge
+    of one window is still recognized from the others.
+
+    With 'use_process', the voice activity detection and the classification run in a
+    worker process (so they never compete with the vision threads for the interpreter
+    lock): the audio callback writes into a shared memory ring buffer, which the worker
+    follows, and the worker sends the detected commands back through a pipe.
+
     Attributes:
         verbose (boolean): Print (or not) detected commands
         vocab (list): Vocabulary of valid commands
         sensitivity (float): Microphone sensitivity (0.0 to 1.0)
-        state (list): Last detected command and flag for 'new detected command'
-        audio_buffer (list): A list to store audio buffer and flag for data availability.
-        MODEL_PATH (str): Path to the pretrained AI model directory.
-        pipe: The Hugging Face Transformers pipeline for audio classification.
-        audio_stream: The sounddevice audio input stream.
+        commands (CommandQueue): Queue of the detected commands (closed when the process stops).
+        last_command (Command): Last detected command (None before the first one).
+        sample_rate (int): Sampling rate of the audio blocks (the model sampling rate).
+        block_size (int): Number of samples of each audio block (20 ms).
+        window_size (int): Number of samples of the classified window (1 s).
+        window_shifts (list): Shift of each classified window from the center of the utterance, in samples.
+        vad (VoiceActivityDetector): Detector of the utterances sent to the classifier.
+        audio_buffer (AudioRingBuffer): Ring buffer with the last 3 s of audio.
+        active (boolean): Keep (or not) the classification process running.
+        ready (threading.Event): Set when the model is loaded and the audio stream is listening.
+        backend (str): Name of the classification backend.
+        audio_file (str): WAV file replayed instead of the microphone input (None for the microphone).
+        MODEL_PATH (str): Path to the pretrained AI model (directory or keyword spotter archive).
+        model: The speech commands classification backend (None until 'load_model' is called).
+        audio_stream (AudioFrontEnd): The audio input stage (None until 'open_stream' is called).
+        recorders (list): Objects with a 'record(stage, start, end)' method (e.g. LatencyStats or Metrics).
+        use_process (boolean): Run the detection and the classification in a worker process.
+        resources (ResourceConfig): Threads and cores of the speech subsystem (None for the library defaults).
+        worker (multiprocessing.Process): The speech worker process (None until 'load_model' is called).
     """
 
-    def __init__(self, sensitivity=0.7, verbose=False):
+    def __init__(self, sensitivity=0.7, verbose=False, audio_file=None, backend='pipeline', recorders=(),
+                 use_process=False, resources=None, windows=3, window_spacing=0.15):
         """
         Initializes the AudioClassifier class.
+
+        Args:
+            sensitivity (float): Microphone sensitivity (0.0 to 1.0)
+            verbose (boolean): Print (or not) detected commands
+            audio_file (str, optional): WAV file replayed instead of the microphone input.
+            backend (str): Classification backend ('pipeline', 'torch', 'onnx', 'int8' or 'kws').
+            recorders (iterable): Objects with a 'record(stage, start, end)' method (the stages are not
+                timed without recorders).
+            use_process (boolean): Run the detection and the classification in a worker process.
+            resources (ResourceConfig, optional): Threads and cores of the speech subsystem.
+            windows (int): Number of classified windows around each utterance.
+            window_spacing (float): Time between the classified windows, in seconds.
         """
         self.verbose = verbose
         self.vocab = ["left", "right", "up", "down", "go", "follow",
                       "on", "off", "one", "two", "three", "stop"]
         self.sensitivity = sensitivity
-        self.state = ['', True]
-        self.audio_buffer = [None, None, False]
-
-        # Load the audio classification pipeline
-        self.MODEL_PATH = os.path.join('models', 'speech_commands_model')
-        if os.path.isdir(self.MODEL_PATH):
-            self.pipe = pipeline("audio-classification", model=self.MODEL_PATH)
+        self.commands = CommandQueue()
+        self.last_command = None
+        self.sample_rate = 16000
+        self.block_size = 320
+        self.window_size = 16000
+        self.window_shifts = [int(round((i - (windows - 1) / 2) * window_spacing * self.sample_rate))
+                              for i in range(windows)]
+        self.vad = VoiceActivityDetector(self.sample_rate, threshold=1-self.sensitivity)
+        self.use_process = use_process
+        if use_process:
+            self.audio_buffer = SharedAudioRingBuffer(3 * self.sample_rate, self.sample_rate)
         else:
-            self.pipe = pipeline("audio-classification", model="0xb1/wav2vec2-base-finetuned-speech_commands-v0.02")
-            self.pipe.save_pretrained(self.MODEL_PATH)
+            self.audio_buffer = AudioRingBuffer(3 * self.sample_rate, self.sample_rate)
+        self.active = True
+
+        self.ready = threading.Event()
+        self.backend = backend
+        self.audio_file = audio_file
+        self.MODEL_PATH = default_model_path(backend)
+        self.model = None
+        self.audio_stream = None
+        self.recorders = [recorder for recorder in recorders if recorder is not None]
+        self.resources = resources
+        self.worker = None
+        self._connection = None
+        self._stop_lock = threading.Lock()
+        self._stop_sent = False
+
+    def load_model(self):
+        """
+        Load the audio classification model (downloading it if it's the first time).
+
+        The heavy libraries of the backend are imported here, so this can run
+        in a background thread while the rest of the application starts.
+        With 'use_process', the worker process is started, and it loads the model.
+        The speech resources are applied to the calling thread (or to the worker process).
+        """
+        if self.use_process:
+            self.start_worker()
+            return
+        threads = None
+        if self.resources is not None:
+            self.resources.apply('speech')
+            threads = self.resources.threads('speech')
+        if self.backend != 'kws' and not os.path.isdir(self.MODEL_PATH):
+            from transformers import pipeline
+            pipe = pipeline("audio-classification", model="0xb1/wav2vec2-base-finetuned-speech_commands-v0.02")
+            pipe.save_pretrained(self.MODEL_PATH)
+        self.model = create_backend(self.backend, self.MODEL_PATH, threads=threads)
+
+    def start_worker(self):
+        """
+        Start the speech worker process and wait until it has loaded the model.
+        """
+        # Spawned (not forked) processes are safe with the running camera and audio threads
+        context = multiprocessing.get_context('spawn')
+        self._connection, child_connection = context.Pipe()
+        settings = {'sensitivity': self.sensitivity, 'verbose': self.verbose, 'backend': self.backend,
+                    'timed': bool(self.recorders), 'resources': self.resources,
+                    'window_shifts': self.window_shifts}
+        self.worker = context.Process(target=speech_worker, name='speech_worker', daemon=True,
+                                      args=(child_connection, self.audio_buffer.attach_args(), settings))
+        self.worker.start()
+        child_connection.close()
+        try:
+            message = self._connection.recv()
+        except EOFError:
+            message = ('error', f"The speech worker exited with code {self.worker.exitcode}")
+        if message[0] == 'error':
+            self.worker.join()
+            self.audio_buffer.close()
+            raise RuntimeError(message[1])
+        self.model = self.worker
 
-        # Initialize the audio input stream
-        self.audio_stream = sd.InputStream(callback=self.audio_callback, channels=1,
-                                           samplerate=48000, blocksize=24000)
+    def open_stream(self):
+        """
+        Initialize the audio input stage (16 kHz, resampled if the device does not support it).
+        """
+        self.audio_stream = AudioFrontEnd(self.audio_callback, target_rate=self.sample_rate,
+                                          block_duration=self.block_size / self.sample_rate,
+                                          audio_file=self.audio_file, recorder=self if self.recorders else None)
+
+    def record(self, stage, start, end, thread=None):
+        """
+        Send the execution time of a stage to the recorders.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+            thread (tuple, optional): Process id, thread id and thread name of a stage run by the
+                speech worker (given to the recorders of threads, like TraceRecorder, through 'record_thread').
+        """
+        for recorder in self.recorders:
+            if thread is not None and hasattr(recorder, 'record_thread'):
+                recorder.record_thread(stage, start, end, *thread)
+            else:
+                recorder.record(stage, start, end)
 
     def classify_audio(self, audio_data):
         """
         Classify audio data into a command label.
 
         Args:
-            audio_data (numpy.ndarray): Input audio data.
+            audio_data (numpy.ndarray): Input audio window, or batch of windows of the same utterance
+                (classified in a single forward pass, with their probabilities averaged).
 
         Returns:
-            result (str): The classified command label.
+            tuple: The classified command label and its confidence (0.0 to 1.0).
         """
-        result = self.pipe(audio_data)[0]["label"]
-        return result
+        if audio_data.ndim == 1:
+            return self.model.predict(audio_data)
+        probabilities = self.model.batch_scores(audio_data).mean(axis=0)
+        index = int(probabilities.argmax())
+        return self.model.labels[index], float(probabilities[index])
 
-    def audio_callback(self, indata, _, __, ___):
+    def audio_callback(self, block):
         """
         Callback function to handle incoming audio data.
 
         Args:
-            indata (numpy.ndarray): Input audio data.
+            block (numpy.ndarray): Input audio block (mono, float32, 16 kHz).
         """
-        self.audio_buffer[2] = True
-        self.audio_buffer[0] = self.audio_buffer[1]
-        self.audio_buffer[1] = indata.copy()
-        self.audio_buffer[2] = False
+        self.audio_buffer.write(block)
 
-    def read_buffer(self):
+    def read_buffer(self, onset, end, out, shift=0):
         """
-        Read audio data from the buffer.
+        Read the audio window centered on an utterance from the buffer.
+
+        Args:
+            onset (int): Absolute position of the first sample of the utterance.
+            end (int): Absolute position of the last sample of the utterance.
+            out (numpy.ndarray): Preallocated output window.
+            shift (int): Shift of the window from the center of the utterance, in samples.
+
+        Returns:
+            numpy.ndarray: The audio window.
+        """
+        start = (onset + end - len(out)) // 2 + shift
+        start = min(start, self.audio_buffer.written - len(out))
+        start = max(start, self.audio_buffer.written - self.audio_buffer.capacity)
+        return self.audio_buffer.read(start, out)
+
+    def read_windows(self, onset, end, out):
+        """
+        Read the shifted audio windows around an utterance from the buffer.
+
+        The utterance is classified as soon as it ends, so the later windows usually reach
+        past the written samples. Rather than waiting for them, all the windows are moved
+        back together until the last one ends at the write position: they keep their spacing,
+        so every one of them is a different view of the utterance.
+
+        Args:
+            onset (int): Absolute position of the first sample of the utterance.
+            end (int): Absolute position of the last sample of the utterance.
+            out (numpy.ndarray): Preallocated output windows (one row per shift).
 
         Returns:
-            numpy.ndarray: Concatenated audio data from the buffer.
+            numpy.ndarray: The audio windows (a single window if there is only one shift).
+        """
+        last_start = (onset + end - out.shape[1]) // 2 + max(self.window_shifts)
+        offset = min(0, self.audio_buffer.written - out.shape[1] - last_start)
+        for window, shift in zip(out, self.window_shifts):
+            self.read_buffer(onset, end, window, shift + offset)
+        return out[0] if len(out) == 1 else out
+
+    def detect_command(self, onset, end, windows):
         """
-        while self.audio_buffer[2]:
-            sd.sleep(1)
-        return np.concatenate(self.audio_buffer[:2], axis=0)
+        Classify the utterance and publish the detected command.
+
+        Args:
+            onset (int): Absolute position of the first sample of the utterance.
+            end (int): Absolute position of the last sample of the utterance.
+            windows (numpy.ndarray): Preallocated audio windows (one row per shift).
+        """
+        if self.recorders:
+            start = time.perf_counter()
+            audio_data = self.read_windows(onset, end, windows)
+            middle = time.perf_counter()
+            label, confidence = self.classify_audio(audio_data)
+            self.record('window_read', start, middle)
+            self.record('inference', middle, time.perf_counter())
+        else:
+            audio_data = self.read_windows(onset, end, windows)
+            label, confidence = self.classify_audio(audio_data)
+        if label not in self.vocab:
+            label = 'unknown'
+        self.last_command = Command(label, confidence, self.audio_buffer.time_of(onset), time.perf_counter())
+        self.commands.put(self.last_command)
+        if self.verbose:
+            print(f"Detected Command: {label} ({confidence:.0%})")
 
     def run(self):
         """
-        Start the audio classification process.
+        Start the audio classification process (loading the model first if needed).
         """
+        if self.model is None:
+            self.load_model()
+        if self.audio_stream is None:
+            self.open_stream()
         self.audio_stream.start()
-        sd.sleep(int(2000))
-
-        while self.state[0] != 'stop':
-            sd.sleep(int(500))
-            audio_data = self.read_buffer()
-            if audio_data.max() > (1-self.sensitivity):
-                sd.sleep(int(500))
-                audio_data = self.read_buffer()
-                audio_data = decimate(audio_data[:, 0], 3)
-                result = self.classify_audio(audio_data)
-                if result in self.vocab:
-                    self.state = [result, True]
-                else:
-                    self.state = ['unknown', True]
-                if self.verbose:
-                    print(f"Detected Command: {self.state[0]}")
-                sd.sleep(int(500))
+        self.ready.set()
+        if self.use_process:
+            if not self.active:
+                self.stop_worker()
+            self.receive()
+        else:
+            self.listen()
 
+        if self.verbose:
+            print(self.vad.report())
         self.audio_stream.stop()
         self.audio_stream.close()
+        if self.use_process:
+            self.stop_worker()
+            self.worker.join()
+            self.audio_buffer.close()
+        self.commands.close()
+
+    def listen(self):
+        """
+        Follow the audio buffer and classify the utterances (until stopped or the 'stop' command).
+        """
+        block = np.empty(self.block_size, dtype=np.float32)
+        windows = np.empty((len(self.window_shifts), self.window_size), dtype=np.float32)
+
+        # Start following the stream once a whole window is available
+        position = max(self.audio_buffer.written, self.window_size)
+        while self.active and (self.last_command is None or self.last_command.label != 'stop'):
+            # Wait for the next audio block
+            if not self.audio_buffer.wait(position + self.block_size, timeout=0.5):
+                continue
+            position = max(position, self.audio_buffer.written - self.audio_buffer.capacity + self.window_size)
+            if self.recorders:
+                start = time.perf_counter()
+                self.audio_buffer.read(position, block)
+                middle = time.perf_counter()
+                utterance = self.vad.process(block, position)
+                self.record('buffer_read', start, middle)
+                self.record('vad', middle, time.perf_counter())
+            else:
+                self.audio_buffer.read(position, block)
+                utterance = self.vad.process(block, position)
+
+            # Classify the utterances as soon as they end
+            position += self.block_size
+            if utterance is not None:
+                self.detect_command(*utterance, windows)
+
+    def receive(self):
+        """
+        Receive the commands, stage times and counters of the speech worker (until it ends).
+        """
+        while True:
+            try:
+                message = self._connection.recv()
+            except EOFError:
+                break
+            kind = message[0]
+            if kind == 'command':
+                self.last_command = Command(*message[1])
+                self.commands.put(self.last_command)
+            elif kind == 'record':
+                self.record(*message[1:])
+            elif kind == 'vad':
+                self.vad.frames, self.vad.inferences, self.vad.rejected = message[1]
+            elif kind == 'end':
+                break
+
+    def stop(self):
+        """
+        Stop the audio classification process.
+        """
+        self.active = False
+        self.stop_worker()
+        self.commands.close()
+
+    def stop_worker(self):
+        """
+        Ask the speech worker process to stop (only once, and only if it is running).
+        """
+        with self._stop_lock:
+            if self._connection is None or self._stop_sent:
+                return
+            self._stop_sent = True
+            try:
+                self._connection.send(('stop',))
+            except OSError:
+                pass
+
+
+def speech_worker(connection, buffer_args, settings):
+    """
+    Run the voice activity detection and the classification in a worker process.
+
+    Args:
+        connection (multiprocessing.connection.Connection): Pipe to the parent process (which sends 'stop').
+        buffer_args (tuple): Arguments attaching to the shared audio buffer of the parent process.
+        settings (dict): Sensitivity, verbose, backend, timed, resources and window shifts settings of the
+            parent classifier.
+    """
+    threading.current_thread().name = 'speech_worker'
+    pipe = CommandPipe(connection)
+    audio_classifier = AudioClassifier(sensitivity=settings['sensitivity'], verbose=settings['verbose'],
+                                       backend=settings['backend'], recorders=[pipe] if settings['timed'] else (),
+                                       resources=settings['resources'])
+    audio_classifier.window_shifts = settings['window_shifts']
+    audio_classifier.audio_buffer = SharedAudioRingBuffer(*buffer_args)
+    audio_classifier.commands = pipe
+    pipe.vad = audio_classifier.vad
+    try:
+        audio_classifier.load_model()
+    except Exception as error:
+        pipe.send('error', f"{type(error).__name__}: {error}")
+        return
+    pipe.send('ready')
+
+    # Stop when asked, or when the parent process is gone (the messages are only sent by the main thread)
+    def wait_stop():
+        try:
+            connection.recv()
+        except (EOFError, OSError):
+            pass
+        audio_classifier.active = False
+    threading.Thread(target=wait_stop, daemon=True).start()
+
+    audio_classifier.listen()
+    try:
+        pipe.close()
+    except OSError:
+        pass
+    audio_classifier.audio_buffer.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""
+AudioFrontEnd class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import numpy as np
+from math import gcd, ceil
+
+try:
+    from src.WavInputStream import WavInputStream
+except ModuleNotFoundError:
+    from WavInputStream import WavInputStream
+
+# Anti-aliasing filters already designed, by (up, down) resampling factors
+_FILTERS = {}
+
+def design_filter(up, down):
+    """
+    Design (once) the anti-aliasing FIR filter of a rational resampling.
+
+    The filter is the one used by 'scipy.signal.resample_poly'.
+
+    Args:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        numpy.ndarray: Filter coefficients (float32).
+    """
+    if up == down:
+        return np.ones(1, dtype=np.float32)
+    if (up, down) not in _FILTERS:
+        from scipy.signal import firwin
+        max_rate = max(up, down)
+        half_length = 10 * max_rate
+        taps = firwin(2 * half_length + 1, 1 / max_rate, window=('kaiser', 5.0)) * up
+        _FILTERS[(up, down)] = taps.astype(np.float32)
+    return _FILTERS[(up, down)]
+
+
+class StreamingResampler:
+    """
+    A streaming polyphase resampler for fixed-size float32 blocks.
+
+    The filter taps used by each output sample, and the positions of the input samples
+    they multiply, are the same for every block, so they are arranged once into two
+    matrices. Each block is then resampled with a gather and a row-wise dot product
+    into preallocated buffers, keeping the last input samples as filter history.
+
+    Attributes:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+        block_size (int): Number of input samples of each block.
+        output_size (int): Number of output samples of each block.
+        coefficients (numpy.ndarray): Filter taps of each output sample (output_size x taps).
+        indices (numpy.ndarray): Input positions of each tap (output_size x taps).
+    """
+
+    def __init__(self, input_rate, output_rate, block_size):
+        """
+        Initializes the StreamingResampler class.
+
+        Args:
+            input_rate (int): Sampling rate of the input blocks.
+            output_rate (int): Sampling rate of the output blocks.
+            block_size (int): Number of input samples of each block.
+        """
+        factor = gcd(input_rate, output_rate)
+        self.up, self.down = output_rate // factor, input_rate // factor
+        if (block_size * self.up) % self.down:
+            raise ValueError(f"A block of {block_size} samples at {input_rate} Hz is not a whole "
+                             f"number of samples at {output_rate} Hz")
+        self.block_size = block_size
+        self.output_size = block_size * self.up // self.down
+
+        # Split the filter into its polyphase components
+        taps = design_filter(self.up, self.down)
+        phase_length = ceil(len(taps) / self.up)
+        taps = np.concatenate([taps, np.zeros(phase_length * self.up - len(taps), dtype=np.float32)])
+        phases = taps.reshape((phase_length, self.up)).T
+
+        # Taps and input positions of every output sample of a block (the history goes first)
+        history = phase_length - 1
+        output = np.arange(self.output_size)
+        self.coefficients = np.ascontiguousarray(phases[(output * self.down) % self.up])
+        self.indices = history + ((output * self.down) // self.up)[:, None] - np.arange(phase_length)[None, :]
+
+        # Preallocated buffers
+        self._extended = np.zeros(history + block_size, dtype=np.float32)
+        self._gathered = np.empty(self.indices.shape, dtype=np.float32)
+        self._output = np.empty(self.output_size, dtype=np.float32)
+        self._history = history
+
+    def process(self, block):
+        """
+        Resample a new block.
+
+        Args:
+            block (numpy.ndarray): Input block of 'block_size' samples.
+
+        Returns:
+            numpy.ndarray: Output block (a preallocated buffer, overwritten by the next call).
+        """
+        self._extended[self._history:] = block
+        np.take(self._extended, self.indices, out=self._gathered)
+        np.einsum('ij,ij->i', self._gathered, self.coefficients, out=self._output)
+        if self._history:
+            self._extended[:self._history] = self._extended[-self._history:]
+        return self._output
+
+
+class AudioFrontEnd:
+    """
+    An audio input stage which delivers mono float32 blocks at the model sampling rate.
+
+    The input device is opened directly at the target rate when it supports it; otherwise,
+    it is opened at its default rate and the blocks go through a StreamingResampler.
+    A WAV file can replace the microphone (it is resampled when it is read).
+
+    Attributes:
+        target_rate (int): Sampling rate of the delivered blocks.
+        block_size (int): Number of samples of each delivered block.
+        input_rate (int): Sampling rate of the input stream.
+        resampler (StreamingResampler): Resampler of the input blocks (None if not needed).
+        stream: The sounddevice input stream (or the WAV replay stream).
+        callback: Function called with every new block (the block is only valid during the call).
+        recorder: Object with a 'record(stage, start, end)' method, which receives the resampling time.
+    """
+
+    def __init__(self, callback, target_rate=16000, block_duration=0.02, audio_file=None, recorder=None):
+        """
+        Initializes the AudioFrontEnd class.
+
+        Args:
+            callback: Function called with every new block.
+            target_rate (int): Sampling rate of the delivered blocks.
+            block_duration (float): Duration of each block in seconds.
+            audio_file (str, optional): WAV file replayed instead of the microphone input.
+            recorder (optional): Object with a 'record(stage, start, end)' method.
+        """
+        self.callback = callback
+        self.recorder = recorder
+        self.target_rate = target_rate
+        self.block_size = round(target_rate * block_duration)
+        self.resampler = None
+
+        if audio_file is not None:
+            self.input_rate = target_rate
+            self.stream = WavInputStream(audio_file, callback=self._callback, channels=1,
+                                         samplerate=target_rate, blocksize=self.block_size)
+            return
+
+        import sounddevice as sd
+        try:
+            sd.check_input_settings(channels=1, dtype='float32', samplerate=target_rate)
+            self.input_rate = target_rate
+        except Exception:
+            self.input_rate = int(sd.query_devices(kind='input')['default_samplerate'])
+        input_block = round(self.input_rate * block_duration)
+        if self.input_rate != target_rate:
+            self.resampler = StreamingResampler(self.input_rate, target_rate, input_block)
+        self.stream = sd.InputStream(callback=self._callback, channels=1, dtype='float32',
+                                     samplerate=self.input_rate, blocksize=input_block)
+
+    def _callback(self, indata, _, __, ___):
+        """
+        Callback function of the input stream.
+
+        Args:
+            indata (numpy.ndarray): Input audio data.
+        """
+        block = indata[:, 0]
+        if self.resampler is not None:
+            if self.recorder is not None:
+                start = time.perf_counter()
+                block = self.resampler.process(block)
+                self.recorder.record('resample', start, time.perf_counter())
+            else:
+                block = self.resampler.process(block)
+        self.callback(block)
+
+    def start(self):
+        """
+        Start the input stream.
+        """
+        self.stream.start()
+
+    def stop(self):
+        """
+        Stop the input stream.
+        """
+        self.stream.stop()
+
+    def close(self):
+        """
+        Close the input stream.
+        """
+        self.stream.close()
@@ -0,0 +1,220 @@
+"""
+AudioRingBuffer class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import threading
+import numpy as np
+
+class AudioRingBuffer:
+    """
+    A preallocated ring buffer of audio samples, shared by the audio callback and the classifier.
+
+    The samples are addressed by their absolute position in the stream (number of samples
+    written before them), so the reader can follow the stream at its own pace and read
+    any window of the last 'capacity' samples.
+
+    Attributes:
+        capacity (int): Number of samples kept in the buffer.
+        buffer (numpy.ndarray): The preallocated samples (float32).
+        written (int): Total number of samples written so far.
+        sample_rate (int): Sampling rate of the samples (used to find the time of a position).
+        write_time (float): 'time.perf_counter' value of the last write.
+    """
+
+    def __init__(self, capacity, sample_rate=16000):
+        """
+        Initializes the AudioRingBuffer class.
+
+        Args:
+            capacity (int): Number of samples kept in the buffer.
+            sample_rate (int): Sampling rate of the samples.
+        """
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=np.float32)
+        self.written = 0
+        self.sample_rate = sample_rate
+        self.write_time = time.perf_counter()
+        self._condition = threading.Condition()
+
+    def write(self, samples):
+        """
+        Append new samples to the buffer, overwriting the oldest ones.
+
+        Args:
+            samples (numpy.ndarray): New mono samples.
+        """
+        length = len(samples)
+        samples = samples[-self.capacity:]
+        with self._condition:
+            start = (self.written + length - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self.buffer[start:start + first] = samples[:first]
+            self.buffer[:len(samples) - first] = samples[first:]
+            self.written += length
+            self.write_time = time.perf_counter()
+            self._condition.notify_all()
+
+    def read(self, position, out):
+        """
+        Copy the samples starting at an absolute position.
+
+        Args:
+            position (int): Absolute position of the first sample; it must be one of the
+                last 'capacity' samples written.
+            out (numpy.ndarray): Preallocated output array (its length sets the number of samples).
+
+        Returns:
+            numpy.ndarray: The output array.
+        """
+        length = len(out)
+        with self._condition:
+            if position < self.written - self.capacity or position + length > self.written:
+                raise IndexError(f"Samples {position}-{position + length} are not in the buffer "
+                                 f"(available: {max(0, self.written - self.capacity)}-{self.written})")
+            start = position % self.capacity
+            first = min(length, self.capacity - start)
+            out[:first] = self.buffer[start:start + first]
+            out[first:] = self.buffer[:length - first]
+        return out
+
+    def time_of(self, position):
+        """
+        Estimate when a sample was captured, from the time of the last write.
+
+        Args:
+            position (int): Absolute position of the sample.
+
+        Returns:
+            float: Estimated 'time.perf_counter' value of the sample.
+        """
+        with self._condition:
+            return self.write_time - (self.written - position) / self.sample_rate
+
+    def wait(self, position, timeout=None):
+        """
+        Wait until the samples up to an absolute position have been written.
+
+        Args:
+            position (int): Absolute position to wait for.
+            timeout (float, optional): Maximum waiting time in seconds.
+
+        Returns:
+            boolean: Whether the samples are available.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.written >= position, timeout)
+
+
+class SharedAudioRingBuffer(AudioRingBuffer):
+    """
+    An AudioRingBuffer in shared memory, so the samples written by one process can be
+    followed by another one.
+
+    The samples, the number of samples written and the time of the last write live in a
+    'multiprocessing.shared_memory' block. No lock is shared between the processes (a process
+    killed while holding it would block the others): the single writer publishes the new
+    samples by increasing the written counter after copying them, and the readers of other
+    processes sleep until the next samples are due. The process which creates the buffer owns
+    the memory block; the other processes attach to it with the arguments given by 'attach_args'.
+
+    Attributes:
+        shared_memory (multiprocessing.shared_memory.SharedMemory): The shared memory block.
+        owner (boolean): Whether this process created (and will free) the memory block.
+    """
+
+    def __init__(self, capacity, sample_rate=16000, name=None):
+        """
+        Initializes the SharedAudioRingBuffer class.
+
+        Args:
+            capacity (int): Number of samples kept in the buffer.
+            sample_rate (int): Sampling rate of the samples.
+            name (str, optional): Name of the memory block to attach to (a new one is created if not given).
+        """
+        from multiprocessing import shared_memory
+
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.owner = name is None
+        size = 16 + 4 * capacity
+        if self.owner:
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            try:
+                self.shared_memory = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Before Python 3.13 the block is tracked again, by the tracker shared with the parent process
+                self.shared_memory = shared_memory.SharedMemory(name=name)
+        self._written = np.ndarray(1, dtype=np.int64, buffer=self.shared_memory.buf)
+        self._write_time = np.ndarray(1, dtype=np.float64, buffer=self.shared_memory.buf, offset=8)
+        self.buffer = np.ndarray(capacity, dtype=np.float32, buffer=self.shared_memory.buf, offset=16)
+        if self.owner:
+            self.buffer[:] = 0
+            self.written = 0
+            self.write_time = time.perf_counter()
+        self._condition = threading.Condition()
+
+    @property
+    def written(self):
+        return int(self._written[0])
+
+    @written.setter
+    def written(self, value):
+        self._written[0] = value
+
+    @property
+    def write_time(self):
+        return float(self._write_time[0])
+
+    @write_time.setter
+    def write_time(self, value):
+        self._write_time[0] = value
+
+    def attach_args(self):
+        """
+        Get the arguments which attach another process to this buffer.
+
+        Returns:
+            tuple: Arguments of the SharedAudioRingBuffer class (they can be sent to a child process).
+        """
+        return self.capacity, self.sample_rate, self.shared_memory.name
+
+    def wait(self, position, timeout=None):
+        """
+        Wait until the samples up to an absolute position have been written.
+
+        The samples written by another process are not notified, so the reader sleeps
+        until they are due (at the sampling rate), and checks again.
+
+        Args:
+            position (int): Absolute position to wait for.
+            timeout (float, optional): Maximum waiting time in seconds.
+
+        Returns:
+            boolean: Whether the samples are available.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            missing = position - self.written
+            if missing <= 0:
+                return True
+            delay = max(missing / self.sample_rate, 0.001)
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def close(self):
+        """
+        Detach from the memory block (and free it, in the process which created it).
+        """
+        self._written = self._write_time = self.buffer = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
@@ -0,0 +1,129 @@
+"""
+CommandQueue class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+try:
+    from src.Pipeline import DropOldestQueue
+except ModuleNotFoundError:
+    from Pipeline import DropOldestQueue
+
+# A detected voice command: label, classifier confidence (0.0 to 1.0), and 'time.perf_counter'
+# values of the voice onset and of the detection
+Command = namedtuple('Command', ['label', 'confidence', 'onset', 'detected'])
+
+class CommandQueue(DropOldestQueue):
+    """
+    A bounded thread-safe queue of the detected voice commands.
+
+    The audio thread never waits on it: when it is full, the oldest command is dropped
+    (and counted). The consumers sleep until a command arrives, and the commands still
+    queued when it is closed are delivered before the end is signaled.
+    """
+
+    def __init__(self, maxsize=16):
+        """
+        Initializes the CommandQueue class.
+
+        Args:
+            maxsize (int): Maximum number of queued commands.
+        """
+        super().__init__(maxsize)
+
+    def get(self, timeout=None):
+        """
+        Take the oldest command, waiting until there is one.
+
+        Args:
+            timeout (float, optional): Maximum waiting time in seconds.
+
+        Returns:
+            Command: The oldest command (None if the queue is closed and empty, or on timeout).
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            if self._items:
+                return self._items.popleft()
+            return None
+
+
+class CommandPipe:
+    """
+    The sending end of the voice commands of a speech worker process.
+
+    It replaces the CommandQueue (and the recorders) of an AudioClassifier running in
+    another process: the commands, the stage times and the voice activity counters are
+    sent as small tuples through a 'multiprocessing' pipe, and the parent process puts
+    them back into its own queue and recorders.
+
+    Messages:
+        ('ready',), ('error', text), ('command', fields), ('record', stage, start, end, thread),
+        ('vad', (frames, inferences, rejected)) and ('end',).
+
+    Attributes:
+        connection (multiprocessing.connection.Connection): The sending end of the pipe.
+        vad (VoiceActivityDetector): Detector whose counters are sent with each command.
+    """
+
+    def __init__(self, connection, vad=None):
+        """
+        Initializes the CommandPipe class.
+
+        Args:
+            connection (multiprocessing.connection.Connection): The sending end of the pipe.
+            vad (VoiceActivityDetector, optional): Detector whose counters are sent with each command.
+        """
+        self.connection = connection
+        self.vad = vad
+
+    def send(self, *message):
+        """
+        Send a message to the parent process.
+
+        Args:
+            *message: Kind of the message and its values.
+        """
+        self.connection.send(message)
+
+    def send_counters(self):
+        """
+        Send the counters of the voice activity detector.
+        """
+        if self.vad is not None:
+            self.send('vad', (self.vad.frames, self.vad.inferences, self.vad.rejected))
+
+    def put(self, command):
+        """
+        Send a detected command.
+
+        Args:
+            command (Command): The detected command.
+        """
+        self.send('command', tuple(command))
+        self.send_counters()
+
+    def record(self, stage, start, end):
+        """
+        Send the execution time of a stage (with the process and the thread which ran it).
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        thread = threading.current_thread()
+        self.send('record', stage, start, end, (os.getpid(), thread.ident, thread.name))
+
+    def close(self):
+        """
+        Signal the end of the commands (the last counters are sent first).
+        """
+        self.send_counters()
+        self.send('end')
@@ -5,7 +5,10 @@ Author: HenryAreiza
 Date: 08/09/2023
 """
 
-import pyautogui
+try:
+    from src.CursorBackend import create_backend
+except ModuleNotFoundError:
+    from CursorBackend import create_backend
 
 class Cursor:
     """
@@ -15,52 +18,65 @@ class Cursor:
     and performing mouse actions such as clicking, scrolling, and more.
 
     Attributes:
+        backend: The cursor output backend (see CursorBackend).
         screen_width (int): The width of the screen in pixels.
         screen_height (int): The height of the screen in pixels.
         sustained_state (boolean): State of the sustained click
+        position (tuple): Last cursor position sent to the backend, in pixels.
     """
 
-    def __init__(self):
+    def __init__(self, backend='pyautogui', screen_size=None):
         """
         Initializes the Cursor class.
+
+        Args:
+            backend (str or object): Name of the cursor output backend ('pyautogui', 'pynput',
+                'uinput', 'null' or 'recording'), or an already created backend.
+            screen_size (tuple, optional): Screen size in pixels (read from the display if not given).
         """
-        self.screen_width = pyautogui.size().width
-        self.screen_height = pyautogui.size().height
+        if isinstance(backend, str):
+            backend = create_backend(backend, screen_size)
+        self.backend = backend
+        self.screen_width, self.screen_height = self.backend.size()
         self.sustained_state = False
+        self.position = None
 
     def move(self, x_normalized, y_normalized):
         """
         Move the cursor to a specified normalized position.
 
+        Movements that do not change the pixel position of the cursor are dropped.
+
         Args:
             x_normalized (float): Normalized x-coordinate (0.0 to 1.0).
             y_normalized (float): Normalized y-coordinate (0.0 to 1.0).
         """
-        x_pixel = int(x_normalized * self.screen_width)
-        y_pixel = int(y_normalized * self.screen_height)
-        pyautogui.moveTo(x_pixel, y_pixel)
+        position = (int(x_normalized * self.screen_width), int(y_normalized * self.screen_height))
+        if position != self.position:
+            self.position = position
+            self.backend.move_to(*position)
 
     def left_click(self):
         """
         Perform a left mouse click.
         """
-        pyautogui.click(button='left')
+        self.backend.click('left')
 
     def right_click(self):
         """
         Perform a right mouse click.
         """
-        pyautogui.click(button='right')
+        self.backend.click('right')
 
     def sustained_left_click(self):
         """
         Perform a sustained left mouse click.
         """
         if not self.sustained_state:
-            pyautogui.mouseDown(button='left')
+            self.backend.press('left')
             self.sustained_state = True
         else:
-            pyautogui.mouseUp(button='left')
+            self.backend.release('left')
             self.sustained_state = False
 
     def scroll(self, amount, direction):
@@ -72,15 +88,16 @@ class Cursor:
             direction (str): The direction to scroll ('up' or 'down')
         """
         if direction == 'up':
-            pyautogui.scroll(amount)
+            self.backend.scroll(amount)
         elif direction == 'down':
-            pyautogui.scroll(-amount)      
+            self.backend.scroll(-amount)      
 
     def double_left_click(self):
         """
         Perform a double left mouse click.
         """
-        pyautogui.doubleClick(button='left')
+        self.backend.double_click('left')
+
 
 def mouse_action(cursor_obj, position_obj, action, state, verbose=True):
     """
@@ -0,0 +1,243 @@
+"""
+Cursor output backends
+
+Author: HenryAreiza
+Date: 18/10/2026
+
+Each backend executes the low-level mouse operations requested by the Cursor class.
+All of them provide the same methods: size(), move_to(), click(), double_click(), press(), release()
+and scroll().
+The libraries used by each backend are imported only when that backend is created.
+"""
+
+import time
+
+def display_size():
+    """
+    Read the screen size from the graphical display.
+
+    Returns:
+        tuple: Screen size in pixels (width, height).
+    """
+    import pyautogui
+    size = pyautogui.size()
+    return size.width, size.height
+
+
+class PyAutoGuiBackend:
+    """
+    Mouse output through PyAutoGUI, without its per-call pause.
+
+    PyAutoGUI sleeps 'pyautogui.PAUSE' seconds (0.1 s by default) after every call,
+    which limits the cursor updates to about 10 Hz, so every call is done with '_pause=False'.
+    """
+
+    def __init__(self, screen_size=None):
+        """
+        Initializes the PyAutoGuiBackend class.
+
+        Args:
+            screen_size (tuple, optional): Screen size in pixels (read from the display if not given).
+        """
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.screen_size = display_size() if screen_size is None else tuple(screen_size)
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def click(self, button, clicks=1):
+        self.pyautogui.click(button=button, clicks=clicks, _pause=False)
+
+    def double_click(self, button):
+        # Only 'doubleClick' sends a real double click (click count 2) on macOS
+        self.pyautogui.doubleClick(button=button, _pause=False)
+
+    def press(self, button):
+        self.pyautogui.mouseDown(button=button, _pause=False)
+
+    def release(self, button):
+        self.pyautogui.mouseUp(button=button, _pause=False)
+
+    def scroll(self, amount):
+        self.pyautogui.scroll(amount, _pause=False)
+
+
+class PynputBackend:
+    """
+    Mouse output through the pynput mouse controller.
+    """
+
+    def __init__(self, screen_size=None):
+        """
+        Initializes the PynputBackend class.
+
+        Args:
+            screen_size (tuple, optional): Screen size in pixels (read from the display if not given).
+        """
+        from pynput.mouse import Controller, Button
+        self.mouse = Controller()
+        self.buttons = {'left': Button.left, 'right': Button.right}
+        self.screen_size = display_size() if screen_size is None else tuple(screen_size)
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        self.mouse.position = (x, y)
+
+    def click(self, button, clicks=1):
+        self.mouse.click(self.buttons[button], clicks)
+
+    def double_click(self, button):
+        self.mouse.click(self.buttons[button], 2)
+
+    def press(self, button):
+        self.mouse.press(self.buttons[button])
+
+    def release(self, button):
+        self.mouse.release(self.buttons[button])
+
+    def scroll(self, amount):
+        self.mouse.scroll(0, amount)
+
+
+class UInputBackend:
+    """
+    Mouse output through a Linux uinput virtual device (evdev library).
+
+    The virtual device reports absolute coordinates, so it works the same way under X11,
+    Wayland or a bare console. Write access to '/dev/uinput' is required.
+    """
+
+    def __init__(self, screen_size=None):
+        """
+        Initializes the UInputBackend class.
+
+        Args:
+            screen_size (tuple, optional): Screen size in pixels (read from the display if not given).
+        """
+        from evdev import UInput, AbsInfo, ecodes
+        self.ecodes = ecodes
+        self.screen_size = display_size() if screen_size is None else tuple(screen_size)
+        self.buttons = {'left': ecodes.BTN_LEFT, 'right': ecodes.BTN_RIGHT}
+        capabilities = {
+            ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT],
+            ecodes.EV_REL: [ecodes.REL_WHEEL],
+            ecodes.EV_ABS: [(ecodes.ABS_X, AbsInfo(0, 0, self.screen_size[0] - 1, 0, 0, 0)),
+                            (ecodes.ABS_Y, AbsInfo(0, 0, self.screen_size[1] - 1, 0, 0, 0))]
+        }
+        self.device = UInput(capabilities, name='hands-free-cursor')
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_X, x)
+        self.device.write(self.ecodes.EV_ABS, self.ecodes.ABS_Y, y)
+        self.device.syn()
+
+    def click(self, button, clicks=1):
+        for _ in range(clicks):
+            self.press(button)
+            self.release(button)
+
+    def double_click(self, button):
+        self.click(button, clicks=2)
+
+    def press(self, button):
+        self.device.write(self.ecodes.EV_KEY, self.buttons[button], 1)
+        self.device.syn()
+
+    def release(self, button):
+        self.device.write(self.ecodes.EV_KEY, self.buttons[button], 0)
+        self.device.syn()
+
+    def scroll(self, amount):
+        self.device.write(self.ecodes.EV_REL, self.ecodes.REL_WHEEL, amount)
+        self.device.syn()
+
+
+class NullBackend:
+    """
+    Mouse output that discards every operation (no graphical display is needed).
+    """
+
+    def __init__(self, screen_size=(1366, 768)):
+        """
+        Initializes the NullBackend class.
+
+        Args:
+            screen_size (tuple): Simulated screen size in pixels (width, height).
+        """
+        self.screen_size = tuple(screen_size)
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        self.record('move_to', x, y)
+
+    def click(self, button, clicks=1):
+        self.record('click', button, clicks)
+
+    def double_click(self, button):
+        self.click(button, clicks=2)
+
+    def press(self, button):
+        self.record('press', button)
+
+    def release(self, button):
+        self.record('release', button)
+
+    def scroll(self, amount):
+        self.record('scroll', amount)
+
+    def record(self, action, *args):
+        pass
+
+
+class RecordingBackend(NullBackend):
+    """
+    Mouse output that records every operation instead of executing it (used by tests and benchmarks).
+
+    Attributes:
+        events (list): Recorded operations as (timestamp, action, arguments) tuples.
+    """
+
+    def __init__(self, screen_size=(1366, 768)):
+        """
+        Initializes the RecordingBackend class.
+
+        Args:
+            screen_size (tuple): Simulated screen size in pixels (width, height).
+        """
+        super().__init__(screen_size)
+        self.events = []
+
+    def record(self, action, *args):
+        self.events.append((time.perf_counter(), action, args))
+
+
+BACKENDS = {'pyautogui': PyAutoGuiBackend, 'pynput': PynputBackend, 'uinput': UInputBackend,
+            'null': NullBackend, 'recording': RecordingBackend}
+
+def create_backend(name, screen_size=None):
+    """
+    Create a cursor output backend.
+
+    Args:
+        name (str): Name of the backend ('pyautogui', 'pynput', 'uinput', 'null' or 'recording').
+        screen_size (tuple, optional): Screen size in pixels.
+
+    Returns:
+        The cursor output backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown cursor backend '{name}', choose one of {list(BACKENDS)}")
+    if screen_size is None:
+        return BACKENDS[name]()
+    return BACKENDS[name](screen_size)
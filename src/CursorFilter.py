@@ -0,0 +1,263 @@
+"""
+Cursor position filters
+
+Author: HenryAreiza
+Date: 18/10/2026
+
+Each filter smooths a stream of cursor positions (any number of coordinates):
+cursor_filter(position, timestamp) returns the filtered position (a preallocated array,
+overwritten by the next call). Every update is O(1) and vectorized over the coordinates.
+"""
+
+import math
+import numpy as np
+
+class NoFilter:
+    """
+    Positions passed through without filtering.
+    """
+
+    def __init__(self, size=2):
+        """
+        Initializes the NoFilter class.
+
+        Args:
+            size (int): Number of coordinates of each position.
+        """
+        self._output = np.zeros(size)
+
+    def __call__(self, position, timestamp):
+        self._output[:] = position
+        return self._output
+
+    def reset(self):
+        """
+        Forget the previous positions.
+        """
+
+
+class MeanFilter:
+    """
+    Moving average of the last positions (adds about (window - 1) / 2 samples of lag).
+
+    Attributes:
+        window (int): Number of averaged positions.
+    """
+
+    def __init__(self, window=5, size=2):
+        """
+        Initializes the MeanFilter class.
+
+        Args:
+            window (int): Number of averaged positions.
+            size (int): Number of coordinates of each position.
+        """
+        self.window = int(window)
+        self._history = np.zeros((self.window, size))
+        self._sum = np.zeros(size)
+        self._output = np.zeros(size)
+        self._index = 0
+        self._count = 0
+
+    def __call__(self, position, timestamp):
+        self._sum -= self._history[self._index]
+        self._history[self._index] = position
+        self._sum += self._history[self._index]
+        self._index = (self._index + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+        np.divide(self._sum, self._count, out=self._output)
+        return self._output
+
+    def reset(self):
+        """
+        Forget the previous positions.
+        """
+        self._history[:] = 0
+        self._sum[:] = 0
+        self._index = 0
+        self._count = 0
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter: a low-pass filter whose cutoff frequency grows with the speed.
+
+    Slow movements are strongly smoothed (removing the jitter), while fast movements
+    raise the cutoff frequency, so they are followed with little lag.
+
+    Attributes:
+        min_cutoff (float): Cutoff frequency at rest, in Hz.
+        beta (float): Increase of the cutoff frequency with the speed.
+        d_cutoff (float): Cutoff frequency of the speed estimate, in Hz.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=20.0, d_cutoff=1.0, size=2):
+        """
+        Initializes the OneEuroFilter class.
+
+        Args:
+            min_cutoff (float): Cutoff frequency at rest, in Hz.
+            beta (float): Increase of the cutoff frequency with the speed.
+            d_cutoff (float): Cutoff frequency of the speed estimate, in Hz.
+            size (int): Number of coordinates of each position.
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._output = np.zeros(size)
+        self._speed = np.zeros(size)
+        self._step = np.zeros(size)
+        self._alpha = np.zeros(size)
+        self._time = None
+
+    @staticmethod
+    def _smoothing(cutoff, interval):
+        """
+        Compute the exponential smoothing factor of a cutoff frequency.
+
+        Args:
+            cutoff (float or numpy.ndarray): Cutoff frequency in Hz.
+            interval (float): Time since the previous sample, in seconds.
+
+        Returns:
+            The smoothing factor (0.0 to 1.0).
+        """
+        return 1 / (1 + 1 / (2 * math.pi * cutoff * interval))
+
+    def __call__(self, position, timestamp):
+        if self._time is None:
+            self._output[:] = position
+            self._speed[:] = 0
+            self._time = timestamp
+            return self._output
+        interval = max(timestamp - self._time, 1e-6)
+        self._time = timestamp
+
+        # Smoothed speed of the position
+        np.subtract(position, self._output, out=self._step)
+        self._step /= interval
+        self._speed += self._smoothing(self.d_cutoff, interval) * (self._step - self._speed)
+
+        # Smoothing with a cutoff frequency that grows with the speed
+        np.abs(self._speed, out=self._alpha)
+        self._alpha *= self.beta
+        self._alpha += self.min_cutoff
+        self._alpha *= 2 * math.pi * interval
+        np.divide(self._alpha, self._alpha + 1, out=self._alpha)
+        np.subtract(position, self._output, out=self._step)
+        self._step *= self._alpha
+        self._output += self._step
+        return self._output
+
+    def reset(self):
+        """
+        Forget the previous positions.
+        """
+        self._time = None
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter (each coordinate filtered independently).
+
+    The state of each coordinate is its position and velocity; the acceleration is
+    modeled as white noise. The output can be predicted 'lead' seconds ahead, to
+    compensate the latency of the rest of the pipeline.
+
+    Attributes:
+        process_noise (float): Spectral density of the acceleration noise.
+        measurement_noise (float): Variance of the measured positions.
+        lead (float): Prediction time of the output, in seconds.
+    """
+
+    def __init__(self, process_noise=0.1, measurement_noise=1e-4, lead=0.0, size=2):
+        """
+        Initializes the KalmanFilter class.
+
+        Args:
+            process_noise (float): Spectral density of the acceleration noise.
+            measurement_noise (float): Variance of the measured positions.
+            lead (float): Prediction time of the output, in seconds.
+            size (int): Number of coordinates of each position.
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.lead = lead
+        self._position = np.zeros(size)
+        self._velocity = np.zeros(size)
+        self._innovation = np.zeros(size)
+        self._output = np.zeros(size)
+        self._time = None
+        self._p00 = self._p01 = self._p11 = 0.0
+
+    def __call__(self, position, timestamp):
+        if self._time is None:
+            self._position[:] = position
+            self._velocity[:] = 0
+            self._p00, self._p01, self._p11 = self.measurement_noise, 0.0, 1.0
+            self._time = timestamp
+            self._output[:] = position
+            return self._output
+        dt = max(timestamp - self._time, 1e-6)
+        self._time = timestamp
+        q = self.process_noise
+
+        # Prediction (the covariance is the same for every coordinate)
+        self._position += self._velocity * dt
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + q * dt ** 3 / 3
+        p01 = self._p01 + dt * self._p11 + q * dt ** 2 / 2
+        p11 = self._p11 + q * dt
+
+        # Correction with the measured position
+        gain0 = p00 / (p00 + self.measurement_noise)
+        gain1 = p01 / (p00 + self.measurement_noise)
+        np.subtract(position, self._position, out=self._innovation)
+        self._position += gain0 * self._innovation
+        self._velocity += gain1 * self._innovation
+        self._p00, self._p01, self._p11 = (1 - gain0) * p00, (1 - gain0) * p01, p11 - gain1 * p01
+
+        np.multiply(self._velocity, self.lead, out=self._output)
+        self._output += self._position
+        return self._output
+
+    def reset(self):
+        """
+        Forget the previous positions.
+        """
+        self._time = None
+
+
+FILTERS = {'none': NoFilter, 'mean': MeanFilter, 'one_euro': OneEuroFilter, 'kalman': KalmanFilter}
+
+def parse_params(text):
+    """
+    Parse filter parameters written as 'name=value,name=value'.
+
+    Args:
+        text (str): The parameters (None or empty for no parameters).
+
+    Returns:
+        dict: The parameters (as floats).
+    """
+    params = {}
+    for item in (text or '').split(','):
+        if item.strip():
+            name, value = item.split('=')
+            params[name.strip()] = float(value)
+    return params
+
+def create_filter(name, size=2, **params):
+    """
+    Create a cursor position filter.
+
+    Args:
+        name (str): Name of the filter ('none', 'mean', 'one_euro' or 'kalman').
+        size (int): Number of coordinates of each position.
+        **params: Parameters of the filter.
+
+    Returns:
+        The cursor position filter.
+    """
+    if name not in FILTERS:
+        raise ValueError(f"Unknown cursor filter '{name}', choose one of {list(FILTERS)}")
+    return FILTERS[name](size=size, **params)
@@ -0,0 +1,176 @@
+"""
+CursorInterpolator class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import math
+import time
+import threading
+import numpy as np
+
+class CursorInterpolator:
+    """
+    A class for moving the cursor at the display rate between the face tracking updates.
+
+    The face tracking updates the cursor location at the camera rate, in discrete steps.
+    This class runs an output thread at a higher rate (e.g. 120 Hz) which extrapolates the
+    cursor location from the latest update and its velocity estimate. When a new update
+    arrives, the difference between the extrapolated and the new location is not applied
+    at once, but faded out in about one update interval, so the motion stays continuous.
+    The extrapolation is limited to one update interval, so the cursor stops when the updates stop.
+
+    Every cursor move of the output thread is sent to the recorders as the 'cursor_move' stage.
+
+    Attributes:
+        cursor (Cursor): The cursor moved by the output thread (repeated pixel positions are dropped).
+        rate (float): Output rate in Hz.
+        recorders (list): Objects with a 'record(stage, start, end)' method (e.g. LatencyStats).
+        max_extrapolation (float): Maximum extrapolation time after the last update, in seconds.
+        max_gap (float): Time without updates after which the next update resets the motion, in seconds.
+        smoothing (float): Weight of the newest velocity in the velocity estimate.
+        location (numpy.ndarray): Last updated cursor location (normalized).
+        velocity (numpy.ndarray): Velocity estimate (normalized units per second).
+        interval (float): Average time between updates, in seconds.
+        active (threading.Event): Set while the output thread moves the cursor.
+    """
+
+    def __init__(self, cursor, rate=120, max_extrapolation=0.1, max_gap=0.25, smoothing=0.5, recorders=()):
+        """
+        Initializes the CursorInterpolator class.
+
+        Args:
+            cursor (Cursor): The cursor moved by the output thread.
+            rate (float): Output rate in Hz.
+            max_extrapolation (float): Maximum extrapolation time after the last update, in seconds.
+            max_gap (float): Time without updates after which the next update resets the motion, in seconds.
+            smoothing (float): Weight of the newest velocity in the velocity estimate.
+            recorders (iterable): Objects with a 'record(stage, start, end)' method, which receive the
+                time of every cursor move.
+        """
+        self.cursor = cursor
+        self.rate = rate
+        self.recorders = [recorder for recorder in recorders if recorder is not None]
+        self.max_extrapolation = max_extrapolation
+        self.max_gap = max_gap
+        self.smoothing = smoothing
+        self.location = None
+        self.velocity = np.zeros(2)
+        self.interval = 1 / 30
+        self.active = threading.Event()
+        self.active.set()
+
+        self._time = 0.0
+        self._offset = np.zeros(2)
+        self._position = np.zeros(2)
+        self._step = np.zeros(2)
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """
+        Start the output thread.
+
+        Returns:
+            CursorInterpolator: The interpolator itself.
+        """
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='cursor_output', daemon=True)
+        self._thread.start()
+        return self
+
+    def update(self, location, timestamp=None):
+        """
+        Set a new cursor location from the face tracking.
+
+        Args:
+            location (numpy.ndarray): New cursor location (normalized).
+            timestamp (float, optional): 'time.perf_counter' value of the update (now if not given).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            elapsed = timestamp - self._time
+            if self.location is None:
+                # First update: jump to the location
+                self.location = np.array(location, dtype=float)
+            elif elapsed > 0:
+                # Keep the displayed position: the new location plus a fading offset
+                self._predict(timestamp, self._position)
+                if elapsed > self.max_gap:
+                    # After a pause, the motion starts again from zero
+                    self.velocity[:] = 0
+                else:
+                    np.subtract(location, self.location, out=self._step)
+                    self._step /= elapsed
+                    self.velocity += self.smoothing * (self._step - self.velocity)
+                    self.interval += 0.2 * (elapsed - self.interval)
+                self.location[:] = location
+                np.subtract(self._position, self.location, out=self._offset)
+            self._time = timestamp
+
+    def _predict(self, now, out):
+        """
+        Compute the displayed cursor location at a given time.
+
+        Args:
+            now (float): 'time.perf_counter' value.
+            out (numpy.ndarray): Output location.
+
+        Returns:
+            numpy.ndarray: The displayed location (the output array).
+        """
+        elapsed = now - self._time
+        np.multiply(self.velocity, min(elapsed, self.interval, self.max_extrapolation), out=out)
+        out += self.location
+        out += self._offset * math.exp(-elapsed / self.interval)
+        np.clip(out, 0.001, 0.999, out=out)
+        return out
+
+    def _run(self):
+        """
+        Move the cursor at the output rate.
+        """
+        position = np.zeros(2)
+        period = 1 / self.rate
+        next_time = time.perf_counter()
+        while self._running:
+            self.active.wait()
+            with self._lock:
+                if self.location is not None:
+                    self._predict(time.perf_counter(), position)
+            if self.location is not None:
+                if self.recorders:
+                    start = time.perf_counter()
+                    self.cursor.move(position[0], position[1])
+                    end = time.perf_counter()
+                    for recorder in self.recorders:
+                        recorder.record('cursor_move', start, end)
+                else:
+                    self.cursor.move(position[0], position[1])
+
+            next_time = max(next_time + period, time.perf_counter())
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+
+    def pause(self):
+        """
+        Stop moving the cursor (the output thread sleeps until 'resume' is called).
+        """
+        self.active.clear()
+
+    def resume(self):
+        """
+        Move the cursor again.
+        """
+        self.active.set()
+
+    def stop(self):
+        """
+        Stop the output thread.
+        """
+        self._running = False
+        self.active.set()
+        if self._thread is not None:
+            self._thread.join()
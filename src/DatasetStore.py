@@ -0,0 +1,357 @@
+"""
+DatasetStore class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import csv
+import glob
+import json
+import numpy as np
+
+class DatasetStore:
+    """
+    A class for storing every recorded dataset session in a single columnar binary store.
+
+    The sessions recorded by 'utils/CreateDataset.py' (data/subject_N/<session>/data_info.csv
+    and data_info.json) are packed into one raw binary file per column, which is memory-mapped
+    when loaded, so no CSV text is parsed again:
+    - reference (float32, N x 4): Bounding box of the face (x, y, width, height).
+    - keypoints (float32, N x 12): Face keypoints (x and y of each one).
+    - labels (int16, N): Head position label.
+    - sessions (int32, N): Index of the session of each sample (in 'index["sessions"]').
+    - image_offsets (int64, N x 2): Offset and size of the JPEG image of each sample in
+      'images.bin' (only when the images are packed too; size 0 for a missing image).
+    - files.txt: Name of the image file of each sample (one per line).
+
+    The 'index.json' file lists the sessions (subject, name, rows and session information)
+    and the number of rows. New sessions are appended at the end of the column files, and the
+    index is replaced afterwards, so an interrupted append is simply discarded.
+
+    The store is only written when it is built or updated explicitly ('python src/DatasetStore.py',
+    or 'utils/CreateDataset.py' once the store exists). The readers use 'open', which falls back
+    to the CSV files (loaded in memory, without writing anything) when the store is not built.
+
+    Attributes:
+        path (str): Path to the store folder (None for a store loaded in memory).
+        index (dict): Number of rows, whether the images are packed, and the stored sessions.
+    """
+
+    COLUMNS = {'reference': (np.float32, (4,)), 'keypoints': (np.float32, (12,)),
+               'labels': (np.int16, ()), 'sessions': (np.int32, ()), 'image_offsets': (np.int64, (2,))}
+
+    def __init__(self, path=os.path.join('data', 'store'), images=False):
+        """
+        Initializes the DatasetStore class (opening the store if it exists).
+
+        Args:
+            path (str): Path to the store folder.
+            images (boolean): Pack the images too (only used when the store is created).
+        """
+        self.path = path
+        self.index = {'rows': 0, 'images': images, 'sessions': []}
+        self._columns = {}
+        self._files = None
+        index_path = os.path.join(path, 'index.json')
+        if os.path.isfile(index_path):
+            with open(index_path, 'r') as file:
+                self.index = json.load(file)
+
+    @classmethod
+    def open(cls, path=os.path.join('data', 'store'), data_path='data'):
+        """
+        Open the store for reading, without writing anything.
+
+        Args:
+            path (str): Path to the store folder.
+            data_path (str): Path to the dataset folder, read when the store is not built.
+
+        Returns:
+            DatasetStore: The store (or, if it is not built, the recorded sessions loaded in memory).
+        """
+        if os.path.isfile(os.path.join(path, 'index.json')):
+            return cls(path)
+        store = cls(path)
+        store.path = None
+        files, parts = [], {name: [] for name in ('reference', 'keypoints', 'labels', 'sessions')}
+        for file_path in sorted(glob.glob(os.path.join(data_path, 'subject_*', '*', 'data_info.csv'))):
+            folder = os.path.dirname(file_path)
+            session_files, values, info = cls._read_session(folder)
+            for name, column in store._session_columns(values).items():
+                parts[name].append(column)
+            store._add_session(folder, len(session_files), info)
+            files += session_files
+        for name, columns in parts.items():
+            dtype, shape = cls.COLUMNS[name]
+            store._columns[name] = np.concatenate(columns).astype(dtype) if columns else np.zeros((0,) + shape, dtype)
+        store._files = files
+        return store
+
+    def __len__(self):
+        return self.index['rows']
+
+    def column(self, name):
+        """
+        Get a column of the store (memory-mapped, read-only).
+
+        Args:
+            name (str): Name of the column ('reference', 'keypoints', 'labels', 'sessions' or 'image_offsets').
+
+        Returns:
+            numpy.ndarray: The column (one row per sample).
+        """
+        rows = self.index['rows']
+        if self.path is None:
+            return self._columns[name]
+        if name not in self._columns or len(self._columns[name]) != rows:
+            dtype, shape = self.COLUMNS[name]
+            if rows == 0:
+                self._columns[name] = np.zeros((0,) + shape, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(os.path.join(self.path, f'{name}.bin'), dtype=dtype,
+                                                mode='r', shape=(rows,) + shape)
+        return self._columns[name]
+
+    @property
+    def reference(self):
+        return self.column('reference')
+
+    @property
+    def keypoints(self):
+        return self.column('keypoints')
+
+    @property
+    def labels(self):
+        return self.column('labels')
+
+    @property
+    def sessions(self):
+        return self.column('sessions')
+
+    def features(self, rows=slice(None)):
+        """
+        Compute the normalized keypoints (relative to the face bounding box) used by the cursor model.
+
+        Args:
+            rows (optional): Selected rows (slice, indices or boolean mask; all the rows if not given).
+
+        Returns:
+            numpy.ndarray: The features (N x 12, float32).
+        """
+        reference = self.reference[rows]
+        keypoints = self.keypoints[rows].reshape((-1, 6, 2))
+        return ((keypoints - reference[:, None, :2]) / reference[:, None, 2:]).reshape((-1, 12))
+
+    def select(self, subjects=None, sessions=None, labels=None):
+        """
+        Find the rows of some subjects, sessions and/or labels.
+
+        Args:
+            subjects (iterable, optional): Names of the selected subjects (e.g. 'subject_0').
+            sessions (iterable, optional): Names of the selected sessions (e.g. '2023_09_06-19_06_58').
+            labels (iterable, optional): Selected labels.
+
+        Returns:
+            numpy.ndarray: Boolean mask of the selected rows.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if subjects is not None or sessions is not None:
+            selected = [i for i, session in enumerate(self.index['sessions'])
+                        if (subjects is None or session['subject'] in subjects)
+                        and (sessions is None or session['name'] in sessions)]
+            mask &= np.isin(self.sessions, selected)
+        if labels is not None:
+            mask &= np.isin(self.labels, list(labels))
+        return mask
+
+    def image(self, row):
+        """
+        Read the JPEG image of a sample.
+
+        Args:
+            row (int): Row of the sample.
+
+        Returns:
+            bytes: The encoded image (None if it was not recorded).
+        """
+        if self.index['images']:
+            offset, size = self.column('image_offsets')[row]
+            if size == 0:
+                return None
+            with open(os.path.join(self.path, 'images.bin'), 'rb') as file:
+                file.seek(int(offset))
+                return file.read(int(size))
+        if self._files is None or len(self._files) != len(self):
+            with open(os.path.join(self.path, 'files.txt'), 'r') as file:
+                self._files = file.read().splitlines()[:len(self)]
+        session = self.index['sessions'][int(self.sessions[row])]
+        image_path = os.path.join(session['path'], 'images', self._files[row])
+        if not os.path.isfile(image_path):
+            return None
+        with open(image_path, 'rb') as file:
+            return file.read()
+
+    def update(self, data_path='data'):
+        """
+        Append the recorded sessions which are not in the store yet.
+
+        Args:
+            data_path (str): Path to the dataset folder (with the 'subject_*' folders).
+
+        Returns:
+            int: Number of appended sessions.
+        """
+        stored = {(session['subject'], session['name']) for session in self.index['sessions']}
+        appended = 0
+        for file_path in sorted(glob.glob(os.path.join(data_path, 'subject_*', '*', 'data_info.csv'))):
+            folder = os.path.dirname(file_path)
+            if (os.path.basename(os.path.dirname(folder)), os.path.basename(folder)) not in stored:
+                self.append(folder)
+                appended += 1
+        return appended
+
+    def append(self, folder):
+        """
+        Append a recorded session to the store.
+
+        Args:
+            folder (str): Path to the session folder (with 'data_info.csv' and 'data_info.json').
+        """
+        if self.path is None:
+            raise ValueError("A store loaded in memory cannot be written")
+        files, values, info = self._read_session(folder)
+        columns = self._session_columns(values)
+
+        # Discard what an interrupted append may have left after the stored rows
+        os.makedirs(self.path, exist_ok=True)
+        start = self.index['rows']
+        names = list(columns) + (['image_offsets'] if self.index['images'] else [])
+        for name in names:
+            dtype, shape = self.COLUMNS[name]
+            self._truncate(f'{name}.bin', start * np.dtype(dtype).itemsize * int(np.prod(shape)))
+        self._truncate('files.txt', self.index.get('files_size', 0))
+
+        if self.index['images']:
+            images_path = os.path.join(self.path, 'images.bin')
+            self._truncate('images.bin', self.index.get('images_size', 0))
+            offsets = np.zeros((len(files), 2), dtype=np.int64)
+            with open(images_path, 'ab') as images_file:
+                offset = self.index.get('images_size', 0)
+                for i, file_name in enumerate(files):
+                    image_path = os.path.join(folder, 'images', file_name)
+                    if os.path.isfile(image_path):
+                        with open(image_path, 'rb') as file:
+                            data = file.read()
+                        images_file.write(data)
+                        offsets[i] = offset, len(data)
+                        offset += len(data)
+            columns['image_offsets'] = offsets
+            self.index['images_size'] = offset
+
+        for name, values in columns.items():
+            dtype, _ = self.COLUMNS[name]
+            with open(os.path.join(self.path, f'{name}.bin'), 'ab') as file:
+                file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        with open(os.path.join(self.path, 'files.txt'), 'ab') as file:
+            file.write(''.join(f'{file_name}\n' for file_name in files).encode())
+            self.index['files_size'] = file.tell()
+
+        self._add_session(folder, len(files), info)
+        self._save_index()
+
+    @staticmethod
+    def _read_session(folder):
+        """
+        Read the CSV rows and the information of a recorded session.
+
+        Args:
+            folder (str): Path to the session folder (with 'data_info.csv' and 'data_info.json').
+
+        Returns:
+            tuple: Image file names, values of the other columns (N x 17) and session information.
+        """
+        with open(os.path.join(folder, 'data_info.csv'), 'r', newline='') as file:
+            rows = list(csv.reader(file))[1:]
+        info = {}
+        if os.path.isfile(os.path.join(folder, 'data_info.json')):
+            with open(os.path.join(folder, 'data_info.json'), 'r') as file:
+                info = json.load(file)
+        files = [row[0] for row in rows]
+        values = np.array([row[1:] for row in rows], dtype=np.float64).reshape((-1, 17))
+        return files, values, info
+
+    def _session_columns(self, values):
+        """
+        Split the values of a new session into the store columns.
+
+        Args:
+            values (numpy.ndarray): Values of the CSV columns after the file name (N x 17).
+
+        Returns:
+            dict: The 'reference', 'keypoints', 'labels' and 'sessions' columns of the session.
+        """
+        return {'reference': values[:, :4], 'keypoints': values[:, 4:16], 'labels': values[:, 16],
+                'sessions': np.full(len(values), len(self.index['sessions']))}
+
+    def _add_session(self, folder, rows, info):
+        """
+        Add a new session, after the stored rows, to the index.
+
+        Args:
+            folder (str): Path to the session folder.
+            rows (int): Number of rows of the session.
+            info (dict): Session information.
+        """
+        start = self.index['rows']
+        self.index['sessions'].append({'subject': os.path.basename(os.path.dirname(os.path.abspath(folder))),
+                                       'name': os.path.basename(os.path.abspath(folder)), 'path': folder,
+                                       'start': start, 'stop': start + rows, 'info': info})
+        self.index['rows'] = start + rows
+
+    def _truncate(self, file_name, size):
+        """
+        Cut a column file to a size (creating it if it does not exist).
+
+        Args:
+            file_name (str): Name of the file in the store folder.
+            size (int): Size in bytes.
+        """
+        with open(os.path.join(self.path, file_name), 'ab') as file:
+            file.truncate(size)
+
+    def _save_index(self):
+        """
+        Replace the index file (atomically, so the store is never left half updated).
+        """
+        index_path = os.path.join(self.path, 'index.json')
+        with open(index_path + '.tmp', 'w') as file:
+            json.dump(self.index, file)
+        os.replace(index_path + '.tmp', index_path)
+
+
+if __name__ == "__main__":
+    """
+    Update the dataset store and compare its loading time with the CSV files.
+    """
+    import sys
+    import time
+
+    store = DatasetStore(images='--images' in sys.argv)
+    start = time.perf_counter()
+    appended = store.update()
+    print(f'\n{appended} sessions appended in {time.perf_counter() - start:.3f} s '
+          f'({len(store)} samples, {len(store.index["sessions"])} sessions)')
+
+    start = time.perf_counter()
+    csv_samples = [np.loadtxt(file_path, delimiter=',', skiprows=1, usecols=range(1, 18))
+                   for file_path in sorted(glob.glob(os.path.join('data', 'subject_*', '*', 'data_info.csv')))]
+    csv_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = DatasetStore()
+    features = loaded.features(loaded.select(labels=range(1, 9)))
+    store_time = time.perf_counter() - start
+    print(f'CSV parsing: {csv_time * 1000:.2f} ms, store loading and filtering: {store_time * 1000:.2f} ms '
+          f'({len(features)} selected samples)')
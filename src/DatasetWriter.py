@@ -0,0 +1,162 @@
+"""
+DatasetWriter class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import csv
+import time
+import queue
+import threading
+import cv2
+
+class DatasetWriter:
+    """
+    A class for writing the captured dataset samples while the capture is running.
+
+    The samples (face image and CSV row) are put on a bounded queue, and a pool of worker
+    threads encodes the JPEG images (OpenCV releases the interpreter lock while encoding).
+    The CSV rows are appended, and flushed, as soon as their image is written, in the
+    order the samples were captured. This way the memory does not grow with the length of
+    the session, and nothing is left to write when the capture ends.
+
+    When the workers fall behind, 'submit' waits for room in the queue (the waiting time is
+    reported), so no sample is lost. A sample whose image could not be written (no face
+    captured yet, or an encoding or disk error) is counted as failed, and its row is skipped.
+
+    Attributes:
+        folder (str): Path to the session folder (the CSV file is written there).
+        images_path (str): Path to the folder of the images.
+        written (int): Number of samples written.
+        failed (int): Number of samples not written (their image could not be written).
+        bytes_written (int): Size of the written images, in bytes.
+        max_queued (int): Maximum number of samples waiting in the queue.
+        wait_time (float): Total time spent by 'submit' waiting for room in the queue, in seconds.
+        start_time (float): 'time.perf_counter' value when the writer was created.
+    """
+
+    def __init__(self, folder, header, images_path=None, csv_name='data_info.csv', workers=2, maxsize=64):
+        """
+        Initializes the DatasetWriter class.
+
+        Args:
+            folder (str): Path to the session folder.
+            header (list): Header of the CSV file.
+            images_path (str, optional): Path to the folder of the images ('images' in the session folder if not given).
+            csv_name (str): Name of the CSV file.
+            workers (int): Number of worker threads encoding the images.
+            maxsize (int): Maximum number of samples waiting in the queue.
+        """
+        self.folder = folder
+        self.images_path = images_path if images_path is not None else os.path.join(folder, 'images')
+        self.written = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.max_queued = 0
+        self.wait_time = 0.0
+        self.start_time = time.perf_counter()
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._next = 0
+        self._done = {}
+        self._file = open(os.path.join(folder, csv_name), 'w', newline='')
+        self._csv = csv.writer(self._file)
+        self._csv.writerow(header)
+        self._file.flush()
+        self._workers = [threading.Thread(target=self._work, name=f'dataset_writer_{i}', daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, file_name, image, row):
+        """
+        Queue a captured sample (waiting if the queue is full).
+
+        Args:
+            file_name (str): Name of the image file (also the first column of the CSV row).
+            image (numpy.ndarray): The face image (not written if None).
+            row (list): The other columns of the CSV row.
+        """
+        item = (self._submitted, file_name, image, row)
+        self._submitted += 1
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put(item)
+            self.wait_time += time.perf_counter() - start
+        self.max_queued = max(self.max_queued, self._queue.qsize())
+
+    def _work(self):
+        """
+        Worker loop: encode the images, then append the rows in the capture order.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            index, file_name, image, row = item
+            size = 0
+            try:
+                size = self._write_image(file_name, image)
+            except Exception as error:
+                print(f"The image '{file_name}' could not be written: {error}")
+            finally:
+                # Every sample is resolved (written or failed), so the next rows are never held back
+                with self._lock:
+                    self.bytes_written += size
+                    self._done[index] = [file_name] + row if size else None
+                    while self._next in self._done:
+                        done = self._done.pop(self._next)
+                        self._next += 1
+                        if done is None:
+                            self.failed += 1
+                        else:
+                            self._csv.writerow(done)
+                            self.written += 1
+                    self._file.flush()
+
+    def _write_image(self, file_name, image):
+        """
+        Encode and write the image of a sample.
+
+        Args:
+            file_name (str): Name of the image file.
+            image (numpy.ndarray): The face image (None if no face has been captured).
+
+        Returns:
+            int: Size of the written file in bytes (0 if it was not written).
+        """
+        if image is None or not image.size:
+            return 0
+        path = os.path.join(self.images_path, file_name)
+        if not cv2.imwrite(path, image):
+            print(f"The image '{file_name}' could not be written")
+            return 0
+        return os.path.getsize(path)
+
+    def close(self):
+        """
+        Write the queued samples, stop the workers and close the CSV file.
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._file.close()
+
+    def report(self):
+        """
+        Build a report of the writing throughput.
+
+        Returns:
+            str: The report.
+        """
+        elapsed = time.perf_counter() - self.start_time
+        return (f"Dataset writer: {self.written} samples ({self.bytes_written / 2**20:.1f} MB) in {elapsed:.1f} s, "
+                f"{self.failed} failed, "
+                f"{self.written / elapsed:.1f} samples/s, {self.bytes_written / 2**20 / elapsed:.2f} MB/s, "
+                f"max queued {self.max_queued}, capture waited {self.wait_time:.2f} s")
@@ -0,0 +1,64 @@
+"""
+FaceFeatures class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import numpy as np
+
+class FaceFeatures:
+    """
+    A class for reading the features of a MediaPipe face detection into preallocated arrays.
+
+    The bounding box and the 6 keypoints of each detection are written into the same
+    arrays, and the keypoints are normalized by the bounding box (the input of the
+    cursor movement model) without allocating new arrays.
+
+    Attributes:
+        reference (numpy.ndarray): Bounding box as [[xmin, ymin], [width, height]] (relative to the frame).
+        keypoints (numpy.ndarray): Keypoints as [[x, y], ...] (relative to the frame).
+        features (numpy.ndarray): Keypoints relative to the bounding box.
+    """
+
+    def __init__(self, n_keypoints=6):
+        """
+        Initializes the FaceFeatures class.
+
+        Args:
+            n_keypoints (int): Number of keypoints of each detection.
+        """
+        self.reference = np.zeros((2, 2))
+        self.keypoints = np.zeros((n_keypoints, 2))
+        self.features = np.zeros((n_keypoints, 2))
+
+    def read(self, detection):
+        """
+        Read the bounding box and the keypoints of a detection.
+
+        Args:
+            detection: A MediaPipe face detection.
+        """
+        box = detection.location_data.relative_bounding_box
+        self.reference[0, 0] = box.xmin
+        self.reference[0, 1] = box.ymin
+        self.reference[1, 0] = box.width
+        self.reference[1, 1] = box.height
+        for i, key_point in enumerate(detection.location_data.relative_keypoints):
+            self.keypoints[i, 0] = key_point.x
+            self.keypoints[i, 1] = key_point.y
+
+    def extract(self, detection):
+        """
+        Read a detection and normalize its keypoints by the bounding box.
+
+        Args:
+            detection: A MediaPipe face detection.
+
+        Returns:
+            numpy.ndarray: The normalized keypoints (a preallocated array, overwritten by the next call).
+        """
+        self.read(detection)
+        np.subtract(self.keypoints, self.reference[0], out=self.features)
+        np.divide(self.features, self.reference[1], out=self.features)
+        return self.features
@@ -8,14 +8,19 @@ Date: 08/09/2023
 import os
 import cv2
 import pickle
-import pyautogui
 import numpy as np
 import mediapipe as mp
 
 try:
     from src.Cursor import Cursor
+    from src.FrameGrabber import FrameGrabber
+    from src.LinearModel import LinearModel
+    from src.FaceFeatures import FaceFeatures
 except ModuleNotFoundError:
-    from Cursor import Cursor 
+    from Cursor import Cursor
+    from FrameGrabber import FrameGrabber
+    from LinearModel import LinearModel
+    from FaceFeatures import FaceFeatures
 
 class FacePosition:
     """
@@ -29,50 +34,54 @@ class FacePosition:
         speed (int): Cursor movement speed
         movement (numpy.ndarray): Movement vectors for different gestures.
         screen_size (numpy.ndarray): The screen size in pixels.
-        cursor_model: The machine learning model for gesture prediction.
+        cursor_model (LinearModel): The machine learning model for gesture prediction (compiled from scikit-learn).
         face_detection: The MediaPipe Face Detection component.
     """
 
-    def __init__(self):
+    def __init__(self, screen_size=None):
         """
         Initializes the FaceCursorController class.
+
+        Args:
+            screen_size (tuple, optional): Screen size in pixels (read from the display if not given).
         """
         self.cursor_location = np.array([0.5, 0.5])
         self.speed = 2
         self.movement = np.array([[0, 0], [0, -1], [-1, -1], [-1, 0],
                                   [-1, 1], [0, 1], [1, 1], [1, 0], [1, -1]])
-        self.screen_size = np.array(pyautogui.size())
-
-        # Load the cursor movement model
+        if screen_size is None:
+            import pyautogui
+            screen_size = pyautogui.size()
+        self.screen_size = np.array(screen_size)
+        self._move = np.zeros(2)
+        self._mask = np.zeros(2, dtype=bool)
+
+        # Load the cursor movement model (compiled into a float32 linear model)
         with open(os.path.join('models', 'cursor_movement_model.pkl'), 'rb') as f:
-            self.cursor_model = pickle.load(f)
+            self.cursor_model = LinearModel.from_sklearn(pickle.load(f))
 
         # Initialize the MediaPipe Face Detection component
         self.face_detection = mp.solutions.face_detection.FaceDetection(min_detection_confidence=0.5)     
 
-    def move_cursor(self, reference, keypoints):
+    def move_cursor(self, features):
         """
         Move the cursor based on head position.
 
         Args:
-            reference (list): A list containing reference coordinates and size of the bounding box.
-            keypoints (list): A list of keypoints representing face landmarks.
+            features (numpy.ndarray): Face keypoints normalized by the bounding box (see FaceFeatures).
         """
-        # Transform the lists into numpy arrays
-        reference = np.array(reference)
-        keypoints = np.array(keypoints)
-
-        # Remove off-set from keypoints
-        keypoints = (keypoints - reference[0]) / reference[1]
-
         # Recognize the head position
-        move = self.cursor_model.predict(keypoints.reshape((1, -1)))[0]
+        move = self.cursor_model.predict(features)
 
-        # Move the cursor
-        move = self.movement[move] * 10 * self.speed / self.screen_size
-        self.cursor_location += move
-        self.cursor_location[self.cursor_location >= 1] = 0.999
-        self.cursor_location[self.cursor_location <= 0] = 0.001
+        # Move the cursor (in place)
+        self._move[:] = self.movement[move]
+        self._move *= 10 * self.speed
+        self._move /= self.screen_size
+        self.cursor_location += self._move
+        np.greater_equal(self.cursor_location, 1, out=self._mask)
+        np.copyto(self.cursor_location, 0.999, where=self._mask)
+        np.less_equal(self.cursor_location, 0, out=self._mask)
+        np.copyto(self.cursor_location, 0.001, where=self._mask)
 
 
 if __name__ == "__main__":
@@ -84,9 +93,11 @@ if __name__ == "__main__":
 
     # Create an instance of the FacePosition class
     position_controller = FacePosition()
+    face_features = FaceFeatures()
 
-    # Open the video capture
-    capture = cv2.VideoCapture(0)
+    # Start grabbing frames from the camera
+    grabber = FrameGrabber(0).start()
+    sequence = 0
 
     print("""
           ----- Test of the class 'FacePosition' started... -----
@@ -96,8 +107,8 @@ if __name__ == "__main__":
           """)
 
     while position_controller.cursor_location.sum() > 0.004:
-        # Capture a frame from the camera
-        _, frame = capture.read()
+        # Take the newest frame from the camera
+        frame, _, sequence = grabber.read(sequence)
 
         # Convert the BGR image to RGB
         frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -107,19 +118,8 @@ if __name__ == "__main__":
 
         # Read the reference and landmarks from the detected face
         if results.detections:
-            for detection in results.detections:
-                reference = [[detection.location_data.relative_bounding_box.xmin,
-                              detection.location_data.relative_bounding_box.ymin],
-                             [detection.location_data.relative_bounding_box.width,
-                              detection.location_data.relative_bounding_box.height]]
-
-                keypoints = []
-                for key_point in detection.location_data.relative_keypoints:
-                    keypoints.append([key_point.x, key_point.y])
-
-                position_controller.move_cursor(reference, keypoints)
-                cursor.move(*position_controller.cursor_location)
-                break
+            position_controller.move_cursor(face_features.extract(results.detections[0]))
+            cursor.move(*position_controller.cursor_location)
 
     # Release the camera
-    capture.release()
\ No newline at end of file
+    grabber.release()
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+FaceTracker class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+class FaceTracker:
+    """
+    A class for tracking the face between full-frame face detections.
+
+    A full-frame detection (keyframe) runs every 'interval' frames. In between, the face is
+    detected on a small square region around its last position (downscaled to 'roi_size'
+    pixels), and the bounding box and keypoints are mapped back to the frame, so the
+    returned detections are the same as the full-frame ones. When the face is lost in the
+    region, or its score drops below 'min_score', a full-frame detection runs instead.
+
+    Attributes:
+        face_detection: The MediaPipe Face Detection component used on the full frames.
+        roi_detection: The MediaPipe Face Detection component used on the regions (None without tracking).
+        interval (int): Number of frames between full-frame detections (1 disables the tracking).
+        roi_scale (float): Size of the region relative to the largest side of the last bounding box.
+        roi_size (int): Size in pixels of the downscaled region.
+        min_score (float): Minimum detection score to keep tracking the face.
+        box (tuple): Last bounding box (xmin, ymin, width, height) relative to the frame (None if the face is lost).
+        since_keyframe (int): Number of frames since the last full-frame detection.
+        keyframes (int): Number of full-frame detections.
+        tracked (int): Number of frames detected on the region.
+        lost (int): Number of times the face was lost in the region.
+    """
+
+    def __init__(self, face_detection, interval=10, roi_scale=2.0, roi_size=192, min_score=0.75):
+        """
+        Initializes the FaceTracker class.
+
+        Args:
+            face_detection: The MediaPipe Face Detection component used on the full frames.
+            interval (int): Number of frames between full-frame detections (1 disables the tracking).
+            roi_scale (float): Size of the region relative to the largest side of the last bounding box.
+            roi_size (int): Size in pixels of the downscaled region.
+            min_score (float): Minimum detection score to keep tracking the face.
+        """
+        self.face_detection = face_detection
+        self.roi_detection = None
+        if interval > 1:
+            self.roi_detection = mp.solutions.face_detection.FaceDetection(model_selection=0,
+                                                                           min_detection_confidence=0.5)
+        self.interval = interval
+        self.roi_scale = roi_scale
+        self.roi_size = roi_size
+        self.min_score = min_score
+        self.box = None
+        self.since_keyframe = 0
+        self.keyframes = 0
+        self.tracked = 0
+        self.lost = 0
+        self._roi = np.empty((roi_size, roi_size, 3), dtype=np.uint8)
+
+    def process(self, frame):
+        """
+        Detect the face on a new RGB frame.
+
+        Args:
+            frame (numpy.ndarray): The RGB frame.
+
+        Returns:
+            The MediaPipe detection of the face (relative to the frame), or None if there is no face.
+        """
+        if self.box is not None and self.since_keyframe + 1 < self.interval:
+            detection = self._track(frame)
+            if detection is not None:
+                return detection
+            self.lost += 1
+        return self._detect(frame)
+
+    def _detect(self, frame):
+        """
+        Run the face detection on the full frame (keyframe).
+
+        Args:
+            frame (numpy.ndarray): The RGB frame.
+
+        Returns:
+            The MediaPipe detection of the face, or None if there is no face.
+        """
+        self.keyframes += 1
+        self.since_keyframe = 0
+        results = self.face_detection.process(frame)
+        if not results.detections:
+            self.box = None
+            return None
+        detection = results.detections[0]
+        self._update_box(detection)
+        return detection
+
+    def _track(self, frame):
+        """
+        Run the face detection on the region around the last bounding box.
+
+        Args:
+            frame (numpy.ndarray): The RGB frame.
+
+        Returns:
+            The MediaPipe detection of the face (mapped back to the frame), or None if the face is lost.
+        """
+        height, width = frame.shape[:2]
+        x, y, w, h = self.box[0] * width, self.box[1] * height, self.box[2] * width, self.box[3] * height
+
+        # Square region centered on the last bounding box (kept inside the frame)
+        side = int(min(self.roi_scale * max(w, h), width, height))
+        x0 = int(min(max(x + w / 2 - side / 2, 0), width - side))
+        y0 = int(min(max(y + h / 2 - side / 2, 0), height - side))
+        cv2.resize(frame[y0:y0 + side, x0:x0 + side], (self.roi_size, self.roi_size),
+                   dst=self._roi, interpolation=cv2.INTER_AREA)
+
+        results = self.roi_detection.process(self._roi)
+        if not results.detections or results.detections[0].score[0] < self.min_score:
+            return None
+        detection = results.detections[0]
+
+        # Map the bounding box and the keypoints back to the frame
+        box = detection.location_data.relative_bounding_box
+        box.xmin = (x0 + box.xmin * side) / width
+        box.ymin = (y0 + box.ymin * side) / height
+        box.width = box.width * side / width
+        box.height = box.height * side / height
+        for key_point in detection.location_data.relative_keypoints:
+            key_point.x = (x0 + key_point.x * side) / width
+            key_point.y = (y0 + key_point.y * side) / height
+
+        self.tracked += 1
+        self.since_keyframe += 1
+        self._update_box(detection)
+        return detection
+
+    def _update_box(self, detection):
+        """
+        Keep the bounding box of the detection (relative to the frame, so it does not
+        depend on the processing resolution).
+
+        Args:
+            detection: The MediaPipe detection (relative to the frame).
+        """
+        box = detection.location_data.relative_bounding_box
+        self.box = (box.xmin, box.ymin, box.width, box.height)
+
+    def report(self):
+        """
+        Build a printable summary of the tracking.
+
+        Returns:
+            str: The tracking counters.
+        """
+        frames = self.keyframes + self.tracked
+        share = self.tracked / frames if frames else 0
+        return (f"Face tracker: {self.keyframes} full-frame detections, {self.tracked} tracked frames "
+                f"({share:.0%}), {self.lost} lost tracks")
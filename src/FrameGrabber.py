@@ -0,0 +1,225 @@
+"""
+FrameGrabber class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import threading
+import numpy as np
+import cv2
+
+class FrameGrabber:
+    """
+    A class for grabbing camera frames continuously on a background thread.
+
+    The camera driver keeps its own queue of frames, so reading them only when the
+    application is ready returns frames that can be several intervals old. This class
+    reads every frame as soon as it is available and only keeps the newest one, so the
+    consumer always receives a frame at most one frame interval old.
+
+    The frames are stored in three preallocated buffers: the newest frame, the frame
+    currently used by the consumer, and the one being written by the grabber. The
+    consumer receives the buffer itself (no copy), which remains valid until its next read.
+
+    When the source is a video file, the frames are grabbed at the file frame rate,
+    as a camera would deliver them. While paused, no frame is read (or decoded).
+
+    Attributes:
+        capture (cv2.VideoCapture): The video capture.
+        is_file (boolean): Whether the source is a video file.
+        frame_interval (float): Time between two frames of the source, in seconds.
+        buffers (list): Preallocated frame buffers.
+        timestamp (float): 'time.perf_counter' value when the newest frame was captured.
+        sequence (int): Number of frames grabbed so far.
+        finished (boolean): Whether the source has no more frames.
+    """
+
+    def __init__(self, source=0, width=None, height=None, fps=None, buffer_size=1):
+        """
+        Initializes the FrameGrabber class.
+
+        Args:
+            source (int or str): Camera index or path to a video file.
+            width (int, optional): Requested frame width in pixels.
+            height (int, optional): Requested frame height in pixels.
+            fps (float, optional): Requested camera frame rate.
+            buffer_size (int): Number of frames buffered by the camera driver.
+        """
+        self.capture = cv2.VideoCapture(source)
+        self.is_file = isinstance(source, str)
+
+        # Configure the camera
+        if width is not None:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height is not None:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps is not None:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        source_fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1 / source_fps if source_fps > 0 else 1 / 30
+
+        # Read the first frame to allocate the buffers with the actual frame size
+        ret, frame = self.capture.read()
+        self.finished = not ret
+        shape = frame.shape if ret else (1, 1, 3)
+        self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(3)]
+        if ret:
+            self.buffers[0][...] = frame
+        self.timestamp = time.perf_counter()
+        self.sequence = 1 if ret else 0
+
+        self._latest = 0
+        self._reading = None
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._pending = {}
+        self._enabled = threading.Event()
+        self._enabled.set()
+
+    @property
+    def shape(self):
+        """
+        Shape of the frames (height, width, depth).
+        """
+        return self.buffers[0].shape
+
+    def start(self):
+        """
+        Start grabbing frames on the background thread.
+
+        Returns:
+            FrameGrabber: The grabber itself.
+        """
+        self._running = True
+        self._thread = threading.Thread(target=self._grab, name='frame_grabber', daemon=True)
+        self._thread.start()
+        return self
+
+    def _grab(self):
+        """
+        Grab the frames continuously, keeping only the newest one.
+        """
+        next_time = time.perf_counter()
+        while self._running and not self.finished:
+            # Sleep while paused (a video file continues from the same frame)
+            if not self._enabled.is_set():
+                self._enabled.wait()
+                next_time = time.perf_counter()
+                continue
+
+            # Select a buffer which is neither the newest frame nor in use by the consumer
+            with self._condition:
+                index = next(i for i in range(3) if i != self._latest and i != self._reading)
+                pending, self._pending = self._pending, {}
+
+            # Apply the property changes between two reads (the capture is only used by this thread)
+            for prop, value in pending.items():
+                self._apply(prop, value)
+
+            if self.is_file:
+                next_time += self.frame_interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            ret, frame = self.capture.read(self.buffers[index])
+            timestamp = time.perf_counter()
+            if ret and frame is not self.buffers[index]:
+                # The frame size changed: reallocate the buffer
+                self.buffers[index] = frame
+
+            with self._condition:
+                if ret:
+                    self._latest = index
+                    self.timestamp = timestamp
+                    self.sequence += 1
+                elif self.is_file:
+                    self.finished = True
+                self._condition.notify_all()
+
+            if not ret and not self.is_file:
+                # The camera did not deliver a frame: retry after one frame interval
+                time.sleep(self.frame_interval)
+
+    def read(self, last_sequence=None, timeout=None):
+        """
+        Take the newest frame, without copying it.
+
+        The returned frame remains valid until the next call to this method.
+
+        Args:
+            last_sequence (int, optional): Sequence number of the last frame processed by
+                the consumer; if given, wait until a newer frame is available.
+            timeout (float, optional): Maximum waiting time in seconds.
+
+        Returns:
+            tuple: (frame, timestamp, sequence) of the newest frame (frame is None if
+                there are no more frames or the timeout expired).
+        """
+        with self._condition:
+            if last_sequence is not None:
+                self._condition.wait_for(lambda: self.sequence > last_sequence or self.finished
+                                         or not self._running, timeout)
+                if self.sequence <= last_sequence:
+                    return None, self.timestamp, self.sequence
+            if self.sequence == 0:
+                return None, self.timestamp, self.sequence
+            self._reading = self._latest
+            return self.buffers[self._latest], self.timestamp, self.sequence
+
+    def pause(self):
+        """
+        Stop grabbing frames (the grabber thread sleeps until 'resume' is called).
+        """
+        self._enabled.clear()
+
+    def resume(self):
+        """
+        Grab frames again.
+        """
+        self._enabled.set()
+
+    def set(self, prop, value):
+        """
+        Change a property of the video capture (e.g. cv2.CAP_PROP_FPS).
+
+        'cv2.VideoCapture' is not thread-safe: while the grabber thread is running, the change
+        is only recorded, and the grabber thread applies it before its next read.
+
+        Args:
+            prop (int): OpenCV property identifier.
+            value (float): New value.
+        """
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                self._pending[prop] = value
+                return
+        self._apply(prop, value)
+
+    def _apply(self, prop, value):
+        """
+        Change a property of the video capture (from the thread which uses it).
+
+        Args:
+            prop (int): OpenCV property identifier.
+            value (float): New value.
+        """
+        self.capture.set(prop, value)
+        if prop == cv2.CAP_PROP_FPS and value > 0 and not self.is_file:
+            self.frame_interval = 1 / value
+
+    def release(self):
+        """
+        Stop the background thread and release the video capture.
+        """
+        self._running = False
+        self._enabled.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.capture.release()
@@ -0,0 +1,256 @@
+"""
+KeywordSpotter class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import numpy as np
+
+class MfccExtractor:
+    """
+    A vectorized NumPy extractor of MFCC features for 1 s audio windows at 16 kHz.
+
+    The analysis window, the mel filterbank and the DCT matrix are computed once,
+    so every extraction is a few matrix products. The MFCC matrix of a window is
+    summarized into a fixed-length vector: the mean of the (mean-normalized)
+    coefficients over 'segments' equal time segments, and their standard deviation.
+
+    Attributes:
+        sample_rate (int): Sampling rate of the audio windows.
+        frame_length (int): Samples of each analysis frame (25 ms).
+        hop_length (int): Samples between consecutive frames (10 ms).
+        n_fft (int): Length of the FFT.
+        segments (int): Number of time segments of the feature vector.
+        window (numpy.ndarray): Hann analysis window.
+        mel_filters (numpy.ndarray): Mel filterbank (n_fft/2+1 x n_mels).
+        dct (numpy.ndarray): DCT-II matrix (n_mels x n_mfcc).
+    """
+
+    def __init__(self, sample_rate=16000, n_mels=40, n_mfcc=13, segments=8):
+        """
+        Initializes the MfccExtractor class.
+
+        Args:
+            sample_rate (int): Sampling rate of the audio windows.
+            n_mels (int): Number of mel bands.
+            n_mfcc (int): Number of cepstral coefficients.
+            segments (int): Number of time segments of the feature vector.
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(0.025 * sample_rate)
+        self.hop_length = int(0.010 * sample_rate)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.segments = segments
+        self.window = np.hanning(self.frame_length).astype(np.float32)
+        self.mel_filters = self.mel_filterbank(n_mels).astype(np.float32)
+
+        # Orthonormal DCT-II matrix
+        k = np.arange(n_mfcc)[None, :]
+        n = np.arange(n_mels)[:, None]
+        self.dct = (np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2 / n_mels)).astype(np.float32)
+        self.dct[:, 0] /= np.sqrt(2)
+
+    def mel_filterbank(self, n_mels):
+        """
+        Build the triangular mel filterbank.
+
+        Args:
+            n_mels (int): Number of mel bands.
+
+        Returns:
+            numpy.ndarray: Filterbank matrix (n_fft/2+1 x n_mels).
+        """
+        mel_max = 2595 * np.log10(1 + (self.sample_rate / 2) / 700)
+        hz_points = 700 * (10 ** (np.linspace(0, mel_max, n_mels + 2) / 2595) - 1)
+        bins = np.fft.rfftfreq(self.n_fft, 1 / self.sample_rate)[:, None]
+        lower, center, upper = hz_points[:-2], hz_points[1:-1], hz_points[2:]
+        rising = (bins - lower) / (center - lower)
+        falling = (upper - bins) / (upper - center)
+        return np.maximum(0, np.minimum(rising, falling))
+
+    @property
+    def size(self):
+        """
+        Length of the feature vector.
+        """
+        return self.dct.shape[1] * (self.segments + 1)
+
+    def mfcc(self, audio_data):
+        """
+        Compute the MFCC matrix of an audio window.
+
+        Args:
+            audio_data (numpy.ndarray): Mono audio window.
+
+        Returns:
+            numpy.ndarray: MFCC matrix (frames x n_mfcc).
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(audio_data, self.frame_length)[::self.hop_length]
+        spectrum = np.fft.rfft(frames * self.window, n=self.n_fft)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return np.log(power.astype(np.float32) @ self.mel_filters + 1e-6) @ self.dct
+
+    def __call__(self, audio_data):
+        """
+        Compute the feature vector of an audio window.
+
+        Args:
+            audio_data (numpy.ndarray): Mono audio window.
+
+        Returns:
+            numpy.ndarray: Feature vector.
+        """
+        mfcc = self.mfcc(audio_data)
+        mfcc -= mfcc.mean(axis=0)
+        usable = mfcc.shape[0] - mfcc.shape[0] % self.segments
+        pooled = mfcc[:usable].reshape((self.segments, -1, mfcc.shape[1])).mean(axis=1)
+        return np.concatenate([pooled.ravel(), mfcc.std(axis=0)])
+
+
+class KeywordSpotter:
+    """
+    A lightweight keyword spotting classifier for the speech commands.
+
+    The classifier is a linear softmax model on standardized MFCC features,
+    trained with 'utils/TrainKeywordSpotter.py' from recorded WAV clips, and
+    stored as a NumPy archive (a few kB), so it can run always-on with
+    sub-millisecond inference.
+
+    Attributes:
+        labels (list): Labels of the classes.
+        extractor (MfccExtractor): The feature extractor.
+        mean (numpy.ndarray): Mean of the training features.
+        scale (numpy.ndarray): Standard deviation of the training features.
+        coef (numpy.ndarray): Weights of the linear model (classes x features).
+        intercept (numpy.ndarray): Biases of the linear model.
+    """
+
+    def __init__(self, labels, mean, scale, coef, intercept, segments=8):
+        """
+        Initializes the KeywordSpotter class.
+
+        Args:
+            labels (list): Labels of the classes.
+            mean (numpy.ndarray): Mean of the training features.
+            scale (numpy.ndarray): Standard deviation of the training features.
+            coef (numpy.ndarray): Weights of the linear model (classes x features).
+            intercept (numpy.ndarray): Biases of the linear model.
+            segments (int): Number of time segments of the feature vector.
+        """
+        self.labels = list(labels)
+        self.extractor = MfccExtractor(segments=segments)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.coef = np.ascontiguousarray(coef, dtype=np.float32)
+        self.intercept = np.asarray(intercept, dtype=np.float32)
+
+    @classmethod
+    def load(cls, model_path):
+        """
+        Load a trained keyword spotter.
+
+        Args:
+            model_path (str): Path to the NumPy archive.
+
+        Returns:
+            KeywordSpotter: The keyword spotter.
+        """
+        data = np.load(model_path)
+        return cls(data['labels'].tolist(), data['mean'], data['scale'], data['coef'],
+                   data['intercept'], int(data['segments']))
+
+    def save(self, model_path):
+        """
+        Save the keyword spotter as a NumPy archive.
+
+        Args:
+            model_path (str): Path to the NumPy archive.
+        """
+        np.savez(model_path, labels=np.array(self.labels), mean=self.mean, scale=self.scale,
+                 coef=self.coef, intercept=self.intercept, segments=self.extractor.segments)
+
+    def scores(self, audio_data):
+        """
+        Compute the class probabilities of an audio window.
+
+        Args:
+            audio_data (numpy.ndarray): 1 s mono audio window at 16 kHz.
+
+        Returns:
+            numpy.ndarray: Probability of each class.
+        """
+        features = (self.extractor(audio_data) - self.mean) / self.scale
+        logits = self.coef @ features + self.intercept
+        logits = np.exp(logits - logits.max())
+        return logits / logits.sum()
+
+    def predict(self, audio_data):
+        """
+        Classify an audio window, with the probability of the detected label.
+
+        Args:
+            audio_data (numpy.ndarray): 1 s mono audio window at 16 kHz.
+
+        Returns:
+            tuple: The detected label and its probability.
+        """
+        probabilities = self.scores(audio_data)
+        index = int(np.argmax(probabilities))
+        return self.labels[index], float(probabilities[index])
+
+    def __call__(self, audio_data):
+        """
+        Classify an audio window.
+
+        Args:
+            audio_data (numpy.ndarray): 1 s mono audio window at 16 kHz.
+
+        Returns:
+            str: The detected label.
+        """
+        features = (self.extractor(audio_data) - self.mean) / self.scale
+        return self.labels[int(np.argmax(self.coef @ features + self.intercept))]
+
+
+if __name__ == "__main__":
+    """
+    Run the keyword spotter benchmark (against the wav2vec2 pipeline when available).
+    """
+    import os
+    import sys
+    import pickle
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    rng = np.random.default_rng(0)
+    windows = (0.1 * rng.standard_normal((50, 16000))).astype(np.float32)
+
+    model_path = os.path.join('models', 'keyword_spotter.npz')
+    if os.path.isfile(model_path):
+        spotter = KeywordSpotter.load(model_path)
+    else:
+        # Untrained model with the right shapes (only the time and memory are meaningful)
+        size = MfccExtractor().size
+        spotter = KeywordSpotter([str(i) for i in range(12)], np.zeros(size), np.ones(size),
+                                 rng.standard_normal((12, size)), np.zeros(12))
+    memory = len(pickle.dumps(spotter)) / 1024
+
+    engines = {'kws': spotter}
+    try:
+        from src.SpeechBackend import create_backend
+        engines['wav2vec2'] = create_backend('pipeline', os.path.join('models', 'speech_commands_model'))
+    except Exception as error:
+        print(f'wav2vec2 pipeline not available ({error})')
+
+    print(f'\nKeyword spotter size: {memory:.1f} kB')
+    for name, engine in engines.items():
+        engine(windows[0])
+        latencies = []
+        for window in windows:
+            start = time.perf_counter()
+            engine(window)
+            latencies.append(time.perf_counter() - start)
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        print(f'{name:<10} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms   p99 {p99:8.3f} ms')
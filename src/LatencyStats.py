@@ -0,0 +1,78 @@
+"""
+LatencyStats class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import json
+import time
+import numpy as np
+
+class LatencyStats:
+    """
+    A class for collecting latency samples of the application stages.
+
+    Each stage is identified by its name, and every sample is the time spent
+    between the start and the end of one execution of that stage.
+
+    Attributes:
+        samples (dict): Recorded durations (in seconds) for each stage.
+        start_time (float): 'time.perf_counter' value when the collection started.
+    """
+
+    def __init__(self):
+        """
+        Initializes the LatencyStats class.
+        """
+        self.samples = {}
+        self.start_time = time.perf_counter()
+
+    def record(self, stage, start, end):
+        """
+        Record the execution time of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        self.samples.setdefault(stage, []).append(end - start)
+
+    def summary(self):
+        """
+        Summarize the recorded samples.
+
+        Returns:
+            dict: Count, rate (executions per second) and p50/p95/p99 latency (in ms) of each stage.
+        """
+        elapsed = time.perf_counter() - self.start_time
+        summary = {}
+        for stage, samples in self.samples.items():
+            p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+            summary[stage] = {'count': len(samples), 'rate': len(samples) / elapsed,
+                              'p50': p50, 'p95': p95, 'p99': p99}
+        return summary
+
+    def report(self):
+        """
+        Build a printable table with the summary of the recorded samples.
+
+        Returns:
+            str: The summary table.
+        """
+        lines = [f"{'stage':<18}{'count':>8}{'rate [1/s]':>12}{'p50 [ms]':>10}{'p95 [ms]':>10}{'p99 [ms]':>10}"]
+        for stage, values in self.summary().items():
+            lines.append(f"{stage:<18}{values['count']:>8}{values['rate']:>12.1f}"
+                         f"{values['p50']:>10.2f}{values['p95']:>10.2f}{values['p99']:>10.2f}")
+        return '\n'.join(lines)
+
+    def save(self, file_path):
+        """
+        Save the summary of the recorded samples as JSON.
+
+        Args:
+            file_path (str): Path to the JSON file.
+        """
+        with open(file_path, 'w') as json_file:
+            json.dump(self.summary(), json_file, indent=4)
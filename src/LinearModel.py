@@ -0,0 +1,157 @@
+"""
+LinearModel class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import numpy as np
+
+class LinearModel:
+    """
+    A compiled version of a trained scikit-learn linear classifier (e.g. LogisticRegression).
+
+    The class is predicted with a single matrix-vector product into preallocated float32
+    buffers, skipping the input validation of scikit-learn. When the two best scores are
+    too close to be told apart in float32, they are computed again in float64, so the
+    predictions are the same as the ones of scikit-learn.
+
+    Attributes:
+        coef (numpy.ndarray): Weights of each class (classes x features, float32).
+        intercept (numpy.ndarray): Bias of each class (float32).
+        classes (numpy.ndarray): Label of each class.
+        tolerance (float): Score margin below which the prediction is checked in float64.
+    """
+
+    def __init__(self, coef, intercept, classes, tolerance=1e-3):
+        """
+        Initializes the LinearModel class.
+
+        Args:
+            coef (numpy.ndarray): Weights of each class (classes x features).
+            intercept (numpy.ndarray): Bias of each class.
+            classes (numpy.ndarray): Label of each class.
+            tolerance (float): Score margin below which the prediction is checked in float64.
+        """
+        self.coef = np.ascontiguousarray(coef, dtype=np.float32)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float32)
+        self.classes = np.asarray(classes)
+        self.tolerance = tolerance
+        self._coef64 = np.ascontiguousarray(coef, dtype=np.float64)
+        self._intercept64 = np.ascontiguousarray(intercept, dtype=np.float64)
+
+        # Preallocated buffers
+        self._features = np.empty(self.coef.shape[1], dtype=np.float32)
+        self._features64 = np.empty(self.coef.shape[1], dtype=np.float64)
+        self._scores = np.empty(self.coef.shape[0], dtype=np.float32)
+        self._scores64 = np.empty(self.coef.shape[0], dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Compile a trained scikit-learn linear classifier.
+
+        Args:
+            model: The trained classifier (with 'coef_', 'intercept_' and 'classes_').
+
+        Returns:
+            LinearModel: The compiled model.
+        """
+        return cls(model.coef_, model.intercept_, model.classes_)
+
+    def predict(self, features):
+        """
+        Predict the class of a single feature vector.
+
+        Args:
+            features (numpy.ndarray): The feature vector (any shape with 'features' elements).
+
+        Returns:
+            The predicted class label.
+        """
+        np.copyto(self._features, features.reshape(-1), casting='unsafe')
+        np.dot(self.coef, self._features, out=self._scores)
+        self._scores += self.intercept
+
+        # A binary model only has the score of the second class
+        if len(self._scores) == 1:
+            score = self._scores[0]
+            if abs(score) < self.tolerance:
+                score = self._binary64(features)
+            return self.classes[int(score > 0)]
+
+        best = int(self._scores.argmax())
+        top = self._scores[best]
+        self._scores[best] = -np.inf
+        if top - self._scores.max() < self.tolerance:
+            best = self._argmax64(features)
+        return self.classes[best]
+
+    def _argmax64(self, features):
+        """
+        Find the best class with float64 scores.
+
+        Args:
+            features (numpy.ndarray): The feature vector.
+
+        Returns:
+            int: Index of the best class.
+        """
+        np.copyto(self._features64, features.reshape(-1))
+        np.dot(self._coef64, self._features64, out=self._scores64)
+        self._scores64 += self._intercept64
+        return int(self._scores64.argmax())
+
+    def _binary64(self, features):
+        """
+        Compute the score of a binary model in float64.
+
+        Args:
+            features (numpy.ndarray): The feature vector.
+
+        Returns:
+            float: Score of the second class.
+        """
+        np.copyto(self._features64, features.reshape(-1))
+        np.dot(self._coef64, self._features64, out=self._scores64)
+        return self._scores64[0] + self._intercept64[0]
+
+
+if __name__ == "__main__":
+    """
+    Run the cursor movement model benchmark (scikit-learn against the compiled model).
+    """
+    import os
+    import pickle
+    try:
+        from src.DatasetStore import DatasetStore
+    except ModuleNotFoundError:
+        from DatasetStore import DatasetStore
+
+    with open(os.path.join('models', 'cursor_movement_model.pkl'), 'rb') as f:
+        sklearn_model = pickle.load(f)
+    model = LinearModel.from_sklearn(sklearn_model)
+
+    # Normalized keypoints of the recorded dataset (random ones if it is not available)
+    store = DatasetStore.open()
+    samples = store.features().astype(np.float64)
+    if not len(samples):
+        samples = np.random.default_rng(0).uniform(0, 1, (1000, 12))
+
+    # Both models must give the same predictions
+    expected = sklearn_model.predict(samples)
+    predicted = np.array([model.predict(sample) for sample in samples])
+    print(f'\n{len(samples)} samples, {np.mean(expected == predicted):.2%} identical predictions')
+
+    engines = {'sklearn': lambda sample: sklearn_model.predict(sample.reshape((1, -1)))[0],
+               'compiled': model.predict}
+    for name, engine in engines.items():
+        engine(samples[0])
+        latencies = []
+        for sample in samples:
+            start = time.perf_counter()
+            engine(sample)
+            latencies.append(time.perf_counter() - start)
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1e6, [50, 95, 99])
+        print(f'{name:<10} p50 {p50:8.2f} us   p95 {p95:8.2f} us   p99 {p99:8.2f} us')
@@ -0,0 +1,256 @@
+"""
+Metrics class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import json
+import time
+import numbers
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (in seconds) of the histogram buckets
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class Metrics:
+    """
+    A class for collecting runtime metrics: stage latency histograms and counters.
+
+    It is a recorder of the application stages (like LatencyStats), but it only keeps
+    fixed-bucket histograms, so its memory and recording time do not grow with the run
+    time. The metrics can be exported as JSON or Prometheus text, written periodically
+    to a file and/or served on a localhost HTTP endpoint ('/metrics' for Prometheus,
+    '/metrics.json' for JSON).
+
+    Attributes:
+        prefix (str): Prefix of the exported metric names.
+        histograms (dict): Bucket counts, sum and count of each stage.
+        counters (dict): Value of each counter.
+        gauges (dict): Function, kind and label name of each gauge (or counter read from elsewhere).
+        start_time (float): 'time.time' value when the collection started.
+    """
+
+    def __init__(self, prefix='handsfree'):
+        """
+        Initializes the Metrics class.
+
+        Args:
+            prefix (str): Prefix of the exported metric names.
+        """
+        self.prefix = prefix
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+        self._writer = None
+        self._running = False
+
+    def record(self, stage, start, end):
+        """
+        Record the execution time of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        duration = end - start
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            histogram['buckets'][bisect.bisect_left(BUCKETS, duration)] += 1
+            histogram['sum'] += duration
+            histogram['count'] += 1
+
+    def count(self, name, value=1):
+        """
+        Increase a counter.
+
+        Args:
+            name (str): Name of the counter.
+            value (int): Increment.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, function, kind='gauge', label=None):
+        """
+        Register a value read when the metrics are exported.
+
+        Args:
+            name (str): Name of the value.
+            function: Function returning the current value (or, with 'label', a dict of values).
+            kind (str): 'gauge', or 'counter' for values that only increase.
+            label (str, optional): Name of the label of the dict keys (one labelled sample per key).
+        """
+        self.gauges[name] = (function, kind, label)
+
+    def to_dict(self):
+        """
+        Get a snapshot of the metrics.
+
+        Returns:
+            dict: Histograms (with the bucket bounds in seconds), counters and gauges.
+        """
+        with self._lock:
+            histograms = {stage: {'buckets': list(histogram['buckets']), 'sum': histogram['sum'],
+                                  'count': histogram['count']} for stage, histogram in self.histograms.items()}
+            counters = dict(self.counters)
+        gauges = {}
+        for name, (function, kind, _) in self.gauges.items():
+            (counters if kind == 'counter' else gauges)[name] = function()
+        return {'time': time.time(), 'uptime': time.time() - self.start_time, 'buckets': list(BUCKETS),
+                'histograms': histograms, 'counters': counters, 'gauges': gauges}
+
+    def to_json(self):
+        """
+        Export the metrics as JSON.
+
+        Returns:
+            str: The JSON document.
+        """
+        return json.dumps(self.to_dict(), indent=4)
+
+    def to_prometheus(self):
+        """
+        Export the metrics in the Prometheus text format.
+
+        Returns:
+            str: The Prometheus metrics.
+        """
+        snapshot = self.to_dict()
+        name = f'{self.prefix}_stage_seconds'
+        lines = [f'# HELP {name} Execution time of the application stages.', f'# TYPE {name} histogram']
+        for stage, histogram in snapshot['histograms'].items():
+            cumulative = 0
+            for bound, count in zip(list(BUCKETS) + ['+Inf'], histogram['buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram["count"]}')
+        for counter, value in snapshot['counters'].items():
+            lines.append(f'# TYPE {self.prefix}_{counter}_total counter')
+            lines += self._samples(f'{self.prefix}_{counter}_total', value, self._label(counter))
+        for gauge, value in snapshot['gauges'].items():
+            lines.append(f'# TYPE {self.prefix}_{gauge} gauge')
+            lines += self._samples(f'{self.prefix}_{gauge}', value, self._label(gauge))
+        return '\n'.join(lines) + '\n'
+
+    def _label(self, name):
+        """
+        Get the label name of a registered value.
+
+        Args:
+            name (str): Name of the value.
+
+        Returns:
+            str: Name of the label (None for a counter increased with 'count', or an unlabelled value).
+        """
+        return self.gauges[name][2] if name in self.gauges else None
+
+    @staticmethod
+    def _samples(name, value, label=None):
+        """
+        Format the Prometheus samples of a value.
+
+        Args:
+            name (str): Name of the metric.
+            value: The value (a number, or a dict of numbers with 'label').
+            label (str, optional): Name of the label of the dict keys.
+
+        Returns:
+            list: The sample lines.
+        """
+        values = value if label is not None and isinstance(value, dict) else {None: value}
+        lines = []
+        for key, sample in values.items():
+            if isinstance(sample, bool) or not isinstance(sample, numbers.Real):
+                raise TypeError(f"Metric '{name}' has a non-numeric value: {sample!r}")
+            lines.append(f'{name}{{{label}="{key}"}} {sample}' if key is not None else f'{name} {sample}')
+        return lines
+
+    def save(self, path):
+        """
+        Write the metrics to a file (Prometheus text for '.prom' or '.txt' files, JSON otherwise).
+
+        Args:
+            path (str): Path to the file.
+        """
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as file:
+            file.write(text)
+
+    def start(self, path=None, port=None, interval=5.0):
+        """
+        Start exporting the metrics.
+
+        Args:
+            path (str, optional): File where the metrics are written every 'interval' seconds.
+            port (int, optional): Localhost port of the HTTP endpoint.
+            interval (float): Time between two writes of the file, in seconds.
+
+        Returns:
+            Metrics: The metrics object itself.
+        """
+        self._running = True
+        if path is not None:
+            self._writer = threading.Thread(target=self._write, args=(path, interval), name='metrics_writer',
+                                            daemon=True)
+            self._writer.start()
+        if port is not None:
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.startswith('/metrics.json'):
+                        body, content_type = metrics.to_json(), 'application/json'
+                    elif self.path.startswith('/metrics'):
+                        body, content_type = metrics.to_prometheus(), 'text/plain; version=0.0.4'
+                    else:
+                        self.send_error(404)
+                        return
+                    body = body.encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *_):
+                    pass
+
+            self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+            threading.Thread(target=self._server.serve_forever, name='metrics_server', daemon=True).start()
+        return self
+
+    def _write(self, path, interval):
+        """
+        Write the metrics file periodically (and once more when stopped).
+
+        Args:
+            path (str): Path to the file.
+            interval (float): Time between two writes, in seconds.
+        """
+        next_time = time.perf_counter()
+        while self._running:
+            next_time += interval
+            while self._running and time.perf_counter() < next_time:
+                time.sleep(min(0.2, max(0.0, next_time - time.perf_counter())))
+            self.save(path)
+
+    def stop(self):
+        """
+        Stop exporting the metrics (the file is written one last time).
+        """
+        self._running = False
+        if self._writer is not None:
+            self._writer.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
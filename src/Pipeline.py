@@ -0,0 +1,290 @@
+"""
+Pipeline class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import threading
+import traceback
+from collections import deque
+
+class DropOldestQueue:
+    """
+    A bounded queue that drops its oldest item when a new one arrives and it is full.
+
+    Attributes:
+        maxsize (int): Maximum number of items in the queue.
+        dropped (int): Number of items dropped so far.
+        closed (boolean): Whether the queue has been closed.
+    """
+
+    def __init__(self, maxsize=1):
+        """
+        Initializes the DropOldestQueue class.
+
+        Args:
+            maxsize (int): Maximum number of items in the queue.
+        """
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self._items = deque()
+        self._condition = threading.Condition()
+
+    def put(self, item):
+        """
+        Add an item to the queue, dropping the oldest one if the queue is full.
+
+        Args:
+            item: The new item.
+        """
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self):
+        """
+        Take the oldest item of the queue, waiting until there is one.
+
+        Returns:
+            The oldest item (None if the queue has been closed).
+        """
+        with self._condition:
+            while not self._items and not self.closed:
+                self._condition.wait()
+            if self.closed:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        """
+        Close the queue, waking up all the waiting consumers.
+        """
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class Stage:
+    """
+    A pipeline stage running its function on a dedicated worker thread.
+
+    The first stage of a pipeline (without input queue) is the source: its function is
+    called without arguments to produce new items, and returns them together with their
+    origin time ('time.perf_counter' value used for the 'frame' latency). The other stages
+    take each item from their input queue and pass the result of their function to the
+    next stage.
+    A function returning None drops the item, and a source raising StopIteration
+    finishes the pipeline. Any other exception is reported, and it stops the pipeline.
+
+    Attributes:
+        name (str): Name of the stage (used for the latency records).
+        function: The function executed for each item.
+        input_queue (DropOldestQueue): Queue connected to the previous stage (None for the source).
+        output_queue (DropOldestQueue): Queue connected to the next stage (None for the last stage).
+        thread (threading.Thread): The worker thread.
+    """
+
+    def __init__(self, name, function, pipeline, input_queue=None):
+        """
+        Initializes the Stage class.
+
+        Args:
+            name (str): Name of the stage.
+            function: The function executed for each item.
+            pipeline (Pipeline): The pipeline the stage belongs to.
+            input_queue (DropOldestQueue, optional): Queue connected to the previous stage.
+        """
+        self.name = name
+        self.function = function
+        self.pipeline = pipeline
+        self.input_queue = input_queue
+        self.output_queue = None
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+
+    def run(self):
+        """
+        Worker loop of the stage.
+        """
+        pipeline = self.pipeline
+        while pipeline.running:
+            # Produce (source) or take a new item: (origin time, data)
+            if self.input_queue is None:
+                pipeline.enabled.wait()
+                if not pipeline.running:
+                    break
+                start = time.perf_counter()
+                try:
+                    origin, data = self.function()
+                except StopIteration:
+                    pipeline.finish()
+                    break
+                except Exception as error:
+                    pipeline.fail(self.name, error)
+                    break
+            else:
+                item = self.input_queue.get()
+                if item is None:
+                    break
+                origin, data = item
+                start = time.perf_counter()
+                try:
+                    data = self.function(data)
+                except Exception as error:
+                    pipeline.fail(self.name, error)
+                    break
+
+            end = time.perf_counter()
+            pipeline.record(self.name, start, end)
+            if data is None:
+                continue
+            if self.output_queue is not None:
+                self.output_queue.put((origin, data))
+            else:
+                pipeline.record('frame', origin, end)
+
+
+class Pipeline:
+    """
+    A pipeline of stages, each one on its own worker thread.
+
+    The stages are connected by bounded queues which drop the oldest item when full,
+    so a slow stage always processes the newest data instead of a growing backlog.
+    The source stage can be paused, leaving every worker blocked (without CPU usage).
+
+    Attributes:
+        stages (list): The pipeline stages, in order.
+        recorders (list): Objects with a 'record(stage, start, end)' method (e.g. LatencyStats).
+        running (boolean): Whether the pipeline is running.
+        enabled (threading.Event): Set while the source stage is allowed to produce items.
+        finished (threading.Event): Set when the pipeline has finished.
+        on_finish: Function called when the pipeline finishes.
+        error (tuple): Name of the stage which failed and its exception (None if no stage has failed).
+    """
+
+    def __init__(self, recorders=(), on_finish=None):
+        """
+        Initializes the Pipeline class.
+
+        Args:
+            recorders (iterable): Objects with a 'record(stage, start, end)' method.
+            on_finish (optional): Function called when the pipeline finishes.
+        """
+        self.stages = []
+        self.recorders = [recorder for recorder in recorders if recorder is not None]
+        self.running = False
+        self.enabled = threading.Event()
+        self.enabled.set()
+        self.finished = threading.Event()
+        self.on_finish = on_finish
+        self.error = None
+
+    def add_stage(self, name, function, maxsize=1):
+        """
+        Append a stage to the pipeline.
+
+        Args:
+            name (str): Name of the stage.
+            function: The function executed for each item.
+            maxsize (int): Size of the queue connecting the stage with the previous one.
+
+        Returns:
+            Pipeline: The pipeline itself (to chain calls).
+        """
+        input_queue = None
+        if self.stages:
+            input_queue = DropOldestQueue(maxsize)
+            self.stages[-1].output_queue = input_queue
+        self.stages.append(Stage(name, function, self, input_queue))
+        return self
+
+    def record(self, stage, start, end):
+        """
+        Send the execution time of a stage to the recorders.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        for recorder in self.recorders:
+            recorder.record(stage, start, end)
+
+    def dropped(self):
+        """
+        Count the items dropped by each queue.
+
+        Returns:
+            dict: Number of items dropped before each stage.
+        """
+        return {stage.name: stage.input_queue.dropped for stage in self.stages if stage.input_queue is not None}
+
+    def start(self):
+        """
+        Start the worker threads of all the stages.
+        """
+        self.running = True
+        for stage in self.stages:
+            stage.thread.start()
+
+    def pause(self):
+        """
+        Stop producing new items (the workers wait without using the CPU).
+        """
+        self.enabled.clear()
+
+    def resume(self):
+        """
+        Produce new items again.
+        """
+        self.enabled.set()
+
+    def finish(self):
+        """
+        Mark the pipeline as finished and notify it.
+        """
+        if not self.finished.is_set():
+            self.finished.set()
+            if self.on_finish is not None:
+                self.on_finish()
+
+    def fail(self, stage, error):
+        """
+        Report the exception raised by a stage, and stop the pipeline (the other stages
+        would wait forever for its items).
+
+        Args:
+            stage (str): Name of the stage.
+            error (Exception): The exception raised by the stage function.
+        """
+        if self.error is None:
+            self.error = (stage, error)
+        print(f"The '{stage}' stage failed, stopping the pipeline:\n"
+              + ''.join(traceback.format_exception(type(error), error, error.__traceback__)), end='')
+        self._halt()
+        self.finish()
+
+    def _halt(self):
+        """
+        Ask all the stages to stop (without waiting for their worker threads).
+        """
+        self.running = False
+        self.enabled.set()
+        for stage in self.stages:
+            if stage.input_queue is not None:
+                stage.input_queue.close()
+
+    def stop(self):
+        """
+        Stop all the stages and wait for their worker threads.
+        """
+        self._halt()
+        for stage in self.stages:
+            if stage.thread.is_alive() and stage.thread is not threading.current_thread():
+                stage.thread.join()
+        self.finish()
@@ -0,0 +1,206 @@
+"""
+ResourceConfig class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import time
+from collections import deque
+import numpy as np
+
+# Thread pools of the numerical libraries, sized when each library is imported
+THREAD_VARIABLES = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+class ResourceConfig:
+    """
+    A class for sharing the CPU cores between the vision and the speech subsystems.
+
+    PyTorch, OpenCV and MediaPipe size their thread pools to every core by default, so on
+    small machines they oversubscribe the CPU and slow each other down whenever a speech
+    inference runs during the face tracking. This class assigns a number of threads (and,
+    optionally, a set of cores) to each subsystem:
+    - 'vision': the OpenCV threads, and the cores of the face tracking threads (the MediaPipe
+      threads inherit them, so it must be applied before the face detector is created).
+    - 'speech': the PyTorch / ONNX Runtime threads, and the cores of the speech thread or process.
+
+    Profiles:
+    - 'default': the libraries keep their own settings.
+    - 'auto': a quarter of the cores (at least one) for the speech, the rest for the vision; the
+      OpenCV threads are limited to one, as the pipeline stages already run in parallel.
+    - 'low': a single thread for each library (for machines shared with other applications).
+
+    It is also a recorder of the application stages: the whole frame latencies are compared
+    during and outside the speech inferences to report the measured contention.
+
+    Attributes:
+        profile (str): Name of the profile.
+        affinity (boolean): Whether the subsystems are pinned to their own cores.
+        cores (list): Cores available to the application.
+        plan (dict): Number of threads and cores ('threads' and 'cpus') of each subsystem.
+        start_time (float): 'time.perf_counter' value when the configuration was created.
+    """
+
+    PROFILES = ('default', 'auto', 'low')
+
+    def __init__(self, profile='auto', affinity=False, vision_threads=None, speech_threads=None, history=100000):
+        """
+        Initializes the ResourceConfig class.
+
+        Args:
+            profile (str): Name of the profile ('default', 'auto' or 'low').
+            affinity (boolean): Pin the subsystems to their own cores (only where it is supported).
+            vision_threads (int, optional): Number of OpenCV threads (overrides the profile).
+            speech_threads (int, optional): Number of PyTorch / ONNX Runtime threads (overrides the profile).
+            history (int): Maximum number of frames and inferences kept for the contention report.
+        """
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown resource profile '{profile}', choose one of {list(self.PROFILES)}")
+        self.profile = profile
+        self.affinity = affinity and hasattr(os, 'sched_setaffinity')
+        if hasattr(os, 'sched_getaffinity'):
+            self.cores = sorted(os.sched_getaffinity(0))
+        else:
+            self.cores = list(range(os.cpu_count() or 1))
+
+        # Split the cores between the subsystems
+        count = len(self.cores)
+        speech_cores = max(1, count // 4) if count > 1 else 1
+        self.plan = {'vision': {'threads': None, 'cpus': None}, 'speech': {'threads': None, 'cpus': None}}
+        if profile == 'auto':
+            self.plan['vision']['threads'] = 1
+            self.plan['speech']['threads'] = speech_cores
+        elif profile == 'low':
+            self.plan['vision']['threads'] = 1
+            self.plan['speech']['threads'] = 1
+        if vision_threads is not None:
+            self.plan['vision']['threads'] = vision_threads
+        if speech_threads is not None:
+            self.plan['speech']['threads'] = speech_threads
+        if self.affinity and count > 1:
+            self.plan['vision']['cpus'] = self.cores[:count - speech_cores]
+            self.plan['speech']['cpus'] = self.cores[count - speech_cores:]
+
+        self.start_time = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._switches_start = self._involuntary_switches()
+        self._frames = deque(maxlen=history)
+        self._inferences = deque(maxlen=history)
+
+    def threads(self, subsystem):
+        """
+        Get the number of threads of a subsystem.
+
+        Args:
+            subsystem (str): 'vision' or 'speech'.
+
+        Returns:
+            int: Number of threads (None to keep the library default).
+        """
+        return self.plan[subsystem]['threads']
+
+    def apply(self, subsystem):
+        """
+        Apply the configuration of a subsystem to the calling thread.
+
+        The cores are set for the calling thread (and the threads and processes it starts
+        afterwards). The 'speech' thread count is also exported to the numerical libraries
+        imported afterwards; the backends set their own pools from 'threads'.
+
+        Args:
+            subsystem (str): 'vision' or 'speech'.
+        """
+        threads, cpus = self.plan[subsystem]['threads'], self.plan[subsystem]['cpus']
+        if cpus is not None:
+            os.sched_setaffinity(0, cpus)
+        if threads is None:
+            return
+        if subsystem == 'vision':
+            import cv2
+            cv2.setNumThreads(threads)
+        else:
+            for variable in THREAD_VARIABLES:
+                os.environ[variable] = str(threads)
+
+    def record(self, stage, start, end):
+        """
+        Record the whole frame latencies and the speech inferences.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        if stage == 'frame':
+            self._frames.append((start, end))
+        elif stage == 'inference':
+            self._inferences.append((start, end))
+
+    @staticmethod
+    def _involuntary_switches():
+        """
+        Count the involuntary context switches of the process (CPU taken by other threads or processes).
+
+        Returns:
+            int: Number of involuntary context switches (None where it is not available).
+        """
+        try:
+            import resource
+        except ImportError:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_nivcsw
+
+    def contention(self):
+        """
+        Measure the contention between the subsystems.
+
+        Returns:
+            dict: Frame latency percentiles (ms) during and outside the inferences, average number
+                of busy cores of this process, and involuntary context switches per second (where available).
+        """
+        elapsed = time.perf_counter() - self.start_time
+        result = {'cores': len(self.cores), 'busy_cores': (time.process_time() - self._cpu_start) / elapsed}
+        switches = self._involuntary_switches()
+        if switches is not None:
+            result['involuntary_switches'] = (switches - self._switches_start) / elapsed
+
+        frames = np.array(self._frames).reshape((-1, 2))
+        inferences = np.array(self._inferences).reshape((-1, 2))
+        overlapped = np.zeros(len(frames), dtype=bool)
+        if len(inferences):
+            # The inferences are sequential: the last one starting before the end of a frame is the latest
+            index = np.searchsorted(inferences[:, 0], frames[:, 1]) - 1
+            overlapped = (index >= 0) & (inferences[np.maximum(index, 0), 1] > frames[:, 0])
+        latencies = (frames[:, 1] - frames[:, 0]) * 1000
+        for name, selected in (('speech', latencies[overlapped]), ('idle', latencies[~overlapped])):
+            if len(selected):
+                result[name] = {'frames': len(selected), 'p50': float(np.percentile(selected, 50)),
+                                'p99': float(np.percentile(selected, 99))}
+        return result
+
+    def report(self):
+        """
+        Build a report of the configuration and the measured contention.
+
+        Returns:
+            str: The report.
+        """
+        def describe(subsystem):
+            threads, cpus = self.plan[subsystem]['threads'], self.plan[subsystem]['cpus']
+            text = f"{threads if threads is not None else 'default'} threads"
+            return text + (f" on cores {cpus}" if cpus is not None else "")
+
+        result = self.contention()
+        lines = [f"Resources ({self.profile} profile, {result['cores']} cores): "
+                 f"vision {describe('vision')}, speech {describe('speech')}",
+                 f"  busy cores: {result['busy_cores']:.2f}"
+                 + (f", involuntary context switches: {result['involuntary_switches']:.0f}/s"
+                    if 'involuntary_switches' in result else "")]
+        for name, label in (('idle', 'without speech inference'), ('speech', 'during speech inference')):
+            if name in result:
+                lines.append(f"  frame latency {label}: p50 {result[name]['p50']:.1f} ms, "
+                             f"p99 {result[name]['p99']:.1f} ms ({result[name]['frames']} frames)")
+        if 'idle' in result and 'speech' in result:
+            lines.append(f"  p99 slowdown during speech inference: x{result['speech']['p99'] / result['idle']['p99']:.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,258 @@
+"""
+Speech commands classification backends
+
+Author: HenryAreiza
+Date: 18/10/2026
+
+Each backend loads the speech commands model from its path and classifies
+1 s audio windows sampled at 16 kHz: backend(audio_data) returns the detected label,
+backend.predict(audio_data) the label and its confidence, and backend.batch_scores(windows)
+the probability of each one of 'backend.labels' for a batch of windows (in a single
+forward pass).
+The libraries used by each backend are imported only when that backend is created,
+and their thread pools can be limited with the 'threads' argument.
+
+The ONNX models are written next to the original one by 'utils/ExportSpeechModel.py',
+and the keyword spotter is trained by 'utils/TrainKeywordSpotter.py'.
+"""
+
+import os
+import json
+import numpy as np
+
+try:
+    from src.KeywordSpotter import KeywordSpotter
+except ModuleNotFoundError:
+    from KeywordSpotter import KeywordSpotter
+
+class PipelineBackend:
+    """
+    Classification through the Hugging Face Transformers pipeline (fp32 PyTorch).
+    """
+
+    def __init__(self, model_path, threads=None):
+        """
+        Initializes the PipelineBackend class.
+
+        Args:
+            model_path (str): Path to the pretrained model directory.
+            threads (int, optional): Number of PyTorch threads (the library default if not given).
+        """
+        from transformers import pipeline
+        if threads is not None:
+            import torch
+            torch.set_num_threads(threads)
+        self.pipe = pipeline("audio-classification", model=model_path)
+        id2label = self.pipe.model.config.id2label
+        self.labels = [id2label[i] for i in range(len(id2label))]
+
+    def predict(self, audio_data):
+        result = self.pipe(audio_data)[0]
+        return result["label"], float(result["score"])
+
+    def batch_scores(self, windows):
+        import torch
+        extractor = self.pipe.feature_extractor
+        inputs = extractor(list(windows), sampling_rate=extractor.sampling_rate, padding=True, return_tensors='pt')
+        with torch.inference_mode():
+            logits = self.pipe.model(**inputs).logits
+        return torch.softmax(logits, dim=-1).numpy()
+
+    def __call__(self, audio_data):
+        return self.pipe(audio_data)[0]["label"]
+
+
+class TorchBackend:
+    """
+    Classification through a direct forward pass of the PyTorch model (fp32).
+
+    The model is called without the Transformers pipeline machinery (input checks, new
+    feature extractor tensors, batching wrapper, and softmax and sorting of every label):
+    the audio is copied and normalized in place into a preallocated input tensor, and
+    only the best label and its probability are computed.
+    """
+
+    def __init__(self, model_path, threads=None):
+        """
+        Initializes the TorchBackend class.
+
+        Args:
+            model_path (str): Path to the pretrained model directory.
+            threads (int, optional): Number of PyTorch threads (the library default if not given).
+        """
+        import torch
+        from transformers import AutoModelForAudioClassification
+        if threads is not None:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        self.model = AutoModelForAudioClassification.from_pretrained(model_path).eval()
+        id2label = self.model.config.id2label
+        self.labels = [id2label[i] for i in range(len(id2label))]
+        with open(os.path.join(model_path, 'preprocessor_config.json'), 'r') as file:
+            self.normalize = json.load(file).get('do_normalize', True)
+        self._inputs = {}
+
+    def _input(self, windows):
+        """
+        Copy audio windows into the preallocated input tensor of their shape, and normalize them
+        (zero mean and unit variance, as the Wav2Vec2 feature extractor).
+
+        Args:
+            windows (numpy.ndarray): Audio window, or batch of windows.
+
+        Returns:
+            torch.Tensor: The input tensor (batch, samples).
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        windows = windows.reshape((-1, windows.shape[-1]))
+        tensor = self._inputs.get(windows.shape)
+        if tensor is None:
+            tensor = self._inputs[windows.shape] = self.torch.empty(windows.shape)
+        tensor.copy_(self.torch.from_numpy(windows))
+        if self.normalize:
+            tensor.sub_(tensor.mean(dim=1, keepdim=True))
+            tensor.div_(tensor.square().mean(dim=1, keepdim=True).add_(1e-7).sqrt_())
+        return tensor
+
+    def logits(self, windows):
+        with self.torch.inference_mode():
+            return self.model(self._input(windows)).logits
+
+    def predict(self, audio_data):
+        logits = self.logits(audio_data)[0]
+        index = int(logits.argmax())
+        return self.labels[index], 1.0 / float(self.torch.exp(logits - logits[index]).sum())
+
+    def batch_scores(self, windows):
+        return self.torch.softmax(self.logits(windows), dim=-1).numpy()
+
+    def __call__(self, audio_data):
+        return self.labels[int(self.logits(audio_data)[0].argmax())]
+
+
+class OnnxBackend:
+    """
+    Classification through ONNX Runtime on the CPU.
+
+    The audio normalization of the Wav2Vec2 feature extractor is done with NumPy,
+    so neither PyTorch nor Transformers are loaded.
+    """
+
+    MODEL_FILE = 'model.onnx'
+
+    def __init__(self, model_path, threads=None):
+        """
+        Initializes the OnnxBackend class.
+
+        Args:
+            model_path (str): Path to the pretrained model directory.
+            threads (int, optional): Number of ONNX Runtime threads (the library default if not given).
+        """
+        import onnxruntime as ort
+        onnx_path = os.path.join(model_path, self.MODEL_FILE)
+        if not os.path.isfile(onnx_path):
+            raise FileNotFoundError(f"'{onnx_path}' not found, export it with 'python utils/ExportSpeechModel.py'")
+        options = ort.SessionOptions()
+        if threads is not None:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+        # Read the labels and the feature extractor configuration
+        with open(os.path.join(model_path, 'config.json'), 'r') as file:
+            config = json.load(file)
+        self.labels = [config['id2label'][str(i)] for i in range(len(config['id2label']))]
+        with open(os.path.join(model_path, 'preprocessor_config.json'), 'r') as file:
+            self.normalize = json.load(file).get('do_normalize', True)
+
+    def logits(self, audio_data):
+        audio_data = np.asarray(audio_data, dtype=np.float32).reshape((1, -1))
+        if self.normalize:
+            audio_data = (audio_data - audio_data.mean()) / np.sqrt(audio_data.var() + 1e-7)
+        return self.session.run(None, {self.input_name: audio_data})[0][0]
+
+    def predict(self, audio_data):
+        logits = self.logits(audio_data)
+        probabilities = np.exp(logits - logits.max())
+        index = int(logits.argmax())
+        return self.labels[index], float(probabilities[index] / probabilities.sum())
+
+    def batch_scores(self, windows):
+        windows = np.asarray(windows, dtype=np.float32)
+        if self.normalize:
+            windows = ((windows - windows.mean(axis=1, keepdims=True))
+                       / np.sqrt(windows.var(axis=1, keepdims=True) + 1e-7))
+        logits = self.session.run(None, {self.input_name: windows})[0]
+        probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def __call__(self, audio_data):
+        return self.labels[int(self.logits(audio_data).argmax())]
+
+
+class QuantizedOnnxBackend(OnnxBackend):
+    """
+    Classification through ONNX Runtime with the dynamically quantized (int8) model.
+    """
+
+    MODEL_FILE = 'model_int8.onnx'
+
+
+class KeywordSpotterBackend(KeywordSpotter):
+    """
+    Classification through the lightweight MFCC keyword spotter (NumPy only).
+    """
+
+    def __init__(self, model_path, threads=None):
+        """
+        Initializes the KeywordSpotterBackend class.
+
+        Args:
+            model_path (str): Path to the trained keyword spotter archive.
+            threads (int, optional): Unused (the keyword spotter runs on the calling thread).
+        """
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"'{model_path}' not found, train it with 'python utils/TrainKeywordSpotter.py'")
+        spotter = KeywordSpotter.load(model_path)
+        super().__init__(spotter.labels, spotter.mean, spotter.scale, spotter.coef,
+                         spotter.intercept, spotter.extractor.segments)
+
+    def batch_scores(self, windows):
+        return np.array([self.scores(window) for window in windows])
+
+
+BACKENDS = {'pipeline': PipelineBackend, 'torch': TorchBackend, 'onnx': OnnxBackend, 'int8': QuantizedOnnxBackend,
+            'kws': KeywordSpotterBackend}
+
+def default_model_path(name):
+    """
+    Get the default model path of a backend.
+
+    Args:
+        name (str): Name of the backend.
+
+    Returns:
+        str: Path to the model used by the backend.
+    """
+    if name == 'kws':
+        return os.path.join('models', 'keyword_spotter.npz')
+    return os.path.join('models', 'speech_commands_model')
+
+def create_backend(name, model_path=None, threads=None):
+    """
+    Create a speech commands classification backend.
+
+    Args:
+        name (str): Name of the backend ('pipeline', 'torch', 'onnx', 'int8' or 'kws').
+        model_path (str, optional): Path to the model (the default one of the backend if not given).
+        threads (int, optional): Number of inference threads (the library default if not given).
+
+    Returns:
+        The speech commands classification backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown speech backend '{name}', choose one of {list(BACKENDS)}")
+    if model_path is None:
+        model_path = default_model_path(name)
+    return BACKENDS[name](model_path, threads=threads)
@@ -0,0 +1,70 @@
+"""
+StartupProfiler class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """
+    A class for timing the startup phases of the application (imports and initializations).
+
+    The phases can run on different threads, and the milestones record when the
+    application reaches a given state (e.g. the first cursor movement).
+
+    Attributes:
+        start_time (float): 'time.perf_counter' value when the profiler was created.
+        phases (list): Recorded phases as (name, thread, start offset, duration) tuples, in seconds.
+        milestones (dict): Time (since start) when each milestone was reached, in seconds.
+    """
+
+    def __init__(self):
+        """
+        Initializes the StartupProfiler class.
+        """
+        self.start_time = time.perf_counter()
+        self.phases = []
+        self.milestones = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a startup phase (used as 'with profiler.phase(name):').
+
+        Args:
+            name (str): Name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, threading.current_thread().name, start - self.start_time, end - start))
+
+    def milestone(self, name):
+        """
+        Record the first time a milestone is reached.
+
+        Args:
+            name (str): Name of the milestone.
+        """
+        if name not in self.milestones:
+            self.milestones[name] = time.perf_counter() - self.start_time
+
+    def report(self):
+        """
+        Build a printable table with the phases and milestones.
+
+        Returns:
+            str: The startup profile.
+        """
+        lines = [f"{'phase':<34}{'thread':<16}{'start [s]':>10}{'time [s]':>10}"]
+        for name, thread, start, duration in sorted(self.phases, key=lambda phase: phase[2]):
+            lines.append(f"{name:<34}{thread[:15]:<16}{start:>10.3f}{duration:>10.3f}")
+        for name, elapsed in sorted(self.milestones.items(), key=lambda milestone: milestone[1]):
+            lines.append(f"{'* ' + name:<50}{elapsed:>10.3f}")
+        return '\n'.join(lines)
@@ -0,0 +1,150 @@
+"""
+TraceRecorder class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import json
+import time
+import itertools
+import threading
+import numpy as np
+
+class TraceRecorder:
+    """
+    A class for recording a timeline of the application stages in Chrome trace-event format.
+
+    It is a recorder of the application stages (like LatencyStats): every stage execution
+    becomes a span event on the thread that ran it (the stages of the speech worker process
+    are given with its own process and thread, through 'record_thread'). The events are
+    stored in preallocated arrays (the recording stops when they are full), and written as
+    a JSON trace which can be opened in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+    The latencies measured across threads (e.g. the whole frame latency) are not spans
+    of a single thread, so they are skipped.
+
+    Attributes:
+        capacity (int): Maximum number of recorded events.
+        skip (tuple): Names of the stages which are not recorded.
+        names (dict): Index of each stage name.
+        pid (int): Identifier of this process.
+        threads (dict): Name of each (process identifier, thread identifier) pair.
+        start_time (float): 'time.perf_counter' value when the recording started.
+        dropped (int): Number of events not recorded because the buffer was full.
+    """
+
+    def __init__(self, capacity=1000000, skip=('frame', 'queue_to_action', 'voice_to_action')):
+        """
+        Initializes the TraceRecorder class.
+
+        Args:
+            capacity (int): Maximum number of recorded events.
+            skip (tuple): Names of the stages which are not recorded.
+        """
+        self.capacity = capacity
+        self.skip = skip
+        self.names = {}
+        self.pid = os.getpid()
+        self.threads = {}
+        self.start_time = time.perf_counter()
+        self.dropped = 0
+        self._starts = np.zeros(capacity)
+        self._durations = np.zeros(capacity)
+        self._name_ids = np.zeros(capacity, dtype=np.int32)
+        self._thread_ids = np.zeros(capacity, dtype=np.int64)
+        self._pids = np.zeros(capacity, dtype=np.int64)
+        self._index = itertools.count()
+        self._size = 0
+
+    def record(self, stage, start, end):
+        """
+        Record the execution of a stage on the current thread.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        if stage in self.skip:
+            return
+        thread_id = threading.get_ident()
+        if (self.pid, thread_id) not in self.threads:
+            self.threads[(self.pid, thread_id)] = threading.current_thread().name
+        self._add(stage, start, end, self.pid, thread_id)
+
+    def record_thread(self, stage, start, end, pid, thread_id, thread_name):
+        """
+        Record the execution of a stage on a thread of another process.
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+            pid (int): Identifier of the process which ran the stage.
+            thread_id (int): Identifier of the thread which ran the stage.
+            thread_name (str): Name of the thread which ran the stage.
+        """
+        if stage in self.skip:
+            return
+        if (pid, thread_id) not in self.threads:
+            self.threads[(pid, thread_id)] = thread_name
+        self._add(stage, start, end, pid, thread_id)
+
+    def _add(self, stage, start, end, pid, thread_id):
+        """
+        Store a span event (or count it as dropped if the buffer is full).
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+            pid (int): Identifier of the process which ran the stage.
+            thread_id (int): Identifier of the thread which ran the stage.
+        """
+        index = next(self._index)
+        if index >= self.capacity:
+            self.dropped += 1
+            return
+        name_id = self.names.get(stage)
+        if name_id is None:
+            name_id = self.names.setdefault(stage, len(self.names))
+        self._starts[index] = start
+        self._durations[index] = end - start
+        self._name_ids[index] = name_id
+        self._thread_ids[index] = thread_id
+        self._pids[index] = pid
+        self._size = max(self._size, index + 1)
+
+    def events(self):
+        """
+        Build the trace events.
+
+        Returns:
+            list: Chrome trace events (thread names first, then the spans in microseconds).
+        """
+        names = {index: name for name, index in self.names.items()}
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id, 'args': {'name': name}}
+                  for (pid, thread_id), name in list(self.threads.items())]
+        size = min(self._size, self.capacity)
+        starts = (self._starts[:size] - self.start_time) * 1e6
+        durations = self._durations[:size] * 1e6
+        for start, duration, name_id, thread_id, pid in zip(starts.tolist(), durations.tolist(),
+                                                             self._name_ids[:size].tolist(),
+                                                             self._thread_ids[:size].tolist(),
+                                                             self._pids[:size].tolist()):
+            events.append({'name': names[name_id], 'ph': 'X', 'ts': start, 'dur': duration,
+                           'pid': pid, 'tid': thread_id})
+        return events
+
+    def save(self, path):
+        """
+        Write the trace in Chrome trace-event format.
+
+        Args:
+            path (str): Path to the JSON file.
+        """
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': self.dropped}}, file)
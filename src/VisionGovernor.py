@@ -0,0 +1,174 @@
+"""
+VisionGovernor class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import threading
+
+class VisionGovernor:
+    """
+    A class for adapting the processing resolution and frame rate of the vision pipeline to a time budget.
+
+    The governor is a recorder of the vision pipeline: it adds the time spent by the processing
+    stages on each frame, and every 'window' frames it compares the average with the budget.
+    Over the budget, it first lowers the processing resolution (the frames are downscaled before
+    the color conversion and the face detection) and then the frame rate; well under the budget,
+    it goes back up in the opposite order.
+
+    With a CPU cap (fraction of one core used by the processing stages), the budget of each frame
+    is also limited to 'cpu_cap / fps', so the frame rate is lowered when a frame costs too much.
+
+    Attributes:
+        max_fps (float): Frame rate of the camera.
+        budget (float): Processing time budget of each frame, in seconds (None to use only the CPU cap).
+        cpu_cap (float): Maximum fraction of one core used by the processing stages (None for no cap).
+        stages (tuple): Names of the recorded stages counted as processing time.
+        window (int): Number of frames between two adjustments.
+        up_ratio (float): Fraction of the budget under which the quality goes back up.
+        levels (list): (scale, fps) settings, from the highest to the lowest quality.
+        level (int): Index of the current setting.
+        cost (float): Average processing time of the last frames, in seconds.
+        changes (int): Number of setting changes.
+        on_change: Function called with (scale, fps) when the setting changes.
+    """
+
+    def __init__(self, max_fps, budget=None, cpu_cap=None, scales=(1.0, 0.75, 0.5, 0.35),
+                 fps_ratios=(1.0, 0.75, 0.5, 0.33), window=30, up_ratio=0.6, on_change=None,
+                 stages=('resize', 'cvtColor', 'face_detection', 'move_cursor', 'cursor_move')):
+        """
+        Initializes the VisionGovernor class.
+
+        Args:
+            max_fps (float): Frame rate of the camera.
+            budget (float, optional): Processing time budget of each frame, in seconds.
+            cpu_cap (float, optional): Maximum fraction of one core used by the processing stages.
+            scales (tuple): Processing resolution scales, from the highest to the lowest.
+            fps_ratios (tuple): Frame rates (relative to 'max_fps'), from the highest to the lowest.
+            window (int): Number of frames between two adjustments.
+            up_ratio (float): Fraction of the budget under which the quality goes back up.
+            on_change: Function called with (scale, fps) when the setting changes.
+            stages (tuple): Names of the recorded stages counted as processing time.
+        """
+        if budget is None and cpu_cap is None:
+            raise ValueError("The governor needs a frame budget or a CPU cap")
+        self.max_fps = max_fps
+        self.budget = budget
+        self.cpu_cap = cpu_cap
+        self.stages = stages
+        self.window = window
+        self.up_ratio = up_ratio
+        self.levels = [(scale, max_fps) for scale in scales] + \
+                      [(scales[-1], max_fps * ratio) for ratio in fps_ratios[1:]]
+        self.level = 0
+        self.cost = 0.0
+        self.changes = 0
+        self.on_change = on_change
+        self._frame_cost = 0.0
+        self._frames = 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def scale(self):
+        """
+        float: Current processing resolution scale.
+        """
+        return self.levels[self.level][0]
+
+    @property
+    def fps(self):
+        """
+        float: Current processing frame rate.
+        """
+        return self.levels[self.level][1]
+
+    def frame_budget(self, level=None):
+        """
+        Get the processing time budget of each frame at a given setting.
+
+        Args:
+            level (int, optional): Index of the setting (the current one if not given).
+
+        Returns:
+            float: The budget in seconds.
+        """
+        fps = self.levels[self.level if level is None else level][1]
+        budgets = [limit for limit in (self.budget, None if self.cpu_cap is None else self.cpu_cap / fps)
+                   if limit is not None]
+        return min(budgets)
+
+    def accept(self, timestamp):
+        """
+        Check whether a new frame must be processed to keep the current frame rate.
+
+        Args:
+            timestamp (float): 'time.perf_counter' value when the frame was captured.
+
+        Returns:
+            boolean: Whether the frame is processed.
+        """
+        interval = 1 / self.fps
+        if timestamp < self._next_time - 0.25 * interval:
+            return False
+        self._next_time = max(self._next_time + interval, timestamp)
+        return True
+
+    def record(self, stage, start, end):
+        """
+        Record the execution time of a stage (adjusting the setting every 'window' frames).
+
+        Args:
+            stage (str): Name of the stage.
+            start (float): 'time.perf_counter' value at the beginning of the stage.
+            end (float): 'time.perf_counter' value at the end of the stage.
+        """
+        with self._lock:
+            if stage in self.stages:
+                self._frame_cost += end - start
+            elif stage == 'frame':
+                self.cost += (self._frame_cost - self.cost) / min(self._frames + 1, self.window)
+                self._frame_cost = 0.0
+                self._frames += 1
+                if self._frames >= self.window:
+                    self._adjust()
+
+    def _adjust(self):
+        """
+        Move one setting down if the frames are over the budget, or one up if they are well under it.
+        """
+        level = self.level
+        if self.cost > self.frame_budget() and level + 1 < len(self.levels):
+            level += 1
+        elif level > 0 and self.cost < self.up_ratio * self.frame_budget(level - 1):
+            level -= 1
+        if level != self.level:
+            self.level = level
+            self.changes += 1
+            self._frames = 0
+            if self.on_change is not None:
+                self.on_change(self.scale, self.fps)
+        else:
+            self._frames = self.window // 2
+
+    def state(self):
+        """
+        Get the current setting of the governor (for monitoring).
+
+        Returns:
+            dict: Setting level, scale, frame rate, average cost and budget (in ms), and number of changes.
+        """
+        return {'level': self.level, 'scale': self.scale, 'fps': self.fps, 'cost': self.cost * 1000,
+                'budget': self.frame_budget() * 1000, 'changes': self.changes}
+
+    def report(self):
+        """
+        Build a printable summary of the current setting.
+
+        Returns:
+            str: The governor state.
+        """
+        state = self.state()
+        return (f"Vision governor: scale {state['scale']:.2f}, {state['fps']:.1f} fps, "
+                f"{state['cost']:.1f} ms per frame (budget {state['budget']:.1f} ms), {state['changes']} changes")
@@ -0,0 +1,185 @@
+"""
+VoiceActivityDetector class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import numpy as np
+
+class VoiceActivityDetector:
+    """
+    A streaming voice activity detector which gates the speech commands classifier.
+
+    Each audio frame is considered voiced when its energy is several times above an
+    adaptive noise floor and its zero-crossing rate is in the range of speech. An
+    utterance starts after 'onset_frames' consecutive voiced frames and ends after
+    'hangover' seconds without voiced frames. Only utterances long enough, not longer
+    than a command, and louder than the sensitivity threshold are sent to the classifier.
+
+    Every burst of audio louder than the sensitivity threshold (which would have triggered
+    an inference with a plain amplitude gate) that does not end up in an accepted
+    utterance is counted as a rejected inference.
+
+    Attributes:
+        sample_rate (int): Sampling rate of the audio frames.
+        threshold (float): Minimum peak amplitude of an utterance (sensitivity threshold).
+        energy_ratio (float): Minimum ratio between the energy of a voiced frame and the noise floor.
+        zcr_range (tuple): Range of zero-crossing rates (crossings per second) of a voiced frame.
+        onset_frames (int): Consecutive voiced frames which start an utterance.
+        hangover (int): Samples without voiced frames which end an utterance.
+        min_length (int): Minimum length (in samples) of an accepted utterance.
+        max_length (int): Maximum length (in samples) of an accepted utterance.
+        noise_floor (float): Current estimate of the background noise energy.
+        frames (int): Number of processed frames.
+        inferences (int): Number of accepted utterances (classifier calls).
+        rejected (int): Number of rejected inferences.
+    """
+
+    def __init__(self, sample_rate, threshold=0.3, energy_ratio=4.0, zcr_range=(150, 6000),
+                 onset_frames=2, hangover=0.25, min_length=0.1, max_length=1.5, adaptation=0.05):
+        """
+        Initializes the VoiceActivityDetector class.
+
+        Args:
+            sample_rate (int): Sampling rate of the audio frames.
+            threshold (float): Minimum peak amplitude of an utterance.
+            energy_ratio (float): Minimum ratio between the energy of a voiced frame and the noise floor.
+            zcr_range (tuple): Range of zero-crossing rates (crossings per second) of a voiced frame.
+            onset_frames (int): Consecutive voiced frames which start an utterance.
+            hangover (float): Seconds without voiced frames which end an utterance.
+            min_length (float): Minimum length (in seconds) of an accepted utterance.
+            max_length (float): Maximum length (in seconds) of an accepted utterance.
+            adaptation (float): Adaptation rate of the noise floor (0.0 to 1.0).
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.energy_ratio = energy_ratio
+        self.zcr_range = zcr_range
+        self.onset_frames = onset_frames
+        self.hangover = int(hangover * sample_rate)
+        self.min_length = int(min_length * sample_rate)
+        self.max_length = int(max_length * sample_rate)
+        self.adaptation = adaptation
+        self.noise_floor = None
+        self.frames = 0
+        self.inferences = 0
+        self.rejected = 0
+
+        self._voiced_run = 0
+        self._candidate = 0
+        self._speech_start = None
+        self._last_voiced = 0
+        self._peak = 0.0
+        self._energy = 0.0
+        self._loud = False
+
+    def update_noise_floor(self, energy, adaptation=None):
+        """
+        Update the noise floor with the energy of a non-voiced frame.
+
+        The floor follows decreases immediately and increases slowly.
+
+        Args:
+            energy (float): Energy of the frame.
+            adaptation (float, optional): Adaptation rate (the default one if not given).
+        """
+        if self.noise_floor is None or energy < self.noise_floor:
+            self.noise_floor = max(energy, 1e-10)
+        else:
+            rate = self.adaptation if adaptation is None else adaptation
+            self.noise_floor += rate * (energy - self.noise_floor)
+
+    def process(self, frame, position):
+        """
+        Process a new audio frame.
+
+        Args:
+            frame (numpy.ndarray): Mono audio frame.
+            position (int): Absolute position of the first sample of the frame.
+
+        Returns:
+            tuple: (onset, end) absolute positions of an accepted utterance which has
+                just ended (None if there is not any).
+        """
+        # Frame features
+        energy = float(np.dot(frame, frame)) / len(frame)
+        peak = float(np.abs(frame).max())
+        signs = np.signbit(frame)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) * self.sample_rate / len(frame)
+        if self.noise_floor is None:
+            self.update_noise_floor(energy)
+        voiced = (energy > self.noise_floor * self.energy_ratio
+                  and self.zcr_range[0] <= zcr <= self.zcr_range[1])
+        end = position + len(frame)
+        self.frames += 1
+
+        if self._speech_start is None:
+            if voiced:
+                # Candidate onset
+                if self._voiced_run == 0:
+                    self._candidate = position
+                    self._peak = 0.0
+                    self._energy = 0.0
+                self._voiced_run += 1
+                self._peak = max(self._peak, peak)
+                self._energy += energy
+                if self._voiced_run >= self.onset_frames:
+                    self._speech_start = self._candidate
+                    self._last_voiced = end
+            else:
+                # Too short to be speech (a click or a bump)
+                if self._voiced_run and self._peak > self.threshold:
+                    self.rejected += 1
+                elif not self._voiced_run and peak > self.threshold and not self._loud:
+                    self.rejected += 1
+                self._loud = peak > self.threshold
+                self._voiced_run = 0
+                self.update_noise_floor(energy)
+            return None
+
+        # Inside an utterance
+        self._peak = max(self._peak, peak)
+        self._energy += energy
+        self._voiced_run += 1
+        if voiced:
+            self._last_voiced = end
+        elif end - self._last_voiced >= self.hangover:
+            return self._close()
+        if end - self._speech_start >= self.max_length:
+            # Too long to be a command: it is background noise, raise the noise floor
+            self.update_noise_floor(self._energy / self._voiced_run, adaptation=1.0)
+            self._last_voiced = self._speech_start
+            return self._close()
+        return None
+
+    def _close(self):
+        """
+        Finish the current utterance.
+
+        Returns:
+            tuple: (onset, end) of the utterance if it is accepted (None otherwise).
+        """
+        onset, end = self._speech_start, self._last_voiced
+        self._speech_start = None
+        self._voiced_run = 0
+        self._loud = False
+        if self._peak <= self.threshold:
+            return None
+        if end - onset < self.min_length:
+            self.rejected += 1
+            return None
+        self.inferences += 1
+        return onset, end
+
+    def report(self):
+        """
+        Build a printable summary of the detector counters.
+
+        Returns:
+            str: The summary.
+        """
+        total = self.inferences + self.rejected
+        ratio = self.rejected / total if total else 0.0
+        return (f"VAD: {self.frames} frames, {self.inferences} inferences run, "
+                f"{self.rejected} rejected ({ratio:.0%}), noise floor {self.noise_floor or 0:.2e}")
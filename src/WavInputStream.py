@@ -0,0 +1,121 @@
+"""
+WavInputStream class
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import time
+import threading
+import numpy as np
+from math import gcd
+
+def read_wav(file_path, samplerate, channels=1):
+    """
+    Read a WAV file as float32 samples at a given sampling rate.
+
+    Args:
+        file_path (str): Path to the WAV file.
+        samplerate (int): Sampling rate of the returned samples.
+        channels (int): Number of channels of the returned samples (the recording is mixed down).
+
+    Returns:
+        numpy.ndarray: Samples (-1.0 to 1.0) with shape (samples, channels).
+    """
+    from scipy.io import wavfile
+    rate, data = wavfile.read(file_path)
+    if data.dtype == np.uint8:
+        data = (data.astype(np.float32) - 128) / 128
+    elif data.dtype.kind == 'i':
+        data = data.astype(np.float32) / np.iinfo(data.dtype).max
+    data = data.astype(np.float32).reshape((data.shape[0], -1))
+    data = np.repeat(data.mean(axis=1, keepdims=True), channels, axis=1)
+
+    # Match the requested sampling rate
+    if rate != samplerate:
+        from scipy.signal import resample_poly
+        factor = gcd(rate, samplerate)
+        data = resample_poly(data, samplerate // factor, rate // factor, axis=0).astype(np.float32)
+    return data
+
+
+class WavInputStream:
+    """
+    A replacement for 'sounddevice.InputStream' that replays a recorded WAV file.
+
+    This class delivers the audio of a WAV file to the same callback used by the
+    microphone stream, block by block and at the real-time pace of the recording,
+    so the speech commands classifier can be benchmarked without a microphone.
+    Once the recording is over, silence is delivered until the stream is stopped.
+
+    Attributes:
+        samplerate (int): Sampling rate of the delivered audio blocks.
+        blocksize (int): Number of samples of each delivered audio block.
+        channels (int): Number of channels of each delivered audio block.
+        callback: Function called with every new audio block.
+        data (numpy.ndarray): Resampled audio of the WAV file (float32, -1.0 to 1.0).
+        start_time (float): 'time.perf_counter' value when the replay started.
+    """
+
+    def __init__(self, file_path, callback, channels=1, samplerate=48000, blocksize=24000):
+        """
+        Initializes the WavInputStream class.
+
+        Args:
+            file_path (str): Path to the WAV file.
+            callback: Function called with every new audio block (sounddevice signature).
+            channels (int): Number of channels of each delivered audio block.
+            samplerate (int): Sampling rate of the delivered audio blocks.
+            blocksize (int): Number of samples of each delivered audio block.
+        """
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.start_time = None
+        self._thread = None
+        self._running = False
+
+        # Read the recording with the sampling rate of the original stream
+        self.data = read_wav(file_path, samplerate, channels)
+
+    def _replay(self):
+        """
+        Deliver the audio blocks to the callback at the real-time pace.
+        """
+        silence = np.zeros((self.blocksize, self.channels), dtype=np.float32)
+        self.start_time = time.perf_counter()
+        position = 0
+        while self._running:
+            # Wait until the block would have been completely recorded
+            position += self.blocksize
+            delay = self.start_time + position / self.samplerate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            block = self.data[position - self.blocksize:position]
+            if block.shape[0] < self.blocksize:
+                block = np.concatenate([block, silence[block.shape[0]:]], axis=0)
+            self.callback(block, self.blocksize, None, None)
+
+    def start(self):
+        """
+        Start the replay of the recording.
+        """
+        self._running = True
+        self._thread = threading.Thread(target=self._replay, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the replay of the recording.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        """
+        Release the stream (nothing to release for a recording).
+        """
+        self._thread = None
@@ -0,0 +1,8 @@
+"""
+Test configuration: the tests import the 'src' package from the repository root.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,69 @@
+"""
+Tests of the audio windows classified for each utterance.
+"""
+
+import numpy as np
+
+from src.AudioClassifier import AudioClassifier
+
+
+class FakeModel:
+    """
+    Speech model recording the batches it classifies.
+    """
+
+    labels = ['left', 'right']
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, audio_data):
+        self.batches.append(audio_data[None].copy())
+        return 'left', 1.0
+
+    def batch_scores(self, windows):
+        self.batches.append(windows.copy())
+        return np.tile([0.8, 0.2], (len(windows), 1))
+
+
+def classifier(written):
+    """
+    Create a classifier whose buffer holds 'written' samples (each sample is its own position).
+    """
+    audio_classifier = AudioClassifier(windows=3, window_spacing=0.15)
+    audio_classifier.audio_buffer.write(np.arange(written, dtype=np.float32))
+    audio_classifier.model = FakeModel()
+    return audio_classifier
+
+
+def window_starts(audio_classifier, onset, end):
+    out = np.empty((len(audio_classifier.window_shifts), audio_classifier.window_size), dtype=np.float32)
+    windows = audio_classifier.read_windows(onset, end, out)
+    return [int(window[0]) for window in windows.reshape((-1, audio_classifier.window_size))]
+
+
+def test_windows_in_the_buffer():
+    # Every shifted window is available: none of them is moved
+    assert window_starts(classifier(60000 - 12000), 30000, 34800) == [22000, 24400, 26800]
+
+
+def test_windows_past_the_buffer():
+    # Short word classified after the hangover: the windows are moved back together, keeping their spacing
+    assert window_starts(classifier(34800 + 4000), 30000, 34800) == [18000, 20400, 22800]
+
+
+def test_short_utterance_classifies_every_window():
+    # A 0.4 s word classified right after the 0.25 s hangover
+    onset, end = 30000, 30000 + 6400
+    audio_classifier = classifier(end + 4000)
+    windows = np.empty((3, audio_classifier.window_size), dtype=np.float32)
+    audio_classifier.detect_command(onset, end, windows)
+
+    batch, = audio_classifier.model.batches
+    assert batch.shape == (3, audio_classifier.window_size)
+    starts = batch[:, 0].astype(int).tolist()
+    assert len(set(starts)) == 3
+    assert np.diff(starts).tolist() == [2400, 2400]
+    assert batch[-1, -1] == end + 4000 - 1
+    assert audio_classifier.last_command.label == 'left'
+    assert np.isclose(audio_classifier.last_command.confidence, 0.8)
@@ -0,0 +1,25 @@
+"""
+Tests of the cursor output backends.
+"""
+
+import sys
+import types
+
+from src.CursorBackend import create_backend
+
+
+def test_pyautogui_double_click(monkeypatch):
+    calls = []
+    pyautogui = types.ModuleType('pyautogui')
+    pyautogui.doubleClick = lambda **kwargs: calls.append(('doubleClick', kwargs))
+    pyautogui.click = lambda **kwargs: calls.append(('click', kwargs))
+    monkeypatch.setitem(sys.modules, 'pyautogui', pyautogui)
+    backend = create_backend('pyautogui', screen_size=(800, 600))
+    backend.double_click('left')
+    assert calls == [('doubleClick', {'button': 'left', '_pause': False})]
+
+
+def test_recording_double_click():
+    backend = create_backend('recording')
+    backend.double_click('left')
+    assert [event[1:] for event in backend.events] == [('click', ('left', 2))]
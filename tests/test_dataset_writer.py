@@ -0,0 +1,49 @@
+"""
+Tests of the background writer of the dataset samples.
+
+OpenCV is replaced by a minimal fake module: 'imwrite' writes the raw bytes of the image,
+and fails (returning False) for the file names starting with 'bad'.
+"""
+
+import os
+import sys
+import csv
+import types
+import importlib
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def DatasetWriter(monkeypatch):
+    cv2 = types.ModuleType('cv2')
+
+    def imwrite(path, image):
+        if os.path.basename(path).startswith('bad'):
+            return False
+        with open(path, 'wb') as file:
+            file.write(image.tobytes())
+        return True
+
+    cv2.imwrite = imwrite
+    monkeypatch.setitem(sys.modules, 'cv2', cv2)
+    monkeypatch.delitem(sys.modules, 'src.DatasetWriter', raising=False)
+    return importlib.import_module('src.DatasetWriter').DatasetWriter
+
+
+def test_failed_samples_do_not_block_the_rows(DatasetWriter, tmp_path):
+    (tmp_path / 'images').mkdir()
+    writer = DatasetWriter(str(tmp_path), ['file', 'value'], workers=2, maxsize=4)
+    image = np.ones((4, 4, 3), dtype=np.uint8)
+    names = []
+    for i in range(20):
+        name = f'bad-{i}.jpg' if i == 3 else f'{i}.jpg'
+        writer.submit(name, None if i == 7 else image, [i])
+        names.append(name)
+    writer.close()
+
+    with open(tmp_path / 'data_info.csv', newline='') as file:
+        rows = list(csv.reader(file))[1:]
+    assert [row[0] for row in rows] == [name for i, name in enumerate(names) if i not in (3, 7)]
+    assert writer.written == 18 and writer.failed == 2
+    assert '2 failed' in writer.report()
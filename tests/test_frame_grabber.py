@@ -0,0 +1,80 @@
+"""
+Tests of the background camera frame grabber.
+
+OpenCV is replaced by a minimal fake module whose video capture records the threads that use it.
+"""
+
+import sys
+import time
+import types
+import threading
+import importlib
+import numpy as np
+import pytest
+
+
+class FakeCapture:
+    def __init__(self, source):
+        self.threads = set()
+        self.props = {}
+        self.reads = 0
+
+    def set(self, prop, value):
+        self.threads.add(threading.get_ident())
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+    def read(self, out=None):
+        self.threads.add(threading.get_ident())
+        self.reads += 1
+        time.sleep(0.002)
+        frame = np.zeros((4, 4, 3), dtype=np.uint8) if out is None else out
+        return True, frame
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def FrameGrabber(monkeypatch):
+    cv2 = types.ModuleType('cv2')
+    cv2.VideoCapture = FakeCapture
+    cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS, cv2.CAP_PROP_BUFFERSIZE = 3, 4, 5, 38
+    monkeypatch.setitem(sys.modules, 'cv2', cv2)
+    monkeypatch.delitem(sys.modules, 'src.FrameGrabber', raising=False)
+    return importlib.import_module('src.FrameGrabber').FrameGrabber
+
+
+def test_set_is_applied_on_the_grabber_thread(FrameGrabber):
+    grabber = FrameGrabber(0).start()
+    grabber.capture.threads.clear()
+    grabber.set(5, 15)
+    deadline = time.perf_counter() + 2
+    while grabber.capture.props.get(5) != 15 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    grabber.release()
+    assert grabber.capture.props[5] == 15
+    assert grabber.frame_interval == pytest.approx(1 / 15)
+    assert grabber.capture.threads == {grabber._thread.ident}
+
+
+def test_pause_stops_the_reads(FrameGrabber):
+    grabber = FrameGrabber(0).start()
+    time.sleep(0.05)
+    grabber.pause()
+    time.sleep(0.02)
+    reads = grabber.capture.reads
+    time.sleep(0.1)
+    assert grabber.capture.reads == reads
+    sequence = grabber.sequence
+    grabber.resume()
+    frame, _, _ = grabber.read(sequence, timeout=1)
+    assert frame is not None
+
+    # A paused grabber is still released
+    grabber.pause()
+    grabber.release()
+    assert not grabber._thread.is_alive()
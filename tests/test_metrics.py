@@ -0,0 +1,29 @@
+"""
+Tests of the Prometheus export of the runtime metrics.
+"""
+
+import pytest
+
+from src.Metrics import Metrics
+
+
+def test_labelled_counter():
+    metrics = Metrics()
+    metrics.gauge('frames_dropped', lambda: {'face_detection': 0, 'cursor_move': 3}, kind='counter', label='stage')
+    metrics.gauge('move_active', lambda: 1)
+    metrics.count('commands', 2)
+    metrics.record('frame', 0.0, 0.002)
+    lines = metrics.to_prometheus().splitlines()
+    assert 'handsfree_frames_dropped_total{stage="face_detection"} 0' in lines
+    assert 'handsfree_frames_dropped_total{stage="cursor_move"} 3' in lines
+    assert 'handsfree_move_active 1' in lines
+    assert 'handsfree_commands_total 2' in lines
+    assert 'handsfree_stage_seconds_count{stage="frame"} 1' in lines
+
+
+@pytest.mark.parametrize('value', [{'face_detection': 0}, None, 'fast', True])
+def test_non_numeric_value(value):
+    metrics = Metrics()
+    metrics.gauge('value', lambda: value)
+    with pytest.raises(TypeError):
+        metrics.to_prometheus()
@@ -0,0 +1,43 @@
+"""
+Tests of the staged vision pipeline.
+"""
+
+import time
+import threading
+
+from src.Pipeline import Pipeline
+
+
+def test_stage_error_stops_the_pipeline(capsys):
+    finished = threading.Event()
+    pipeline = Pipeline(on_finish=finished.set)
+
+    def fail(data):
+        raise ValueError('broken stage')
+
+    pipeline.add_stage('source', lambda: (time.perf_counter(), 1))
+    pipeline.add_stage('broken', fail)
+    pipeline.add_stage('sink', lambda data: data)
+    pipeline.start()
+
+    assert finished.wait(timeout=5)
+    pipeline.stop()
+    assert not any(stage.thread.is_alive() for stage in pipeline.stages)
+    assert pipeline.error[0] == 'broken'
+    assert isinstance(pipeline.error[1], ValueError)
+    assert "The 'broken' stage failed" in capsys.readouterr().out
+
+
+def test_source_error_stops_the_pipeline(capsys):
+    pipeline = Pipeline()
+
+    def fail():
+        raise RuntimeError('camera lost')
+
+    pipeline.add_stage('source', fail)
+    pipeline.add_stage('sink', lambda data: data)
+    pipeline.start()
+
+    assert pipeline.finished.wait(timeout=5)
+    pipeline.stop()
+    assert pipeline.error[0] == 'source'
@@ -0,0 +1,77 @@
+"""
+Tests of the speech commands classification backends.
+
+The libraries of the backends (PyTorch, Transformers and ONNX Runtime) are replaced by
+minimal fake modules, so every backend is constructed without the models or the libraries.
+"""
+
+import os
+import sys
+import json
+import types
+import numpy as np
+import pytest
+
+from src.KeywordSpotter import KeywordSpotter
+from src.SpeechBackend import BACKENDS, create_backend
+
+LABELS = ['down', 'go', 'left', 'right']
+
+
+class FakeModel:
+    def __init__(self):
+        self.config = types.SimpleNamespace(id2label=dict(enumerate(LABELS)))
+
+    def eval(self):
+        return self
+
+
+class FakeSession:
+    def __init__(self, path, options, providers):
+        self.path = path
+
+    def get_inputs(self):
+        return [types.SimpleNamespace(name='input_values')]
+
+
+@pytest.fixture
+def fake_libraries(monkeypatch):
+    torch = types.ModuleType('torch')
+    torch.set_num_threads = lambda threads: None
+    transformers = types.ModuleType('transformers')
+    transformers.pipeline = lambda task, model: types.SimpleNamespace(model=FakeModel())
+    transformers.AutoModelForAudioClassification = types.SimpleNamespace(from_pretrained=lambda path: FakeModel())
+    onnxruntime = types.ModuleType('onnxruntime')
+    onnxruntime.SessionOptions = types.SimpleNamespace
+    onnxruntime.InferenceSession = FakeSession
+    for module in (torch, transformers, onnxruntime):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+
+
+@pytest.fixture
+def model_paths(tmp_path):
+    # Transformers model directory (with the exported ONNX models)
+    model_dir = tmp_path / 'speech_commands_model'
+    model_dir.mkdir()
+    (model_dir / 'config.json').write_text(json.dumps({'id2label': {str(i): label for i, label in enumerate(LABELS)}}))
+    (model_dir / 'preprocessor_config.json').write_text(json.dumps({'do_normalize': True}))
+    for file_name in ('model.onnx', 'model_int8.onnx'):
+        (model_dir / file_name).write_bytes(b'')
+
+    # Keyword spotter archive
+    spotter = KeywordSpotter(LABELS, np.zeros(117), np.ones(117), np.zeros((len(LABELS), 117)), np.zeros(len(LABELS)))
+    spotter.save(str(tmp_path / 'keyword_spotter.npz'))
+    return {'model': str(model_dir), 'kws': str(tmp_path / 'keyword_spotter.npz')}
+
+
+@pytest.mark.parametrize('name', list(BACKENDS))
+def test_create_every_backend(name, fake_libraries, model_paths):
+    backend = create_backend(name, model_paths['kws' if name == 'kws' else 'model'], threads=1)
+    assert isinstance(backend, BACKENDS[name])
+    assert list(backend.labels) == LABELS
+    assert callable(backend.batch_scores)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_backend('unknown')
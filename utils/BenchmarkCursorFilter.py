@@ -0,0 +1,143 @@
+"""
+Benchmark Cursor Filter Script
+
+This script compares the cursor position filters ('none', 'mean', 'one_euro' and 'kalman')
+on recorded cursor trajectories: jitter (RMS of the second difference of the position),
+added lag (time shift that best aligns the filtered trajectory with the raw one), error
+(RMS distance to the raw trajectory) and time per update.
+
+By default, the trajectories are the cursor paths produced by the cursor movement model
+on the recorded dataset sessions, at 30 fps. The dataset store is read as it is
+('DatasetStore.open()', which loads the session CSV files when the store is not built);
+it is built or extended with the new sessions by utils/CreateDataset.py.
+Other trajectories can be given as CSV files with 'time,x,y' columns (normalized positions),
+and detector noise can be simulated with '--noise'.
+
+Usage (from the project directory):
+    python utils/BenchmarkCursorFilter.py --noise 3
+    python utils/BenchmarkCursorFilter.py --trajectory eyes.csv --filter_params "kalman:lead=0.03"
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.CursorFilter import FILTERS, create_filter, parse_params
+from src.LinearModel import LinearModel
+from src.DatasetStore import DatasetStore
+
+def dataset_trajectories(fps=30, speed=2):
+    """
+    Build the cursor trajectories of the recorded dataset sessions.
+
+    Args:
+        fps (float): Frame rate of the trajectories.
+        speed (int): Cursor speed (as set by the 'one', 'two' and 'three' commands).
+
+    Returns:
+        list: (name, times, positions, screen size) tuples.
+    """
+    with open(os.path.join('models', 'cursor_movement_model.pkl'), 'rb') as f:
+        model = LinearModel.from_sklearn(pickle.load(f))
+    movement = np.array([[0, 0], [0, -1], [-1, -1], [-1, 0],
+                         [-1, 1], [0, 1], [1, 1], [1, 0], [1, -1]])
+
+    store = DatasetStore.open()
+    trajectories = []
+    for session in store.index['sessions']:
+        screen_size = np.array([session['info']['screen_width'], session['info']['screen_height']])
+        features = store.features(slice(session['start'], session['stop']))
+
+        # Integrate the predicted movements as FacePosition.move_cursor does
+        location = np.array([0.5, 0.5])
+        positions = np.empty((len(features), 2))
+        for i, sample in enumerate(features):
+            location += movement[model.predict(sample)] * 10 * speed / screen_size
+            location[location >= 1] = 0.999
+            location[location <= 0] = 0.001
+            positions[i] = location
+        name = os.path.join(session['subject'], session['name'])
+        trajectories.append((name, np.arange(len(positions)) / fps, positions, screen_size))
+    return trajectories
+
+
+def file_trajectory(file_path, screen_size):
+    """
+    Load a recorded trajectory.
+
+    Args:
+        file_path (str): CSV file with 'time,x,y' columns (normalized positions).
+        screen_size (numpy.ndarray): Screen size in pixels.
+
+    Returns:
+        tuple: (name, times, positions, screen size).
+    """
+    data = np.loadtxt(file_path, delimiter=',', skiprows=1)
+    return os.path.basename(file_path), data[:, 0], data[:, 1:3], screen_size
+
+
+def evaluate(cursor_filter, times, positions, screen_size, max_shift=30):
+    """
+    Filter a trajectory and measure its jitter, lag and error.
+
+    Args:
+        cursor_filter: The cursor position filter.
+        times (numpy.ndarray): Time of each position, in seconds.
+        positions (numpy.ndarray): Raw positions (normalized).
+        screen_size (numpy.ndarray): Screen size in pixels.
+        max_shift (int): Maximum lag searched, in samples.
+
+    Returns:
+        dict: Jitter (px), lag (ms), error (px) and time per update (us).
+    """
+    cursor_filter.reset()
+    filtered = np.empty_like(positions)
+    start = time.perf_counter()
+    for i in range(len(positions)):
+        filtered[i] = cursor_filter(positions[i], times[i])
+    update_time = (time.perf_counter() - start) / len(positions)
+
+    raw, filtered = positions * screen_size, filtered * screen_size
+    jitter = np.sqrt(np.mean(np.sum(np.diff(filtered, n=2, axis=0) ** 2, axis=1)))
+    errors = [np.sqrt(np.mean(np.sum((filtered[shift:] - raw[:len(raw) - shift]) ** 2, axis=1)))
+              for shift in range(max_shift)]
+    lag = int(np.argmin(errors)) * np.median(np.diff(times))
+    return {'jitter': jitter, 'lag': lag * 1000, 'error': errors[0], 'time': update_time * 1e6}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trajectory', type=str, nargs='*', default=None,
+                        help="CSV trajectories with 'time,x,y' columns (the dataset ones if not given)")
+    parser.add_argument('--screen', type=int, nargs=2, default=[1920, 1080], help="Screen size of the CSV trajectories")
+    parser.add_argument('--filters', type=str, nargs='+', default=list(FILTERS), help="Filters to compare")
+    parser.add_argument('--filter_params', type=str, nargs='*', default=[],
+                        help="Filter parameters, e.g. 'one_euro:min_cutoff=1.0,beta=0.5'")
+    parser.add_argument('--noise', type=float, default=0.0, help="Standard deviation of the added detector noise (px)")
+    args = parser.parse_args()
+
+    if args.trajectory:
+        trajectories = [file_trajectory(path, np.array(args.screen)) for path in args.trajectory]
+    else:
+        trajectories = dataset_trajectories()
+    params = {}
+    for item in args.filter_params:
+        name, _, text = item.partition(':')
+        params[name] = parse_params(text)
+
+    rng = np.random.default_rng(0)
+    print(f"\n{'filter':<10}{'jitter [px]':>13}{'lag [ms]':>10}{'error [px]':>12}{'update [us]':>13}")
+    for name in args.filters:
+        results = []
+        for _, times, positions, screen_size in trajectories:
+            noisy = positions + rng.standard_normal(positions.shape) * args.noise / screen_size
+            results.append(evaluate(create_filter(name, **params.get(name, {})), times, noisy, screen_size))
+        mean = {key: np.mean([result[key] for result in results]) for key in results[0]}
+        print(f"{name:<10}{mean['jitter']:>13.2f}{mean['lag']:>10.1f}{mean['error']:>12.2f}{mean['time']:>13.2f}")
@@ -0,0 +1,187 @@
+"""
+Benchmark Speech Model Script
+
+This script compares the speech commands classification backends of the AudioClassifier
+('pipeline', 'torch', 'onnx', 'int8' and 'kws'): load time, memory (resident set size added by the backend),
+per-call latency, and accuracy on a folder of labeled WAV clips. Each backend runs in its
+own process, so the memory and load time of one backend do not affect the others.
+The multi-window classification of the AudioClassifier ('--windows' time-shifted windows of
+each clip in a single batch, with their probabilities averaged) is measured too.
+
+The labeled clips are organized as in the Speech Commands dataset: <data>/<label>/*.wav.
+Without clips, random noise windows are used (only the time and memory are meaningful).
+
+Usage (from the project directory):
+    python utils/BenchmarkSpeechModel.py --data path/to/clips --backends pipeline torch onnx int8 kws
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.SpeechBackend import create_backend
+from src.WavInputStream import read_wav
+
+def rss_mb():
+    """
+    Read the resident set size of the current process.
+
+    Returns:
+        float: Resident set size in MB.
+    """
+    try:
+        with open('/proc/self/status', 'r') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import psutil
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def load_clips(data_path, limit):
+    """
+    Load the labeled clips as 1 s windows at 16 kHz.
+
+    Args:
+        data_path (str): Path to the clips folder (None for random noise windows).
+        limit (int): Maximum number of clips per label.
+
+    Returns:
+        list: (label, audio window) tuples.
+    """
+    if data_path is None:
+        rng = np.random.default_rng(0)
+        return [(None, (0.1 * rng.standard_normal(16000)).astype(np.float32)) for _ in range(limit)]
+
+    clips = []
+    for label in sorted(os.listdir(data_path)):
+        folder = os.path.join(data_path, label)
+        if not os.path.isdir(folder):
+            continue
+        for file_name in sorted(os.listdir(folder))[:limit]:
+            audio = read_wav(os.path.join(folder, file_name), 16000)[:, 0]
+            window = np.zeros(16000, dtype=np.float32)
+            start = max(0, (len(audio) - 16000) // 2)
+            audio = audio[start:start + 16000]
+            window[:len(audio)] = audio
+            clips.append((label, window))
+    return clips
+
+
+def benchmark_backend(name, clips, repeat, windows=3, spacing=0.15):
+    """
+    Benchmark one backend in the current process.
+
+    Args:
+        name (str): Name of the backend.
+        clips (list): (label, audio window) tuples.
+        repeat (int): Number of times each clip is classified.
+        windows (int): Number of time-shifted windows of the multi-window classification.
+        spacing (float): Time between the shifted windows, in seconds.
+
+    Returns:
+        dict: Load time, memory, latency percentiles, predictions and accuracy (single and multi-window).
+    """
+    rss = rss_mb()
+    start = time.perf_counter()
+    backend = create_backend(name)
+    load_time = time.perf_counter() - start
+    memory = rss_mb() - rss
+
+    # Warm up, then measure every call
+    backend(clips[0][1])
+    latencies = []
+    predictions = []
+    for _, audio in clips:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            prediction = backend(audio)
+            latencies.append(time.perf_counter() - start)
+        predictions.append(prediction)
+
+    # Multi-window classification: shifted windows of each clip, in a single batch
+    shifts = [int(round((i - (windows - 1) / 2) * spacing * 16000)) for i in range(windows)]
+    margin = max(abs(shift) for shift in shifts)
+    batch_latencies = []
+    batch_predictions = []
+    for _, audio in clips:
+        padded = np.pad(audio, margin)
+        batch = np.stack([padded[margin + shift:margin + shift + len(audio)] for shift in shifts])
+        for _ in range(repeat):
+            start = time.perf_counter()
+            probabilities = backend.batch_scores(batch).mean(axis=0)
+            batch_latencies.append(time.perf_counter() - start)
+        batch_predictions.append(backend.labels[int(probabilities.argmax())])
+
+    def accuracy_of(predictions):
+        labeled = [(label, prediction) for (label, _), prediction in zip(clips, predictions) if label is not None]
+        return np.mean([label == prediction for label, prediction in labeled]) if labeled else None
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {'load_time': load_time, 'memory': memory, 'p50': p50, 'p95': p95, 'p99': p99,
+            'accuracy': accuracy_of(predictions), 'predictions': predictions,
+            'batch_p50': np.percentile(np.array(batch_latencies) * 1000, 50),
+            'batch_accuracy': accuracy_of(batch_predictions)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--backends', type=str, nargs='+', default=['pipeline', 'torch', 'onnx', 'int8', 'kws'],
+                        help="Backends to compare")
+    parser.add_argument('--data', type=str, default=None, help="Folder of labeled WAV clips (<data>/<label>/*.wav)")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum number of clips per label")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of times each clip is classified")
+    parser.add_argument('--windows', type=int, default=3, help="Number of windows of the multi-window classification")
+    parser.add_argument('--spacing', type=float, default=0.15, help="Time between the shifted windows, in seconds")
+    parser.add_argument('--worker', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        # Benchmark a single backend and send the results to the parent process
+        clips = load_clips(args.data, args.limit)
+        print(json.dumps(benchmark_backend(args.worker, clips, args.repeat, args.windows, args.spacing)))
+        sys.exit(0)
+
+    results = {}
+    for name in args.backends:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', name,
+                   '--limit', str(args.limit), '--repeat', str(args.repeat),
+                   '--windows', str(args.windows), '--spacing', str(args.spacing)]
+        if args.data is not None:
+            command += ['--data', args.data]
+        process = subprocess.run(command, capture_output=True, text=True)
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()
+            print(f"Backend '{name}' failed:\n{error[-1] if error else f'exit code {process.returncode}'}")
+            continue
+        results[name] = json.loads(process.stdout.strip().splitlines()[-1])
+
+    # Agreement with the reference pipeline
+    reference = results.get('pipeline', {}).get('predictions')
+    print(f"\n{'backend':<10}{'load [s]':>10}{'memory [MB]':>13}{'p50 [ms]':>10}{'p95 [ms]':>10}"
+          f"{'p99 [ms]':>10}{'accuracy':>10}{'agreement':>11}{'batch [ms]':>12}{'batch acc':>11}")
+    for name, result in results.items():
+        accuracy = '-' if result['accuracy'] is None else f"{result['accuracy']:.1%}"
+        batch_accuracy = '-' if result['batch_accuracy'] is None else f"{result['batch_accuracy']:.1%}"
+        agreement = '-'
+        if reference is not None:
+            agreement = f"{np.mean([a == b for a, b in zip(reference, result['predictions'])]):.1%}"
+        print(f"{name:<10}{result['load_time']:>10.2f}{result['memory']:>13.1f}{result['p50']:>10.2f}"
+              f"{result['p95']:>10.2f}{result['p99']:>10.2f}{accuracy:>10}{agreement:>11}"
+              f"{result['batch_p50']:>12.2f}{batch_accuracy:>11}")
+
+    # Per-call overhead of the Transformers pipeline, removed by the direct forward pass
+    if 'pipeline' in results and 'torch' in results:
+        overhead = results['pipeline']['p50'] - results['torch']['p50']
+        print(f"\nPipeline overhead removed by the direct forward pass: {overhead:.2f} ms per call "
+              f"({overhead / results['pipeline']['p50']:.0%} of the p50 latency)")
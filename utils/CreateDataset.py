@@ -5,12 +5,16 @@ This script captures camera images for different head positions. It uses OpenCV
 mediapipe libraries to detect faces in real time. Captured images and relevant data are
 saved in folders, and a JSON file contains information about the capture session.
 
+The captured samples are written while the capture is running (images encoded by a pool
+of background threads, CSV rows appended as they are written), so the memory does not
+grow with the length of the session and there is no final wait.
+
 Author: HenryAreiza
 Date: 06/09/2023
 """
 
 import os
-import csv
+import sys
 import cv2
 import json
 import datetime
@@ -18,6 +22,18 @@ import pyautogui
 import mediapipe as mp
 from pynput.mouse import Listener, Button
 
+try:
+    from src.FrameGrabber import FrameGrabber
+    from src.FaceFeatures import FaceFeatures
+    from src.DatasetWriter import DatasetWriter
+    from src.DatasetStore import DatasetStore
+except ModuleNotFoundError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.FrameGrabber import FrameGrabber
+    from src.FaceFeatures import FaceFeatures
+    from src.DatasetWriter import DatasetWriter
+    from src.DatasetStore import DatasetStore
+
 class CreateDataset:
     """
     A class for creating the dataset used to train the FacePosition AI model.
@@ -32,13 +48,10 @@ class CreateDataset:
         IMGS_PATH (str): Path to the folder where captured images are saved.
         face_detection: An instance of the MediaPipe Face Detection component.
         drawing: An instance of MediaPipe's drawing utilities.
-        faces_history (list): A list to store captured face images.
-        location_history (list): A list to store face bounding box locations.
-        keypoints_history (list): A list to store relative keypoints of the detected face.
-        labels_history (list): A list to store labels for captured images.
+        HEADER (list): Header of the CSV file.
+        writer (DatasetWriter): Background writer of the captured samples (created when the capture starts).
         face_capture: The currently captured face image.
-        location: The bounding box location of the detected face.
-        keypoints: Relative keypoints of the detected face.
+        face_features (FaceFeatures): Bounding box location and relative keypoints of the detected face.
         im_width (int): Width of the camera frame.
         im_height (int): Height of the camera frame.
         im_depth (int): Depth of the camera frame.
@@ -47,8 +60,13 @@ class CreateDataset:
         counter (int): A counter to track the number of captured images.
         limit (int): The maximum number of images to capture for each label.
         labels (list): A list of label names corresponding to head positions.
+        capture (FrameGrabber): The camera frame grabber.
+        sequence (int): Sequence number of the last captured frame.
     """
-    
+
+    HEADER = ['file_name', 'ref_x', 'ref_y', 'ref_w', 'ref_h', 'kpt1_x', 'kpt1_y', 'kpt2_x', 'kpt2_y',
+              'kpt3_x', 'kpt3_y', 'kpt4_x', 'kpt4_y', 'kpt5_x', 'kpt5_y', 'kpt6_x', 'kpt6_y', 'label']
+
     def __init__(self):
         """
         Initializes the CreateDataset class.
@@ -64,14 +82,10 @@ class CreateDataset:
         self.face_detection = mp.solutions.face_detection
         self.drawing = mp.solutions.drawing_utils
 
-        # Initialize data lists
-        self.faces_history = []
-        self.location_history = []
-        self.keypoints_history = []
-        self.labels_history = []
+        # Initialize the capture data
+        self.writer = None
         self.face_capture = None
-        self.location = None
-        self.keypoints = None
+        self.face_features = FaceFeatures()
         self.im_width = 0
         self.im_height = 0
         self.im_depth = 0
@@ -81,6 +95,8 @@ class CreateDataset:
         self.limit = 10
         self.labels = ['center', 'up', 'left/up', 'left', 'left/down',
                        'down', 'right/down', 'right', 'right/up']
+        self.capture = None
+        self.sequence = 0
 
     def on_click(self, _, __, button, pressed):
         """
@@ -100,39 +116,21 @@ class CreateDataset:
 
     def capture_camera_image(self):
         """
-        Captures an image from the camera and returns it.
+        Waits for a new image from the camera and returns it.
 
         Returns:
             numpy.ndarray: The captured camera image.
         """
-        _, frame = self.capture.read()
+        frame, _, self.sequence = self.capture.read(self.sequence)
         return frame
 
-    def save_csv(self):
-        """
-        Saves the location history, keypoints history, and label into a CSV file.
-        """
-        header = ['file_name', 'ref_x', 'ref_y', 'ref_w', 'ref_h', 'kpt1_x', 'kpt1_y', 'kpt2_x', 'kpt2_y',
-                  'kpt3_x', 'kpt3_y', 'kpt4_x', 'kpt4_y', 'kpt5_x', 'kpt5_y', 'kpt6_x', 'kpt6_y', 'label']
-        data = []
-        for location, keypoints, label in zip(self.location_history, self.keypoints_history, self.labels_history):
-            name = [f'{label}-{self.counter}.jpg']
-            data.append(name + location + keypoints + [label])
-            self.counter += 1
-            if self.counter >= self.limit:
-                self.counter = 0
-        with open(os.path.join(self.FOLDER_PATH, 'data_info.csv'), 'w', newline='') as csvfile:
-            csv_writer = csv.writer(csvfile)
-            csv_writer.writerow(header)
-            csv_writer.writerows(data)
-
     def save_json(self):
         """
         Saves relevant data as JSON, including image count, date, and screen size.
         """
         screen_size = pyautogui.size()
         data_info = {
-            'images': len(self.location_history),
+            'images': self.writer.written,
             'date': self.FOLDER_PATH[-19:],
             'screen_width': screen_size.width,
             'screen_height': screen_size.height,
@@ -143,17 +141,6 @@ class CreateDataset:
         with open(os.path.join(self.FOLDER_PATH, 'data_info.json'), 'w') as json_file:
             json.dump(data_info, json_file, indent=4)
 
-    def save_image(self, image, prefix):
-        """
-        Saves the captured image to a file.
-
-        Args:
-            image (numpy.ndarray): The captured image.
-            prefix (str): The filename prefix for the saved image.
-        """
-        file_name = f"{prefix}.jpg"
-        cv2.imwrite(os.path.join(self.IMGS_PATH, file_name), image)
-
     def run(self):
         """
         Main loop for capturing and processing camera images.
@@ -165,8 +152,9 @@ class CreateDataset:
         # Create a face detection object
         face_detection = self.face_detection.FaceDetection(min_detection_confidence=0.5)
 
-        # Open the video capture
-        self.capture = cv2.VideoCapture(0)
+        # Start grabbing frames from the camera, and writing the captured samples
+        self.capture = FrameGrabber(0).start()
+        self.writer = DatasetWriter(self.FOLDER_PATH, self.HEADER, images_path=self.IMGS_PATH)
 
         print(f'\nClick to start {self.labels[self.label]} acquisition.')
         while True:
@@ -182,21 +170,14 @@ class CreateDataset:
 
             # Read the reference and landmarks from the detected face
             if results.detections:
-                for detection in results.detections:                    
-                    self.location = [detection.location_data.relative_bounding_box.xmin,
-                                     detection.location_data.relative_bounding_box.ymin,
-                                     detection.location_data.relative_bounding_box.width,
-                                     detection.location_data.relative_bounding_box.height]
-                    
-                    self.keypoints = []
-                    for key_point in detection.location_data.relative_keypoints:
-                        self.keypoints.append(key_point.x)
-                        self.keypoints.append(key_point.y)
-                    
-                    x = int(self.location[0] * self.im_width)
-                    y = int(self.location[1] * self.im_height)
-                    w = int(self.location[2] * self.im_width)
-                    h = int(self.location[3] * self.im_height)
+                for detection in results.detections:
+                    self.face_features.read(detection)
+                    location = self.face_features.reference.ravel()
+
+                    x = int(location[0] * self.im_width)
+                    y = int(location[1] * self.im_height)
+                    w = int(location[2] * self.im_width)
+                    h = int(location[3] * self.im_height)
                     self.face_capture = frame[y:y+h, x:x+w].copy()
 
                     self.drawing.draw_detection(frame, detection)
@@ -204,10 +185,9 @@ class CreateDataset:
 
             # Save the reference and landmarks from the detected face
             if self.flag:
-                self.faces_history.append(self.face_capture)
-                self.location_history.append(self.location)
-                self.keypoints_history.append(self.keypoints)
-                self.labels_history.append(self.label)
+                self.writer.submit(f'{self.label}-{self.counter}.jpg', self.face_capture,
+                                   self.face_features.reference.ravel().tolist()
+                                   + self.face_features.keypoints.ravel().tolist() + [self.label])
                 self.counter += 1
                 if self.counter >= self.limit:
                     self.counter = 0
@@ -232,18 +212,18 @@ class CreateDataset:
         self.capture.release()
         cv2.destroyAllWindows()
 
-        self.save_csv()
-        print('\nCSV file saved!')
+        # Write the samples still queued
+        self.writer.close()
+        print(f'\n{self.writer.report()}')
 
         self.save_json()
-        print('JSON file saved!')
-
-        for i, image in enumerate(self.faces_history):
-            self.save_image(image, f'{self.labels_history[i]}-{self.counter}')
-            self.counter += 1
-            if self.counter >= self.limit:
-                self.counter = 0
-        print('Images saved!\n')
+        print('JSON file saved!\n')
+
+        # Append the session to the dataset store (if it is used)
+        store = DatasetStore()
+        if store.index['sessions']:
+            store.append(self.FOLDER_PATH)
+            print(f'Session appended to the dataset store ({len(store)} samples).\n')
 
 
 if __name__ == "__main__":
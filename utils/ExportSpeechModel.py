@@ -0,0 +1,80 @@
+"""
+Export Speech Model Script
+
+This script exports the speech commands classification model ('models/speech_commands_model')
+to ONNX ('model.onnx'), and writes a dynamically quantized int8 version of it ('model_int8.onnx')
+next to the original model. Both files can be used by the AudioClassifier through the 'onnx'
+and 'int8' backends, which only need ONNX Runtime at run time.
+
+Requirements: torch, transformers, onnx and onnxruntime.
+
+Usage (from the project directory):
+    python utils/ExportSpeechModel.py
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import argparse
+import torch
+from transformers import AutoModelForAudioClassification
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+class LogitsModel(torch.nn.Module):
+    """
+    Wrapper returning only the logits of the classification model (a plain tensor output for ONNX).
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_values):
+        return self.model(input_values).logits
+
+
+def export_onnx(model_path, onnx_path):
+    """
+    Export the classification model to ONNX.
+
+    Args:
+        model_path (str): Path to the pretrained model directory.
+        onnx_path (str): Path to the exported ONNX model.
+    """
+    model = AutoModelForAudioClassification.from_pretrained(model_path)
+    model.eval()
+    dummy_input = torch.zeros((1, 16000), dtype=torch.float32)
+    with torch.no_grad():
+        torch.onnx.export(LogitsModel(model), (dummy_input,), onnx_path,
+                          input_names=['input_values'], output_names=['logits'],
+                          dynamic_axes={'input_values': {0: 'batch', 1: 'samples'}, 'logits': {0: 'batch'}},
+                          opset_version=14)
+
+
+def quantize_onnx(onnx_path, int8_path):
+    """
+    Write a dynamically quantized (int8 weights) version of an ONNX model.
+
+    Args:
+        onnx_path (str): Path to the fp32 ONNX model.
+        int8_path (str): Path to the quantized ONNX model.
+    """
+    quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model_path', type=str, default=os.path.join('models', 'speech_commands_model'),
+                        help="Path to the pretrained model directory")
+    parser.add_argument('--int8', type=int, default=1, help="Write the quantized model too (1 (true)/ 0 (false))")
+    args = parser.parse_args()
+
+    onnx_path = os.path.join(args.model_path, 'model.onnx')
+    export_onnx(args.model_path, onnx_path)
+    print(f'ONNX model saved in {onnx_path}')
+
+    if args.int8:
+        int8_path = os.path.join(args.model_path, 'model_int8.onnx')
+        quantize_onnx(onnx_path, int8_path)
+        print(f'Quantized model saved in {int8_path}')
@@ -0,0 +1,128 @@
+"""
+Train Keyword Spotter Script
+
+This script trains the lightweight MFCC keyword spotter used by the 'kws' speech backend
+of the AudioClassifier. The training clips are 1 s WAV files organized by label, as in the
+Speech Commands dataset: <data>/<label>/*.wav (labels out of the vocabulary, such as
+'_unknown_', are detected as 'unknown' commands). New clips can be recorded from the
+microphone with the '--record' option.
+
+Usage (from the project directory):
+    python utils/TrainKeywordSpotter.py --data data/speech --record left --count 20
+    python utils/TrainKeywordSpotter.py --data data/speech
+
+Author: HenryAreiza
+Date: 18/10/2026
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from scipy.io import wavfile
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.KeywordSpotter import KeywordSpotter, MfccExtractor
+from src.WavInputStream import read_wav
+
+def record_clips(data_path, label, count):
+    """
+    Record 1 s clips of a command from the microphone.
+
+    Args:
+        data_path (str): Path to the clips folder.
+        label (str): The recorded command.
+        count (int): Number of clips.
+    """
+    import sounddevice as sd
+    folder = os.path.join(data_path, label)
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        input(f"Press Enter and say '{label}' ({i + 1}/{count})...")
+        audio = sd.rec(16000, samplerate=16000, channels=1, dtype='int16')
+        sd.wait()
+        wavfile.write(os.path.join(folder, f'{time.strftime("%Y_%m_%d-%H_%M_%S")}-{i}.wav'), 16000, audio)
+
+
+def load_dataset(data_path):
+    """
+    Load the clips as 1 s windows at 16 kHz.
+
+    Args:
+        data_path (str): Path to the clips folder.
+
+    Returns:
+        tuple: Window matrix, label vector and list of labels.
+    """
+    labels = sorted(label for label in os.listdir(data_path) if os.path.isdir(os.path.join(data_path, label)))
+    windows, targets = [], []
+    for index, label in enumerate(labels):
+        folder = os.path.join(data_path, label)
+        for file_name in sorted(os.listdir(folder)):
+            audio = read_wav(os.path.join(folder, file_name), 16000)[:16000, 0]
+            window = np.zeros(16000, dtype=np.float32)
+            window[:len(audio)] = audio
+            windows.append(window)
+            targets.append(index)
+    return np.array(windows), np.array(targets), labels
+
+
+def extract_features(windows, targets, extractor, shifts=(0,)):
+    """
+    Compute the feature vectors of the windows (and of their time-shifted copies).
+
+    Args:
+        windows (numpy.ndarray): Window matrix.
+        targets (numpy.ndarray): Label vector.
+        extractor (MfccExtractor): The feature extractor.
+        shifts (tuple): Time shifts (in samples) applied to each window.
+
+    Returns:
+        tuple: Feature matrix and label vector.
+    """
+    features = np.array([extractor(np.roll(window, shift)) for window in windows for shift in shifts])
+    return features, np.repeat(targets, len(shifts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', type=str, required=True, help="Folder of labeled WAV clips (<data>/<label>/*.wav)")
+    parser.add_argument('--output', type=str, default=os.path.join('models', 'keyword_spotter.npz'),
+                        help="Path to the trained keyword spotter")
+    parser.add_argument('--record', type=str, default=None, help="Record new clips of this command")
+    parser.add_argument('--count', type=int, default=20, help="Number of recorded clips")
+    args = parser.parse_args()
+
+    if args.record is not None:
+        record_clips(args.data, args.record, args.count)
+        sys.exit(0)
+
+    windows, targets, labels = load_dataset(args.data)
+    print(f'{len(windows)} clips, {len(labels)} labels: {labels}')
+    W_train, W_test, y_train, y_test = train_test_split(windows, targets, test_size=0.2,
+                                                        random_state=69, stratify=targets)
+
+    # Feature extraction (with +-100 ms shifted copies of the training clips as augmentation)
+    extractor = MfccExtractor()
+    X_train, y_train = extract_features(W_train, y_train, extractor, shifts=(0, -1600, 1600))
+    X_test, y_test = extract_features(W_test, y_test, extractor)
+
+    # Standardization and linear model
+    mean = X_train.mean(axis=0)
+    scale = X_train.std(axis=0) + 1e-6
+    model = LogisticRegression(C=1.0, max_iter=5000)
+    model.fit((X_train - mean) / scale, y_train)
+    print(f'Train accuracy: {model.score((X_train - mean) / scale, y_train):.1%}')
+    print(f'Test accuracy: {model.score((X_test - mean) / scale, y_test):.1%}')
+
+    # A binary model only has the weights of the second class: write them as a two-class softmax
+    coef, intercept = model.coef_, model.intercept_
+    if coef.shape[0] == 1:
+        coef, intercept = np.vstack([-coef / 2, coef / 2]), np.hstack([-intercept / 2, intercept / 2])
+
+    spotter = KeywordSpotter([labels[i] for i in model.classes_], mean, scale, coef, intercept, extractor.segments)
+    spotter.save(args.output)
+    print(f'Keyword spotter saved in {args.output}')
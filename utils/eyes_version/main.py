@@ -1,14 +1,21 @@
 import os
+import sys
 import cv2
+import time
 import pickle
+import argparse
 import threading
 import pyautogui
 import numpy as np
 from Cursor import Cursor
 from Preprocessor import Preprocessor
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.CursorFilter import create_filter, parse_params
+
 
 inputs = [None, None, True]
+cursor_filter = None
 def move_cursor():
     # Getting back the eyes model:
     with open(os.path.join('models', 'eyes_model', 'model-20230906_084133.pkl'), 'rb') as f:
@@ -21,8 +28,6 @@ def move_cursor():
     # Create an instance of the Cursor class
     cursor = Cursor()
 
-    predictions = np.zeros((5,2))
-
     print('\nCursor control started...\n')
     while inputs[2]:
         if inputs[0] is not None:
@@ -41,12 +46,18 @@ def move_cursor():
             prediction[prediction>=1] = 0.999
             prediction[prediction<=0] = 0.001
 
-            predictions[:-1] = predictions[1:]
-            predictions[-1] = prediction[0]
-            cursor.move(*predictions.mean(axis=0))
+            cursor.move(*cursor_filter(prediction[0], time.perf_counter()))
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cursor_filter', type=str, default='mean',
+                        help="Cursor position filter (none, mean, one_euro or kalman)")
+    parser.add_argument('--filter_params', type=str, default=None,
+                        help="Parameters of the cursor position filter (e.g. 'window=5')")
+    args = parser.parse_args()
+    cursor_filter = create_filter(args.cursor_filter, **parse_params(args.filter_params))
+
     cursor_thread = threading.Thread(target=move_cursor)
     cursor_thread.start()
 